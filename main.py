@@ -16,7 +16,7 @@ if str(src_dir) not in sys.path:
     sys.path.insert(0, str(src_dir))
 
 
-def run_phase0_noise_baseline():
+def run_phase0_noise_baseline(seed=None):
     """
     Run Phase 0 pipeline — NOISE BASELINE (FROZEN).
     
@@ -29,26 +29,25 @@ def run_phase0_noise_baseline():
     - Collision rate
 
     Nothing else is allowed.
+
+    Args:
+        seed: run-level seed (None uses the shared global random stream)
     """
     # Import here after path setup (intentional)
-    from phase0.phase0 import phase0  # pylint: disable=import-outside-toplevel,import-error
-    import random  # pylint: disable=import-outside-toplevel
+    from phase0.phase0 import phase0_batches  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.seed import spawn_rngs  # pylint: disable=import-outside-toplevel,import-error
 
     # Raw actions - pure noise, no structure
     # No strings, no labels, no meaning
-    # Just raw action residues
-    # Using lambda to create callables (required for actions)
-    actions = [
-        lambda: random.random(),  # pylint: disable=unnecessary-lambda
-        lambda: random.random(),  # pylint: disable=unnecessary-lambda
-    ]
+    # Just raw action residues (one independent stream per action)
+    actions = [rng.random for rng in spawn_rngs(seed, 2)]
 
     steps = 100  # Increased temporal depth to test persistence
 
-    # Collect traces
+    # Collect traces (block at a time)
     traces = []
-    for trace, _, _ in phase0(actions, steps=steps):
-        traces.append(trace)
+    for block, _, _ in phase0_batches(actions, steps=steps):
+        traces.extend(block.tolist())
 
     # Calculate canonical Phase 0 outputs ONLY
     total_count = len(traces)
@@ -69,29 +68,30 @@ def run_phase0_noise_baseline():
     return traces
 
 
-def run_phase0_inertia():
+def run_phase0_inertia(seed=None):
     """
     Run Phase 0 pipeline — INERTIA VARIANT.
     
     Actions with temporal correlation: Action(t+1) depends weakly on Action(t).
     Still Phase 0 compliant: numeric, opaque, no meaning.
+
+    Args:
+        seed: run-level seed (None uses the shared global random stream)
     """
     # Import here after path setup (intentional)
-    from phase0.phase0 import phase0  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.phase0 import phase0_batches  # pylint: disable=import-outside-toplevel,import-error
     from phase0.actions import InertiaAction  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.seed import spawn_rngs  # pylint: disable=import-outside-toplevel,import-error
 
     # Stateful action with carry-over (internal state, no naming)
-    actions = [
-        InertiaAction(),
-        InertiaAction(),
-    ]
+    actions = [InertiaAction(rng=rng) for rng in spawn_rngs(seed, 2)]
 
     steps = 100  # Increased temporal depth to test persistence
 
-    # Collect traces
+    # Collect traces (block at a time)
     traces = []
-    for trace, _, _ in phase0(actions, steps=steps):
-        traces.append(trace)
+    for block, _, _ in phase0_batches(actions, steps=steps):
+        traces.extend(block.tolist())
 
     # Calculate canonical Phase 0 outputs ONLY
     total_count = len(traces)
@@ -112,29 +112,30 @@ def run_phase0_inertia():
     return traces
 
 
-def run_phase0_random_walk():
+def run_phase0_random_walk(seed=None):
     """
     Run Phase 0 pipeline — RANDOM WALK VARIANT.
     
     Bounded random walk: Action drifts within bounds.
     Still Phase 0 compliant: numeric, opaque, no meaning.
+
+    Args:
+        seed: run-level seed (None uses the shared global random stream)
     """
     # Import here after path setup (intentional)
-    from phase0.phase0 import phase0  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.phase0 import phase0_batches  # pylint: disable=import-outside-toplevel,import-error
     from phase0.actions import BoundedWalk  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.seed import spawn_rngs  # pylint: disable=import-outside-toplevel,import-error
 
     # Position is internal state, not named
-    actions = [
-        BoundedWalk(),
-        BoundedWalk(),
-    ]
+    actions = [BoundedWalk(rng=rng) for rng in spawn_rngs(seed, 2)]
 
     steps = 100  # Increased temporal depth to test persistence
 
-    # Collect traces
+    # Collect traces (block at a time)
     traces = []
-    for trace, _, _ in phase0(actions, steps=steps):
-        traces.append(trace)
+    for block, _, _ in phase0_batches(actions, steps=steps):
+        traces.extend(block.tolist())
 
     # Calculate canonical Phase 0 outputs ONLY
     total_count = len(traces)
@@ -155,29 +156,30 @@ def run_phase0_random_walk():
     return traces
 
 
-def run_phase0_oscillator():
+def run_phase0_oscillator(seed=None):
     """
     Run Phase 0 pipeline — OSCILLATOR VARIANT.
     
     Weak oscillator: Action oscillates with noise.
     Still Phase 0 compliant: numeric, opaque, no meaning.
+
+    Args:
+        seed: run-level seed (None uses the shared global random stream)
     """
     # Import here after path setup (intentional)
-    from phase0.phase0 import phase0  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.phase0 import phase0_batches  # pylint: disable=import-outside-toplevel,import-error
     from phase0.actions import WeakOscillator  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.seed import spawn_rngs  # pylint: disable=import-outside-toplevel,import-error
 
     # Oscillation is mechanical, not interpreted
-    actions = [
-        WeakOscillator(),
-        WeakOscillator(),
-    ]
+    actions = [WeakOscillator(rng=rng) for rng in spawn_rngs(seed, 2)]
 
     steps = 100  # Increased temporal depth to test persistence
 
-    # Collect traces
+    # Collect traces (block at a time)
     traces = []
-    for trace, _, _ in phase0(actions, steps=steps):
-        traces.append(trace)
+    for block, _, _ in phase0_batches(actions, steps=steps):
+        traces.extend(block.tolist())
 
     # Calculate canonical Phase 0 outputs ONLY
     total_count = len(traces)
@@ -198,29 +200,30 @@ def run_phase0_oscillator():
     return traces
 
 
-def run_phase0_decay_noise():
+def run_phase0_decay_noise(seed=None):
     """
     Run Phase 0 pipeline — DECAY + NOISE VARIANT.
     
     Action decays with added noise.
     Still Phase 0 compliant: numeric, opaque, no meaning.
+
+    Args:
+        seed: run-level seed (None uses the shared global random stream)
     """
     # Import here after path setup (intentional)
-    from phase0.phase0 import phase0  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.phase0 import phase0_batches  # pylint: disable=import-outside-toplevel,import-error
     from phase0.actions import DecayNoise  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.seed import spawn_rngs  # pylint: disable=import-outside-toplevel,import-error
 
     # Decay is mechanical, not interpreted
-    actions = [
-        DecayNoise(),
-        DecayNoise(),
-    ]
+    actions = [DecayNoise(rng=rng) for rng in spawn_rngs(seed, 2)]
 
     steps = 100  # Increased temporal depth to test persistence
 
-    # Collect traces
+    # Collect traces (block at a time)
     traces = []
-    for trace, _, _ in phase0(actions, steps=steps):
-        traces.append(trace)
+    for block, _, _ in phase0_batches(actions, steps=steps):
+        traces.extend(block.tolist())
 
     # Calculate canonical Phase 0 outputs ONLY
     total_count = len(traces)
@@ -241,7 +244,7 @@ def run_phase0_decay_noise():
     return traces
 
 
-def run_phase0_finite():
+def run_phase0_finite(seed=None):
     """
     Run Phase 0 pipeline — FINITE VARIANT.
     
@@ -249,23 +252,25 @@ def run_phase0_finite():
     Still Phase 0 compliant: numeric, opaque, no meaning, no labels.
     
     Discreteness enables exact equality, allowing repetition to emerge naturally.
+
+    Args:
+        seed: run-level seed (None uses the shared global random stream)
     """
     # Import here after path setup (intentional)
-    from phase0.phase0 import phase0  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.phase0 import phase0_batches  # pylint: disable=import-outside-toplevel,import-error
     from phase0.actions import FiniteAction  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.seed import spawn_rngs  # pylint: disable=import-outside-toplevel,import-error
 
     # Finite action with small output set (discrete but meaningless)
-    actions = [
-        FiniteAction(finite_set_size=10),  # Outputs 0-9
-        FiniteAction(finite_set_size=10),  # Outputs 0-9
-    ]
+    # Outputs 0-9, one independent stream per action
+    actions = [FiniteAction(finite_set_size=10, rng=rng) for rng in spawn_rngs(seed, 2)]
 
     steps = 100  # Increased temporal depth to test persistence
 
-    # Collect traces
+    # Collect traces (block at a time)
     traces = []
-    for trace, _, _ in phase0(actions, steps=steps):
-        traces.append(trace)
+    for block, _, _ in phase0_batches(actions, steps=steps):
+        traces.extend(block.tolist())
 
     # Calculate canonical Phase 0 outputs ONLY
     total_count = len(traces)
@@ -286,6 +291,190 @@ def run_phase0_finite():
     return traces
 
 
+# Phase 0 action variants by configuration name
+PHASE0_VARIANTS = {
+    "noise_baseline": run_phase0_noise_baseline,
+    "inertia": run_phase0_inertia,
+    "random_walk": run_phase0_random_walk,
+    "oscillator": run_phase0_oscillator,
+    "decay_noise": run_phase0_decay_noise,
+    "finite": run_phase0_finite,
+}
+
+
+def select_phase0_variant(variant):
+    """
+    Look up the Phase 0 run function for a variant name.
+
+    Unknown names fall back to the noise baseline (with a notice).
+    """
+    if variant not in PHASE0_VARIANTS:
+        print(f"Unknown variant: {variant}")
+        print("Using noise_baseline")
+        return run_phase0_noise_baseline
+    return PHASE0_VARIANTS[variant]
+
+
+def _run_phase0_phase1(task):
+    """
+    Run Phase 0 and Phase 1 for one run inside a pool worker.
+
+    Output is captured so the parent can print it in run order.
+
+    Args:
+        task: (variant, run_seed) tuple
+
+    Returns:
+        (residues, phase1_metrics, captured output)
+    """
+    import contextlib  # pylint: disable=import-outside-toplevel
+    import io  # pylint: disable=import-outside-toplevel
+
+    variant, run_seed = task
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        residues = select_phase0_variant(variant)(run_seed)
+        phase1_metrics = run_phase1(residues)  # pylint: disable=redefined-outer-name
+    return residues, phase1_metrics, output.getvalue()
+
+
+def run_multi_run(variant, num_runs, seed=None, workers=1, chunksize=1):
+    """
+    Run Phase 0 and Phase 1 for every run of a multi-run experiment.
+
+    With workers > 1, runs fan out to a process pool. Results and output
+    always come back in run order, so Phase 2 sees the same input either way.
+    Run k uses derive_seed(seed, k), which makes it identical in both modes.
+
+    Args:
+        variant: Phase 0 variant name (see PHASE0_VARIANTS)
+        num_runs: number of independent Phase 0 runs
+        seed: root seed (int); None draws one from the global random stream
+              when running in a pool (workers must not share a stream)
+        workers: number of worker processes (1 runs in this process)
+        chunksize: runs handed to a worker at a time
+
+    Returns:
+        (residue_sequences, phase1_metrics_list) in run order
+    """
+    from phase0.seed import derive_seed  # pylint: disable=import-outside-toplevel,import-error
+
+    residue_sequences = []  # pylint: disable=redefined-outer-name
+    phase1_metrics_list = []  # pylint: disable=redefined-outer-name
+
+    if workers <= 1:
+        run_phase0 = select_phase0_variant(variant)
+        for run_num in range(num_runs):
+            # Run k draws from its own child seed, independent of every other run
+            run_seed = derive_seed(seed, run_num) if seed is not None else None
+            residues = run_phase0(run_seed)  # pylint: disable=redefined-outer-name
+
+            # Phase 1: GATED - only runs if Phase 0 is frozen
+            phase1_metrics_list.append(run_phase1(residues))
+            residue_sequences.append(residues)
+        return residue_sequences, phase1_metrics_list
+
+    import random  # pylint: disable=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+
+    if seed is None:
+        # Forked workers would inherit one global stream; give each run its own
+        seed = random.getrandbits(128)
+
+    tasks = [(variant, derive_seed(seed, run_num)) for run_num in range(num_runs)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for residues, phase1_metrics, output in executor.map(  # pylint: disable=redefined-outer-name
+                _run_phase0_phase1, tasks, chunksize=chunksize):
+            print(output, end="")
+            residue_sequences.append(residues)
+            phase1_metrics_list.append(phase1_metrics)
+
+    return residue_sequences, phase1_metrics_list
+
+
+def trace_path(trace_dir, run_num):
+    """Path of the recorded Phase 0 trace for one run."""
+    return Path(trace_dir) / f"run_{run_num:05d}.trace"
+
+
+def _trace_mismatch(trace_dir, run_num, variant, seed):  # pylint: disable=redefined-outer-name
+    """
+    Why a run's recorded trace does not belong to this configuration.
+
+    Returns:
+        Reason (str), or None if the trace was recorded with this variant and seed
+    """
+    from phase0.seed import derive_seed  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.tracefile import read_trace_header  # pylint: disable=import-outside-toplevel,import-error
+
+    path = trace_path(trace_dir, run_num)
+    if not path.exists():
+        return f"{path} is missing"
+    try:
+        header = read_trace_header(path)
+    except ValueError as error:
+        return str(error)
+    run_seed = derive_seed(seed, run_num) if seed is not None else None
+    if header['variant'] != variant:
+        return f"{path} was recorded with variant {header['variant']!r}, not {variant!r}"
+    if header['seed'] != run_seed:
+        return f"{path} was recorded with a different seed"
+    return None
+
+
+def has_recorded_traces(trace_dir, num_runs, variant, seed):  # pylint: disable=redefined-outer-name
+    """True if every run has a trace file recorded with this variant and seed."""
+    return all(
+        _trace_mismatch(trace_dir, run_num, variant, seed) is None for run_num in range(num_runs)
+    )
+
+
+def record_traces(trace_dir, variant, seed, residue_sequences, action_count=2):  # pylint: disable=redefined-outer-name
+    """
+    Write each run's residues to a binary trace file.
+
+    Args:
+        trace_dir: directory for trace files (created if missing)
+        variant: Phase 0 variant name (stored in the header)
+        seed: root seed used for the runs (None if unseeded)
+        residue_sequences: list of residue sequences (one per run)
+        action_count: actions per step (every run_phase0_* helper uses two)
+    """
+    from phase0.seed import derive_seed  # pylint: disable=import-outside-toplevel,import-error
+    from phase0.tracefile import TraceWriter  # pylint: disable=import-outside-toplevel,import-error
+
+    Path(trace_dir).mkdir(parents=True, exist_ok=True)
+    for run_num, residues in enumerate(residue_sequences):  # pylint: disable=redefined-outer-name
+        run_seed = derive_seed(seed, run_num) if seed is not None else None
+        with TraceWriter(trace_path(trace_dir, run_num), variant=variant, seed=run_seed,
+                         steps=len(residues) // action_count, action_count=action_count) as writer:
+            writer.write_block(residues)
+
+
+def replay_traces(trace_dir, num_runs, variant, seed):  # pylint: disable=redefined-outer-name
+    """
+    Map recorded Phase 0 traces back in, without loading them into RAM.
+
+    Args:
+        trace_dir: directory of trace files
+        num_runs: number of runs
+        variant: Phase 0 variant name the traces must have been recorded with
+        seed: root seed the traces must have been recorded with (None if unseeded)
+
+    Returns:
+        List of residue memoryviews (one per run), accepted by Phases 1-3
+
+    Raises:
+        ValueError: if a trace is missing or was recorded with another variant or seed
+    """
+    from phase0.tracefile import read_trace  # pylint: disable=import-outside-toplevel,import-error
+
+    for run_num in range(num_runs):
+        reason = _trace_mismatch(trace_dir, run_num, variant, seed)
+        if reason is not None:
+            raise ValueError(f"Cannot replay trace: {reason}")
+    return [read_trace(trace_path(trace_dir, run_num))[1] for run_num in range(num_runs)]
+
+
 def run_phase1(residues):  # pylint: disable=redefined-outer-name
     """
     Run Phase 1 segmentation pipeline.
@@ -309,15 +498,15 @@ def run_phase1(residues):  # pylint: disable=redefined-outer-name
     # Import here after path setup (intentional)
     from phase1.phase1 import phase1  # pylint: disable=import-outside-toplevel,import-error
     
-    # Phase 1 segmentation
-    metrics = phase1(residues)
+    # Phase 1 segmentation (cluster labels kept so Phase 2 does not re-cluster)
+    metrics = phase1(residues, return_cluster_labels=True)
     
     # Output Phase 1 results (FINAL outputs only, no stepwise logs)
     print("=" * 70)
     print("THRESHOLD_ONSET — Phase 1")
     print("=" * 70)
     print()
-    print("Boundary positions:       ", metrics['boundary_positions'])
+    print("Boundary positions:       ", list(metrics['boundary_positions']))
     print("Cluster count:            ", metrics['cluster_count'])
     print("Cluster sizes:            ", metrics['cluster_sizes'])
     print("Distance count:           ", len(metrics['distances']))
@@ -391,7 +580,7 @@ def run_phase2(residues, phase1_metrics):  # pylint: disable=redefined-outer-nam
     return identity_metrics
 
 
-def run_phase2_multi_run(residue_sequences, phase1_metrics_list):  # pylint: disable=redefined-outer-name
+def run_phase2_multi_run(residue_sequences, phase1_metrics_list, workers=1, chunksize=1, prefilter=False):  # pylint: disable=redefined-outer-name
     """
     Run Phase 2 identity pipeline with multiple runs.
     
@@ -400,8 +589,12 @@ def run_phase2_multi_run(residue_sequences, phase1_metrics_list):  # pylint: dis
     Returns identity metrics only (hashes and counts).
     
     Args:
-        residue_sequences: list of residue sequences (each from a separate Phase 0 run)
+        residue_sequences: list of residue sequences or SegmentIndex objects (each from a separate Phase 0 run)
         phase1_metrics_list: list of Phase 1 metrics (one per run)
+        workers: worker processes for per-run Phase 2 partials (1 = this process)
+        chunksize: runs handed to a worker at a time (only used if workers > 1)
+        prefilter: sketch pre-filtered two-pass counting, in this process (workers unused);
+                   only counts above threshold are kept (see phase2.sketch)
     """
     # Phase 2 gate check: only run if at least one Phase 1 run produced persistence
     has_persistence = any(
@@ -426,18 +619,24 @@ def run_phase2_multi_run(residue_sequences, phase1_metrics_list):  # pylint: dis
     # Import here after path setup (intentional)
     from phase2.phase2 import phase2_multi_run  # pylint: disable=import-outside-toplevel,import-error
 
-    # Phase 2 identity detection across multiple runs
-    identity_metrics = phase2_multi_run(residue_sequences, phase1_metrics_list)
+    # Phase 2 identity detection across multiple runs (pre-filtering runs in this process)
+    options = {'prefilter': True} if prefilter else {'workers': workers, 'chunksize': chunksize}
+    identity_metrics = phase2_multi_run(residue_sequences, phase1_metrics_list, **options)
 
     # Output Phase 2 results (FINAL outputs only, no stepwise logs)
     print("=" * 70)
     print("THRESHOLD_ONSET — Phase 2 (Multi-Run)")
     print("=" * 70)
     print()
-    print("Persistence count:        ", len(identity_metrics['persistence_counts']))
-    print("Persistent segments:      ", len(identity_metrics['persistent_segment_hashes']))
-    print("Repeatability count:      ", len(identity_metrics['repeatability_counts']))
-    print("Repeatable units:         ", len(identity_metrics['repeatable_unit_hashes']))
+    if prefilter:
+        # Full tables are not built when pre-filtering (only counts above threshold)
+        print("Persistent segments:      ", len(identity_metrics['persistent_segment_hashes']))
+        print("Repeatable units:         ", len(identity_metrics['repeatable_unit_hashes']))
+    else:
+        print("Persistence count:        ", len(identity_metrics['persistence_counts']))
+        print("Persistent segments:      ", len(identity_metrics['persistent_segment_hashes']))
+        print("Repeatability count:      ", len(identity_metrics['repeatability_counts']))
+        print("Repeatable units:         ", len(identity_metrics['repeatable_unit_hashes']))
     print("Identity mappings:        ", len(identity_metrics['identity_mappings']))
     print("Identity persistence:     ", len(identity_metrics['identity_persistence']))
     print("Stability count:          ", len(identity_metrics['stability_counts']))
@@ -519,15 +718,18 @@ def run_phase3_multi_run(residue_sequences, phase1_metrics_list, phase2_metrics)
     Returns relation metrics only (graph structures, counts, hash pairs).
     
     Args:
-        residue_sequences: list of residue sequences (each from a separate Phase 0 run)
+        residue_sequences: list of residue sequences or SegmentIndex objects (each from a separate Phase 0 run)
         phase1_metrics_list: list of Phase 1 metrics (one per run)
         phase2_metrics: Phase 2 metrics from multi-run (aggregated)
     """
     # Import here after path setup (intentional)
-    from phase3.phase3 import phase3_multi_run  # pylint: disable=import-outside-toplevel,import-error
+    from phase3.phase3 import build_graph_metrics, phase3_multi_run  # pylint: disable=import-outside-toplevel,import-error
+    
+    # Graph metrics depend on Phase 2 metrics only: built once, shared with the gate diagnostics
+    graph_metrics = build_graph_metrics(phase2_metrics)
     
     # Phase 3 multi-run relation detection
-    relation_metrics = phase3_multi_run(residue_sequences, phase1_metrics_list, phase2_metrics)
+    relation_metrics = phase3_multi_run(residue_sequences, phase1_metrics_list, phase2_metrics, graph_metrics)
     
     # Check if gate failed
     if relation_metrics is None:
@@ -544,7 +746,7 @@ def run_phase3_multi_run(residue_sequences, phase1_metrics_list, phase2_metrics)
         graph_metrics_per_run = []
         
         for residues, phase1_metrics in zip(residue_sequences, phase1_metrics_list):  # pylint: disable=redefined-outer-name
-            phase3_metrics_run = phase3(residues, phase1_metrics, phase2_metrics)  # pylint: disable=redefined-outer-name
+            phase3_metrics_run = phase3(residues, phase1_metrics, phase2_metrics, graph_metrics)  # pylint: disable=redefined-outer-name
             relation_result = extract_relations(phase3_metrics_run)
             relation_hashes_per_run.append(relation_result['relation_hashes'])
             relation_counts_per_run.append(relation_result['relation_counts'])
@@ -717,6 +919,11 @@ if __name__ == "__main__":
     VARIANT = "finite"  # Select action variant
     MULTI_RUN_MODE = True  # Set to True for multi-run persistence testing
     NUM_RUNS = 5  # Number of independent Phase 0 runs (only used if MULTI_RUN_MODE = True)
+    SEED = None  # Root seed (int) for reproducible runs; None uses the shared global random stream
+    NUM_WORKERS = 1  # Worker processes for Phase 0 + Phase 1 runs and Phase 2 partials (1 = this process)
+    RUN_CHUNKSIZE = 1  # Runs handed to a worker at a time (only used if NUM_WORKERS > 1)
+    PREFILTER = False  # Sketch pre-filtered Phase 2 counting (exact counts above threshold only, less memory)
+    TRACE_DIR = None  # Directory for Phase 0 trace files; runs recorded with this VARIANT and SEED are replayed, others re-recorded
     
     # ========================================================================
     # EXECUTION
@@ -726,42 +933,33 @@ if __name__ == "__main__":
         # ====================================================================
         # MULTI-RUN MODE: Tests persistence across multiple independent runs
         # ====================================================================
-        residue_sequences = []
-        phase1_metrics_list = []
+        if TRACE_DIR is not None and has_recorded_traces(TRACE_DIR, NUM_RUNS, VARIANT, SEED):
+            # Replay recorded Phase 0 traces (Phase 0 is skipped entirely)
+            residue_sequences = replay_traces(TRACE_DIR, NUM_RUNS, VARIANT, SEED)
+            phase1_metrics_list = [run_phase1(residues) for residues in residue_sequences]
+        else:
+            # Phase 0 + Phase 1 for every run (in run order, pooled if NUM_WORKERS > 1)
+            residue_sequences, phase1_metrics_list = run_multi_run(
+                VARIANT, NUM_RUNS, seed=SEED, workers=NUM_WORKERS, chunksize=RUN_CHUNKSIZE
+            )
+            if TRACE_DIR is not None:
+                record_traces(TRACE_DIR, VARIANT, SEED, residue_sequences)
         
-        for run_num in range(NUM_RUNS):
-            # Run Phase 0 with selected variant
-            if VARIANT == "noise_baseline":
-                residues = run_phase0_noise_baseline()
-            elif VARIANT == "inertia":
-                residues = run_phase0_inertia()
-            elif VARIANT == "random_walk":
-                residues = run_phase0_random_walk()
-            elif VARIANT == "oscillator":
-                residues = run_phase0_oscillator()
-            elif VARIANT == "decay_noise":
-                residues = run_phase0_decay_noise()
-            elif VARIANT == "finite":
-                residues = run_phase0_finite()
-            else:
-                print(f"Unknown variant: {VARIANT}")
-                print("Using noise_baseline")
-                residues = run_phase0_noise_baseline()
-            
-            residue_sequences.append(residues)
-            
-            # Phase 1: GATED - only runs if Phase 0 is frozen
-            phase1_metrics = run_phase1(residues)
-            phase1_metrics_list.append(phase1_metrics)
+        # Segment index per run (one shared table): windows are interned once, shared by Phase 2 and Phase 3
+        from phase2.segment_index import index_sequences  # pylint: disable=import-outside-toplevel,import-error
+        segment_indexes = index_sequences(residue_sequences)
         
         # Phase 2: MULTI-RUN - tests persistence across multiple runs
-        phase2_metrics = run_phase2_multi_run(residue_sequences, phase1_metrics_list)
+        phase2_metrics = run_phase2_multi_run(
+            segment_indexes, phase1_metrics_list, workers=NUM_WORKERS, chunksize=RUN_CHUNKSIZE,
+            prefilter=PREFILTER
+        )
         
         # Phase 3: MULTI-RUN - tests relation persistence and stability across multiple runs
         # Gate will block execution if criteria not met
         phase3_metrics = None
         if phase2_metrics is not None and len(residue_sequences) > 0:
-            phase3_metrics = run_phase3_multi_run(residue_sequences, phase1_metrics_list, phase2_metrics)
+            phase3_metrics = run_phase3_multi_run(segment_indexes, phase1_metrics_list, phase2_metrics)
         
         # Phase 4: MULTI-RUN - pure aliasing (symbol assignment)
         # Gate will block execution if Phase 3 not frozen
@@ -773,29 +971,18 @@ if __name__ == "__main__":
         # SINGLE-RUN MODE: Standard single execution
         # ====================================================================
         # Run Phase 0 with selected variant
-        if VARIANT == "noise_baseline":
-            residues = run_phase0_noise_baseline()
-        elif VARIANT == "inertia":
-            residues = run_phase0_inertia()
-        elif VARIANT == "random_walk":
-            residues = run_phase0_random_walk()
-        elif VARIANT == "oscillator":
-            residues = run_phase0_oscillator()
-        elif VARIANT == "decay_noise":
-            residues = run_phase0_decay_noise()
-        elif VARIANT == "finite":
-            residues = run_phase0_finite()
-        else:
-            print(f"Unknown variant: {VARIANT}")
-            print("Using noise_baseline")
-            residues = run_phase0_noise_baseline()
+        residues = select_phase0_variant(VARIANT)(SEED)
         
         # Phase 1: GATED - only runs if Phase 0 is frozen
         phase1_metrics = run_phase1(residues)
         
+        # Segment index: windows are hashed once, shared by Phase 2 and Phase 3
+        from phase2.segment_index import SegmentIndex  # pylint: disable=import-outside-toplevel,import-error
+        segment_index = SegmentIndex(residues)
+        
         # Phase 2: HARD-DISABLED - only runs if Phase 1 produces non-zero persistence
-        phase2_metrics = run_phase2(residues, phase1_metrics)
+        phase2_metrics = run_phase2(segment_index, phase1_metrics)
         
         # Phase 3: HARD-DISABLED - only runs if Phase 2 produces non-zero identities
         if phase2_metrics is not None:
-            run_phase3(residues, phase1_metrics, phase2_metrics)
+            run_phase3(segment_index, phase1_metrics, phase2_metrics)
@@ -4,6 +4,6 @@ Phase 0: THRESHOLD_ONSET
 Action before Knowledge.
 """
 
-from phase0.phase0 import phase0
+from phase0.phase0 import phase0, phase0_batches
 
-__all__ = ['phase0']
+__all__ = ['phase0', 'phase0_batches']
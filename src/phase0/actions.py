@@ -9,10 +9,58 @@ Internal state is allowed as long as:
 - It's not interpreted
 - It's not displayed
 - It's mechanical only
+
+Every variant takes an optional rng (a random.Random instance) so each
+action draws from its own stream; without one, the shared global random
+module is used. Every variant also offers generate(n), a block form of n
+successive calls. The block follows the same recurrence and consumes the
+random stream in the same order as calling the action n times.
+
+A recurrence is vectorized (NumPy) only where array operations give the
+same bits as the scalar steps: running sums (FiniteAction states,
+WeakOscillator phases). Inertia, decay and the clamped walk round each
+state from the previous one, so their blocks stay one sequential step
+per residue (pre-drawing their noise as an array measured slower).
 """
 
 import random
 import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; blocks fall back to array('d')
+    np = None
+
+
+def _as_block(values):
+    """
+    Pack residues into a contiguous float64 block.
+
+    Args:
+        values: sequence of residues (floats or ints)
+
+    Returns:
+        numpy.ndarray of float64 when NumPy is installed, otherwise array('d')
+    """
+    if np is not None:
+        return np.asarray(values, dtype=np.float64)
+    return array('d', values)
+
+
+def _draws(rand, n):
+    """
+    Pre-draw n values of a random stream as one float64 block (NumPy only).
+
+    Args:
+        rand: zero-argument random callable (e.g. rng.random)
+        n: number of draws
+
+    Returns:
+        numpy.ndarray of n draws, in stream order
+    """
+    # iter(rand, None) calls rand() from C until count is reached (it never returns None)
+    return np.fromiter(iter(rand, None), dtype=np.float64, count=n)
 
 
 class InertiaAction:
@@ -22,14 +70,38 @@ class InertiaAction:
     Action(t+1) depends slightly on Action(t).
     Stateful action with carry-over (internal state, no naming).
     """
-    def __init__(self):
-        self._state = random.random()  # Internal state, not a name
+    def __init__(self, rng=None):
+        self._rng = rng if rng is not None else random
+        self._state = self._rng.random()  # Internal state, not a name
     
     def __call__(self):
         # Weak correlation: new value = 0.7 * old + 0.3 * random
-        self._state = 0.7 * self._state + 0.3 * random.random()
+        self._state = 0.7 * self._state + 0.3 * self._rng.random()
         return self._state
 
+    def generate(self, n):
+        """
+        Produce n residues at once (same recurrence as n calls).
+
+        Not a vectorized kernel: each state rounds from the previous one
+        (0.7 * state + noise), which no array operation reproduces
+        bit-for-bit, so this is one sequential step per residue.
+
+        Args:
+            n: number of residues to produce
+
+        Returns:
+            Block of n residues (see _as_block)
+        """
+        rand = self._rng.random
+        state = self._state
+        block = [0.0] * n
+        for i in range(n):
+            state = 0.7 * state + 0.3 * rand()
+            block[i] = state
+        self._state = state
+        return _as_block(block)
+
 
 class BoundedWalk:
     """
@@ -38,16 +110,47 @@ class BoundedWalk:
     Action drifts within bounds.
     Position is internal state, not named.
     """
-    def __init__(self):
-        self._position = random.random()
+    def __init__(self, rng=None):
+        self._rng = rng if rng is not None else random
+        self._position = self._rng.random()
         self._step_size = 0.1  # Fixed, not adaptive
     
     def __call__(self):
         # Random walk with reflection at boundaries
-        step = (random.random() - 0.5) * self._step_size
+        step = (self._rng.random() - 0.5) * self._step_size
         self._position = max(0.0, min(1.0, self._position + step))
         return self._position
 
+    def generate(self, n):
+        """
+        Produce n residues at once (same recurrence as n calls).
+
+        Not a vectorized kernel: the walk is clamped at a boundary about
+        once every 25 steps, and each clamp restarts the running sum, so
+        no array operation reproduces it bit-for-bit. This is one
+        sequential step per residue, clamping by comparison (same result
+        as max/min, which the walk never sees NaN or -0.0 for).
+
+        Args:
+            n: number of residues to produce
+
+        Returns:
+            Block of n residues (see _as_block)
+        """
+        rand = self._rng.random
+        step_size = self._step_size
+        position = self._position
+        block = [0.0] * n
+        for i in range(n):
+            position += (rand() - 0.5) * step_size
+            if position < 0.0:
+                position = 0.0
+            elif position > 1.0:
+                position = 1.0
+            block[i] = position
+        self._position = position
+        return _as_block(block)
+
 
 class DecayNoise:
     """
@@ -56,16 +159,42 @@ class DecayNoise:
     Action decays with added noise.
     Decay is mechanical, not interpreted.
     """
-    def __init__(self):
-        self._value = random.random()
+    def __init__(self, rng=None):
+        self._rng = rng if rng is not None else random
+        self._value = self._rng.random()
         self._decay = 0.95  # Fixed decay rate
     
     def __call__(self):
         # Decay towards random target
-        target = random.random()
+        target = self._rng.random()
         self._value = self._decay * self._value + (1 - self._decay) * target
         return self._value
 
+    def generate(self, n):
+        """
+        Produce n residues at once (same recurrence as n calls).
+
+        Not a vectorized kernel: each value rounds from the previous one
+        (decay * value + noise), which no array operation reproduces
+        bit-for-bit, so this is one sequential step per residue.
+
+        Args:
+            n: number of residues to produce
+
+        Returns:
+            Block of n residues (see _as_block)
+        """
+        rand = self._rng.random
+        decay = self._decay
+        remainder = 1 - decay
+        value = self._value
+        block = [0.0] * n
+        for i in range(n):
+            value = decay * value + remainder * rand()
+            block[i] = value
+        self._value = value
+        return _as_block(block)
+
 
 class WeakOscillator:
     """
@@ -74,8 +203,9 @@ class WeakOscillator:
     Action oscillates with noise.
     Oscillation is mechanical, not interpreted.
     """
-    def __init__(self):
-        self._phase = random.random() * 2 * math.pi
+    def __init__(self, rng=None):
+        self._rng = rng if rng is not None else random
+        self._phase = self._rng.random() * 2 * math.pi
         self._frequency = 0.1  # Fixed frequency
         self._amplitude = 0.3  # Fixed amplitude
     
@@ -83,9 +213,49 @@ class WeakOscillator:
         # Oscillation with noise
         self._phase += self._frequency
         oscillation = 0.5 + self._amplitude * math.sin(self._phase)
-        noise = random.random() * 0.2
+        noise = self._rng.random() * 0.2
         return max(0.0, min(1.0, oscillation + noise))
 
+    def generate(self, n):
+        """
+        Produce n residues at once (same recurrence as n calls).
+
+        The phase accumulates step by step (not phase0 + k * frequency),
+        so rounding matches the scalar path exactly. With NumPy that is
+        one cumulative sum; sines go through math.sin (np.sin may differ
+        in the last bit) in one C-level map, the rest are array operations.
+
+        Args:
+            n: number of residues to produce
+
+        Returns:
+            Block of n residues (see _as_block)
+        """
+        frequency = self._frequency
+        amplitude = self._amplitude
+        phase = self._phase
+        if np is None:
+            rand = self._rng.random
+            sin = math.sin
+            block = [0.0] * n
+            for i in range(n):
+                phase += frequency
+                oscillation = 0.5 + amplitude * sin(phase)
+                block[i] = max(0.0, min(1.0, oscillation + rand() * 0.2))
+            self._phase = phase
+            return array('d', block)
+
+        if n <= 0:
+            return _as_block([])
+        increments = np.full(n + 1, frequency)
+        increments[0] = phase
+        phases = np.cumsum(increments)[1:]
+        sines = np.fromiter(map(math.sin, phases.tolist()), dtype=np.float64, count=n)
+        oscillation = 0.5 + amplitude * sines
+        noise = _draws(self._rng.random, n) * 0.2
+        self._phase = float(phases[-1])
+        return np.maximum(0.0, np.minimum(1.0, oscillation + noise))
+
 
 class FiniteAction:
     """
@@ -97,18 +267,52 @@ class FiniteAction:
     
     Phase 0 compliant: discrete but meaningless.
     """
-    def __init__(self, finite_set_size=10):
+    def __init__(self, finite_set_size=10, rng=None):
         """
         Args:
             finite_set_size: size of finite output set (default: 10, outputs 0-9)
+            rng: random stream for this action (default: shared global random)
         """
+        self._rng = rng if rng is not None else random
         self._finite_set_size = finite_set_size
-        self._state = random.randint(0, finite_set_size - 1)  # Internal state
+        self._state = self._rng.randint(0, finite_set_size - 1)  # Internal state
     
     def __call__(self):
         # Output from finite set (0 to finite_set_size-1)
         # State transitions are mechanical, not interpreted
         # Add small random change to state (modulo finite set)
-        change = random.randint(-1, 1)  # -1, 0, or +1
+        change = self._rng.randint(-1, 1)  # -1, 0, or +1
         self._state = (self._state + change) % self._finite_set_size
-        return float(self._state)  # Return as float for consistency
\ No newline at end of file
+        return float(self._state)  # Return as float for consistency
+
+    def generate(self, n):
+        """
+        Produce n residues at once (same recurrence as n calls).
+
+        The modular walk is a running sum of changes, so with NumPy the
+        states are one cumulative sum instead of n Python steps.
+
+        Args:
+            n: number of residues to produce
+
+        Returns:
+            Block of n residues (see _as_block)
+        """
+        if n <= 0:
+            return _as_block([])
+        # choice() over (-1, 0, 1) draws exactly like randint(-1, 1)
+        choice = self._rng.choice
+        steps = (-1, 0, 1)
+        changes = [choice(steps) for _ in range(n)]
+        size = self._finite_set_size
+        if np is not None:
+            states = (self._state + np.cumsum(changes)) % size
+            self._state = int(states[-1])
+            return states.astype(np.float64)
+        state = self._state
+        block = [0.0] * n
+        for i, change in enumerate(changes):
+            state = (state + change) % size
+            block[i] = float(state)
+        self._state = state
+        return array('d', block)
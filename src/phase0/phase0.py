@@ -9,6 +9,16 @@ No meaning.
 No identity.
 """
 
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; blocks fall back to array('d')
+    np = None
+
+# Steps per block for phase0_batches (fixed, not tuned)
+BLOCK_STEPS = 4096
+
 
 def phase0(actions, steps):
     """
@@ -18,13 +28,83 @@ def phase0(actions, steps):
     Yields:
         trace, count, step_count
     """
-    traces = []
+    count = 0
     step_count = 0
 
     for step in range(steps):
         for action in actions:
             trace = action()
-            traces.append(trace)
+            count += 1
             step_count += 1
-            
-            yield trace, len(traces), step_count
+
+            yield trace, count, step_count
+
+
+def phase0_batches(actions, steps, block_steps=BLOCK_STEPS):
+    """
+    Block form of phase0.
+
+    Yields the same traces as phase0, in the same interleaved order
+    (one trace per action per step), as contiguous float64 blocks.
+    Memory stays constant: only the current block is held.
+
+    Actions offering generate(n) produce their share of a block at once.
+    Other callables are called one trace at a time, in phase0 order.
+    Traces match phase0 exactly whenever actions do not share a random stream.
+
+    actions: raw callable behaviors (no labels)
+    steps: number of repetitions
+    block_steps: steps per block (block length is block_steps * len(actions))
+
+    Yields:
+        block, count, step_count
+    """
+    if block_steps < 1:
+        raise ValueError("block_steps must be >= 1")
+    return _phase0_blocks(actions, steps, block_steps)
+
+
+def _phase0_blocks(actions, steps, block_steps):
+    """Generator behind phase0_batches (arguments already checked)."""
+    width = len(actions)
+    if width == 0:
+        return
+
+    batched = all(hasattr(action, 'generate') for action in actions)
+    count = 0
+
+    for start in range(0, steps, block_steps):
+        n = min(block_steps, steps - start)
+
+        if batched:
+            block = _interleave([action.generate(n) for action in actions], n * width)
+        else:
+            traces = [action() for _ in range(n) for action in actions]
+            block = np.asarray(traces, dtype=np.float64) if np is not None else array('d', traces)
+
+        count += len(block)
+        yield block, count, count
+
+
+def _interleave(columns, length):
+    """
+    Interleave per-action blocks into phase0 order (step-major).
+
+    Args:
+        columns: list of per-action blocks (equal lengths)
+        length: total block length
+
+    Returns:
+        Contiguous float64 block of the given length
+    """
+    width = len(columns)
+    if np is not None:
+        block = np.empty(length, dtype=np.float64)
+        for offset, column in enumerate(columns):
+            block[offset::width] = column
+        return block
+
+    block = array('d', bytes(8 * length))
+    for offset, column in enumerate(columns):
+        block[offset::width] = array('d', column)
+    return block
@@ -0,0 +1,46 @@
+"""
+THRESHOLD_ONSET — Phase 0: SEED
+
+Fan-out of one run-level seed into independent random streams.
+Seeds are opaque integers. No meaning, no labels.
+
+A child seed depends only on the root seed and its spawn path
+(run index, action index, ...). Run k therefore draws the same
+residues whether it runs alone, in a pool worker, or on another machine.
+"""
+
+import hashlib
+import random
+
+
+def derive_seed(seed, *path):
+    """
+    Derive a child seed from a root seed and a spawn path.
+
+    Args:
+        seed: root seed (int)
+        *path: spawn path (ints), e.g. run index then action index
+
+    Returns:
+        Child seed (int, 128 bits)
+    """
+    material = ':'.join(str(part) for part in (seed,) + path).encode('utf-8')
+    return int.from_bytes(hashlib.sha256(material).digest()[:16], 'big')
+
+
+def spawn_rngs(seed, count, *path):
+    """
+    Spawn independent random streams, one per action.
+
+    Args:
+        seed: run-level seed (int), or None for the shared global stream
+        count: number of streams to spawn
+        *path: optional spawn path prefix
+
+    Returns:
+        List of count random.Random instances.
+        If seed is None, every entry is the shared global random module.
+    """
+    if seed is None:
+        return [random] * count
+    return [random.Random(derive_seed(seed, *path, index)) for index in range(count)]
@@ -0,0 +1,219 @@
+"""
+THRESHOLD_ONSET — Phase 0: TRACE FILE
+
+Compact binary storage for Phase 0 residues.
+Residues are stored raw (float64 or int64). No labels, no interpretation.
+
+Layout (little-endian):
+- header: magic, version, typecode, flags, action count, steps,
+  residue count, seed (128-bit unsigned), variant name length
+- variant name (UTF-8), padded so the payload starts 8-byte aligned
+- payload: residue_count raw values
+
+Reading maps the file into memory. The residues come back as a zero-copy
+memoryview (or numpy.memmap), so a stored run never has to be loaded
+whole into RAM. Phases 1-3 accept the memoryview like a residue list.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; memoryview works without it
+    np = None
+
+TRACE_MAGIC = b'THONSET\x00'
+TRACE_VERSION = 1
+
+# magic, version, typecode, flags, action_count, steps, residue_count, seed, variant_len
+_HEADER = struct.Struct('<8sHcBIQQ16sH')
+_FLAG_SEED = 0x01
+_NUMPY_DTYPES = {'d': '<f8', 'q': '<i8'}
+
+
+class TraceWriter:
+    """
+    Streaming writer for a Phase 0 trace file.
+
+    Accepts single traces (write) or blocks (write_block), e.g. straight
+    from phase0 or phase0_batches. The residue count in the header is
+    filled in on close.
+    """
+    def __init__(self, path, variant='', seed=None, steps=0, action_count=0, typecode='d'):
+        """
+        Args:
+            path: file path to create (overwritten if present)
+            variant: Phase 0 variant name (opaque string)
+            seed: run-level seed (non-negative int < 2**128) or None
+            steps: number of Phase 0 steps
+            action_count: number of actions per step
+            typecode: 'd' for float64 payload, 'q' for int64 payload
+        """
+        if typecode not in _NUMPY_DTYPES:
+            raise ValueError(f"Unsupported trace typecode: {typecode!r}")
+        if seed is not None and not 0 <= seed < 2 ** 128:
+            raise ValueError("Trace seed must be a non-negative int below 2**128")
+
+        self._typecode = typecode
+        self._variant = variant.encode('utf-8')
+        self._seed = seed
+        self._steps = steps
+        self._action_count = action_count
+        self._count = 0
+        self._pending = array(typecode)
+        self._file = open(path, 'wb')  # pylint: disable=consider-using-with
+        self._file.write(self._header())
+
+    def _header(self):
+        """Encode header, variant name and alignment padding."""
+        flags = _FLAG_SEED if self._seed is not None else 0
+        seed_bytes = (self._seed or 0).to_bytes(16, 'little')
+        header = _HEADER.pack(
+            TRACE_MAGIC, TRACE_VERSION, self._typecode.encode('ascii'), flags,
+            self._action_count, self._steps, self._count, seed_bytes, len(self._variant)
+        ) + self._variant
+        return header + b'\x00' * (-len(header) % 8)
+
+    def write(self, trace):
+        """Append one residue."""
+        self._pending.append(int(trace) if self._typecode == 'q' else trace)
+        if len(self._pending) >= 4096:
+            self._flush()
+
+    def write_block(self, block):
+        """Append a block of residues (list, array, or numpy array)."""
+        self._flush()
+        data = _to_bytes(block, self._typecode)
+        self._file.write(data)
+        self._count += len(data) // 8
+
+    def _flush(self):
+        """Write buffered single residues."""
+        if self._pending:
+            self._file.write(_to_bytes(self._pending, self._typecode))
+            self._count += len(self._pending)
+            self._pending = array(self._typecode)
+
+    def close(self):
+        """Flush residues and finalize the header."""
+        if self._file.closed:
+            return
+        self._flush()
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _to_bytes(block, typecode):
+    """
+    Encode a block of residues as little-endian payload bytes.
+
+    Args:
+        block: residues (list, array, or numpy array)
+        typecode: 'd' or 'q'
+
+    Returns:
+        bytes
+    """
+    if np is not None:
+        values = np.asarray(block)
+        if typecode == 'q':
+            values = values.astype(np.int64)
+        return np.ascontiguousarray(values, dtype=_NUMPY_DTYPES[typecode]).tobytes()
+
+    if isinstance(block, array) and block.typecode == typecode:
+        values = array(typecode, block)
+    elif typecode == 'q':
+        values = array('q', (int(value) for value in block))
+    else:
+        values = array('d', block)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def read_trace_header(path):
+    """
+    Read the header of a trace file.
+
+    Args:
+        path: trace file path
+
+    Returns:
+        Dictionary with:
+        - 'variant': Phase 0 variant name (str)
+        - 'seed': run-level seed (int) or None
+        - 'steps': number of Phase 0 steps (int)
+        - 'action_count': number of actions per step (int)
+        - 'residue_count': number of stored residues (int)
+        - 'typecode': 'd' (float64) or 'q' (int64)
+        - 'payload_offset': byte offset of the payload (int)
+    """
+    with open(path, 'rb') as trace_file:
+        raw = trace_file.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            raise ValueError(f"Not a trace file: {path}")
+        (magic, version, typecode, flags, action_count,
+         steps, count, seed_bytes, variant_len) = _HEADER.unpack(raw)
+        if magic != TRACE_MAGIC:
+            raise ValueError(f"Not a trace file: {path}")
+        if version != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {version}: {path}")
+        variant = trace_file.read(variant_len).decode('utf-8')
+
+    header_len = _HEADER.size + variant_len
+    return {
+        'variant': variant,
+        'seed': int.from_bytes(seed_bytes, 'little') if flags & _FLAG_SEED else None,
+        'steps': steps,
+        'action_count': action_count,
+        'residue_count': count,
+        'typecode': typecode.decode('ascii'),
+        'payload_offset': header_len + (-header_len % 8),
+    }
+
+
+def read_trace(path, as_numpy=False):
+    """
+    Map a trace file into memory without copying the payload.
+
+    Args:
+        path: trace file path
+        as_numpy: return a read-only numpy.memmap instead of a memoryview
+
+    Returns:
+        (header, residues) where header is from read_trace_header and
+        residues is a memoryview of floats ('d') or ints ('q').
+        On big-endian hosts the memoryview path returns a byte-swapped copy.
+    """
+    header = read_trace_header(path)
+    typecode = header['typecode']
+    offset = header['payload_offset']
+    count = header['residue_count']
+
+    if as_numpy:
+        if np is None:
+            raise ImportError("as_numpy=True requires NumPy")
+        if count == 0:
+            return header, np.empty(0, dtype=_NUMPY_DTYPES[typecode])
+        return header, np.memmap(path, dtype=_NUMPY_DTYPES[typecode], mode='r',
+                                 offset=offset, shape=(count,))
+
+    with open(path, 'rb') as trace_file:
+        mapped = mmap.mmap(trace_file.fileno(), 0, access=mmap.ACCESS_READ)
+    payload = memoryview(mapped)[offset:offset + 8 * count]
+
+    if sys.byteorder == 'big':
+        values = array(typecode, payload.tobytes())
+        values.byteswap()
+        return header, memoryview(values)
+    return header, payload.cast(typecode)
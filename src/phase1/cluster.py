@@ -9,52 +9,189 @@ CONSTRAINT: Clustering thresholds must be FIXED and EXTERNAL.
 No adaptive clustering or optimization.
 """
 
+import math
+import sys
+from array import array
+from bisect import bisect_left, insort
+
 # FIXED threshold for clustering (non-adaptive)
 # This value is external and fixed, not computed from data
 CLUSTER_THRESHOLD = 0.1
 
 
-def cluster_residues(residues, threshold=CLUSTER_THRESHOLD):
+def cluster_residues(residues, threshold=CLUSTER_THRESHOLD, return_labels=False):
     """
     Group residues by proximity using fixed threshold.
     
     Args:
         residues: list of opaque residues (floats from Phase 0)
         threshold: fixed distance threshold for clustering (default: CLUSTER_THRESHOLD)
+        return_labels: also return the cluster index of every residue (default: False)
     
     Returns:
         Dictionary with:
         - 'cluster_count': number of clusters (int)
         - 'cluster_sizes': list of cluster sizes (unordered, no distribution interpretation)
+        - 'cluster_labels': array('i') of cluster indices per residue (only if return_labels)
     """
     if not residues:
-        return {'cluster_count': 0, 'cluster_sizes': []}
-    
-    from phase1.distance import absolute_difference  # pylint: disable=import-outside-toplevel
+        result = {'cluster_count': 0, 'cluster_sizes': []}
+        if return_labels:
+            result['cluster_labels'] = array('i')
+        return result
     
     # Simple clustering: assign each residue to a cluster
     # If distance to existing cluster center <= threshold, join that cluster
     # Otherwise, create new cluster
-    clusters = []
-    cluster_centers = []
-    
-    for residue in residues:
-        assigned = False
-        for idx, center in enumerate(cluster_centers):
-            if absolute_difference(residue, center) <= threshold:
-                clusters[idx].append(residue)
-                # Update center as average (mechanical computation, not adaptation)
-                cluster_centers[idx] = sum(clusters[idx]) / len(clusters[idx])
-                assigned = True
-                break
-        
-        if not assigned:
-            clusters.append([residue])
-            cluster_centers.append(residue)
+    engine = ClusterEngine(threshold, track_labels=return_labels)
+    engine.update(residues)
     
-    cluster_sizes = [len(cluster) for cluster in clusters]
-    
-    return {
-        'cluster_count': len(clusters),
-        'cluster_sizes': cluster_sizes  # Unordered list, no distribution interpretation
+    result = {
+        'cluster_count': engine.cluster_count,
+        'cluster_sizes': engine.cluster_sizes  # Unordered list, no distribution interpretation
     }
+    if return_labels:
+        result['cluster_labels'] = engine.labels
+    return result
+
+
+if sys.version_info >= (3, 12):
+    def _accumulate(total, compensation, residue):
+        """Add one residue the way sum() does (Neumaier compensation)."""
+        step = total + residue
+        if abs(total) >= abs(residue):
+            compensation += (total - step) + residue
+        else:
+            compensation += (residue - step) + total
+        return step, compensation
+
+    def _total(total, compensation):
+        """Final value of a running sum, as sum() reports it."""
+        if compensation and math.isfinite(compensation):
+            return total + compensation
+        return total
+else:
+    def _accumulate(total, compensation, residue):
+        """Add one residue the way sum() does (left to right)."""
+        return total + residue, compensation
+
+    def _total(total, compensation):  # pylint: disable=unused-argument
+        """Final value of a running sum, as sum() reports it."""
+        return total
+
+
+class ClusterEngine:
+    """
+    Incremental greedy clustering (first-created cluster wins).
+
+    Same semantics as scanning every center in creation order:
+    a residue joins the first cluster whose center is within threshold,
+    otherwise it starts a new cluster. The center of a cluster is the
+    mean of its members, recomputed on every join.
+
+    Mechanics (no interpretation):
+    - running sums replace re-summing members (bit-identical to sum())
+    - centers are kept in a sorted index, so only centers near the residue
+      are examined; among those, the lowest cluster index wins
+    """
+    def __init__(self, threshold=CLUSTER_THRESHOLD, track_labels=False):
+        """
+        Args:
+            threshold: fixed distance threshold for clustering (default: CLUSTER_THRESHOLD)
+            track_labels: keep the cluster index of every residue (default: False)
+        """
+        self._threshold = threshold
+        self._centers = []
+        self._totals = []
+        self._compensations = []
+        self._sizes = []
+        self._index = []  # sorted (center, cluster index) pairs
+        self.labels = array('i') if track_labels else None
+
+    @property
+    def cluster_count(self):
+        """Number of clusters (int)."""
+        return len(self._sizes)
+
+    @property
+    def cluster_sizes(self):
+        """List of cluster sizes, in creation order."""
+        return list(self._sizes)
+
+    def update(self, residues):
+        """Add residues in order."""
+        add = self.add
+        for residue in residues:
+            add(residue)
+
+    def add(self, residue):
+        """
+        Add one residue.
+
+        Args:
+            residue: opaque residue (float)
+
+        Returns:
+            Cluster index the residue joined (int)
+        """
+        cluster = self._find(residue)
+        if cluster is None:
+            cluster = len(self._sizes)
+            self._centers.append(residue)
+            self._totals.append(0 + residue)  # sum() starts from int 0
+            self._compensations.append(0.0)
+            self._sizes.append(1)
+            if residue == residue:  # NaN never matches, so it stays out of the index
+                insort(self._index, (residue, cluster))
+        else:
+            index = self._index
+            del index[bisect_left(index, (self._centers[cluster], cluster))]
+            total, compensation = _accumulate(
+                self._totals[cluster], self._compensations[cluster], residue)
+            self._totals[cluster] = total
+            self._compensations[cluster] = compensation
+            self._sizes[cluster] += 1
+            # Update center as average (mechanical computation, not adaptation)
+            center = _total(total, compensation) / self._sizes[cluster]
+            self._centers[cluster] = center
+            if center == center:
+                insort(index, (center, cluster))
+
+        if self.labels is not None:
+            self.labels.append(cluster)
+        return cluster
+
+    def _find(self, residue):
+        """
+        Lowest cluster index whose center is within threshold, or None.
+
+        |residue - center| grows monotonically away from the residue's
+        position in the sorted index (also under rounding), so matching
+        centers form one contiguous run around that position.
+        """
+        index = self._index
+        threshold = self._threshold
+        found = None
+        if residue != residue:
+            return found
+
+        position = bisect_left(index, (residue,))
+        left = position - 1
+        while left >= 0:
+            center, cluster = index[left]
+            if not abs(residue - center) <= threshold:  # NaN difference (inf - inf) never matches
+                break
+            if found is None or cluster < found:
+                found = cluster
+            left -= 1
+
+        right = position
+        while right < len(index):
+            center, cluster = index[right]
+            if not abs(residue - center) <= threshold:  # NaN difference (inf - inf) never matches
+                break
+            if found is None or cluster < found:
+                found = cluster
+            right += 1
+
+        return found
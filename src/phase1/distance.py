@@ -8,6 +8,16 @@ CONSTRAINT: Distance metrics must be mechanically defined.
 No adaptive or learned metrics.
 """
 
+import operator
+from array import array
+from functools import partial
+from itertools import compress, islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the kernel falls back to the standard library
+    np = None
+
 
 def absolute_difference(a, b):
     """
@@ -42,3 +52,38 @@ def pairwise_distances(residues):
         distances.append(dist)
     
     return distances
+
+
+def difference_kernel(residues, threshold):
+    """
+    Compute consecutive differences once; derive distances and boundaries.
+    
+    Fused form of pairwise_distances and detect_boundaries: each consecutive
+    absolute difference is computed a single time and reused for both.
+    Results are typed arrays (8 bytes per value), not lists of boxed numbers.
+    
+    Args:
+        residues: sequence of opaque residues (list, array, memoryview, or numpy array)
+        threshold: fixed boundary threshold (difference > threshold marks a boundary)
+    
+    Returns:
+        Dictionary with:
+        - 'distances': array('d') of consecutive absolute differences (raw numbers)
+        - 'boundary_positions': array('q') of boundary indices (position after each boundary)
+    """
+    distances = array('d')
+    boundary_positions = array('q')
+    if len(residues) < 2:
+        return {'distances': distances, 'boundary_positions': boundary_positions}
+    
+    if np is not None:
+        values = np.asarray(residues, dtype=np.float64)
+        differences = np.abs(np.diff(values))
+        distances.frombytes(differences.tobytes())
+        boundary_positions.frombytes((np.flatnonzero(differences > threshold) + 1).astype(np.int64).tobytes())
+    else:
+        distances.extend(map(abs, map(operator.sub, islice(residues, 1, None), residues)))
+        # compress keeps positions 1..n-1 whose difference exceeds threshold
+        boundary_positions.extend(compress(range(1, len(residues)), map(partial(operator.lt, threshold), distances)))
+    
+    return {'distances': distances, 'boundary_positions': boundary_positions}
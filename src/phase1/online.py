@@ -0,0 +1,150 @@
+"""
+THRESHOLD_ONSET — Phase 1: ONLINE
+
+Streaming form of the Phase 1 pipeline.
+Consumes residues as Phase 0 yields them; metrics are available at any time.
+Returns structural metrics only. No interpretation.
+
+Same fixed thresholds and window as phase1(). Nothing adapts to the stream.
+"""
+
+from array import array
+
+from phase1.boundary import BOUNDARY_THRESHOLD
+from phase1.cluster import CLUSTER_THRESHOLD, ClusterEngine
+from phase1.distance import difference_kernel
+from phase1.pattern import PATTERN_WINDOW_SIZE
+
+
+class OnlinePhase1:
+    """
+    Incremental Phase 1 accumulator.
+
+    update(trace) / update_block(block) add residues in Phase 0 order;
+    snapshot() returns exactly what phase1() returns for every residue
+    seen so far.
+
+    State kept (mechanical only):
+    - last residue (for the next difference)
+    - distances and boundary positions (typed arrays)
+    - greedy clusters (ClusterEngine)
+    - the last window_size residues, and per distinct window the number of
+      earlier non-overlapping occurrences plus the starts still overlapping
+    """
+    def __init__(self, return_cluster_labels=False,
+                 boundary_threshold=BOUNDARY_THRESHOLD,
+                 cluster_threshold=CLUSTER_THRESHOLD,
+                 window_size=PATTERN_WINDOW_SIZE):
+        """
+        Args:
+            return_cluster_labels: include per-residue cluster labels in snapshots
+            boundary_threshold: fixed boundary threshold (default: BOUNDARY_THRESHOLD)
+            cluster_threshold: fixed clustering threshold (default: CLUSTER_THRESHOLD)
+            window_size: fixed repetition window (default: PATTERN_WINDOW_SIZE)
+        """
+        self._boundary_threshold = boundary_threshold
+        self._window_size = window_size
+        self._clusters = ClusterEngine(cluster_threshold, track_labels=return_cluster_labels)
+        self._count = 0
+        self._previous = None
+        self._distances = array('d')
+        self._boundary_positions = array('q')
+        self._window = []
+        self._window_states = {}  # window -> [non-overlapping count, overlapping starts]
+        self._repetition_count = 0
+
+    def update(self, trace):
+        """Add one residue."""
+        if self._count > 0:
+            distance = abs(self._previous - trace)
+            self._distances.append(distance)
+            if distance > self._boundary_threshold:
+                self._boundary_positions.append(self._count)
+
+        self._clusters.add(trace)
+        self._add_window_residue(trace)
+        self._previous = trace
+        self._count += 1
+
+    def update_block(self, block):
+        """Add a block of residues (list, array, or numpy array) in order."""
+        residues = block.tolist() if hasattr(block, 'tolist') else list(block)
+        if not residues:
+            return
+
+        # Differences over the block, joined to the previous residue
+        if self._count > 0:
+            difference_result = difference_kernel([self._previous] + residues, self._boundary_threshold)
+            offset = self._count - 1
+        else:
+            difference_result = difference_kernel(residues, self._boundary_threshold)
+            offset = 0
+        self._distances.extend(difference_result['distances'])
+        self._boundary_positions.extend(position + offset for position in difference_result['boundary_positions'])
+
+        self._clusters.update(residues)
+        add_window_residue = self._add_window_residue
+        for residue in residues:
+            add_window_residue(residue)
+            self._count += 1
+        self._previous = residues[-1]
+
+    def _add_window_residue(self, residue):
+        """
+        Slide the repetition window by one residue (EXACT EQUALITY only).
+
+        A new window starting at j repeats every earlier equal window
+        starting at i <= j - window_size. Per distinct window, starts are
+        moved from "overlapping" to the running count once they are
+        window_size behind, so each step is constant work.
+        """
+        window = self._window
+        window.append(residue)
+        if len(window) > self._window_size:
+            del window[0]
+        if len(window) < self._window_size:
+            return
+
+        start = self._count - self._window_size + 1
+        key = tuple(window)
+        state = self._window_states.get(key)
+        if state is None:
+            self._window_states[key] = [0, [start]]
+            return
+
+        overlapping = state[1]
+        limit = start - self._window_size
+        matured = 0
+        while matured < len(overlapping) and overlapping[matured] <= limit:
+            matured += 1
+        if matured:
+            state[0] += matured
+            del overlapping[:matured]
+        self._repetition_count += state[0]
+        overlapping.append(start)
+
+    def snapshot(self):
+        """
+        Current Phase 1 metrics.
+
+        Returns:
+            Dictionary with the same keys as phase1():
+            - 'boundary_positions': array('q') of boundary indices
+            - 'cluster_count': number of clusters (int)
+            - 'cluster_sizes': list of cluster sizes (unordered)
+            - 'distances': array('d') of pairwise distances (raw numbers)
+            - 'repetition_count': number of exact repetitions (int)
+            - 'survival_count': number of surviving sequences (int)
+            - 'cluster_labels': array('i') of cluster indices (only if return_cluster_labels)
+        """
+        metrics = {
+            'boundary_positions': array('q', self._boundary_positions),
+            'cluster_count': self._clusters.cluster_count,
+            'cluster_sizes': self._clusters.cluster_sizes,
+            'distances': array('d', self._distances),
+            'repetition_count': self._repetition_count,
+            'survival_count': 0  # Requires multiple sequences, handled separately if needed
+        }
+        if self._clusters.labels is not None:
+            metrics['cluster_labels'] = array('i', self._clusters.labels)
+        return metrics
@@ -9,6 +9,8 @@ CONSTRAINT: Pattern detection limited to EXACT EQUALITY or FIXED-WINDOW comparis
 No abstraction, compression, or symbolic patterning allowed.
 """
 
+from bisect import bisect_left
+
 # FIXED window size for pattern detection (non-adaptive)
 # This value is external and fixed
 PATTERN_WINDOW_SIZE = 2
@@ -19,6 +21,9 @@ def detect_repetition(residues, window_size=PATTERN_WINDOW_SIZE):
     Detect exact repetition in residue sequences.
     
     Uses EXACT EQUALITY only. No approximate matching.
+    Counts every pair of non-overlapping windows (j >= i + window_size)
+    with equal contents. Windows are grouped by content in one pass, then
+    pairs are counted per group over sorted start positions.
     
     Args:
         residues: list of opaque residues (floats from Phase 0)
@@ -31,16 +36,25 @@ def detect_repetition(residues, window_size=PATTERN_WINDOW_SIZE):
     if len(residues) < window_size * 2:
         return {'repetition_count': 0}
     
-    repetition_count = 0
+    # Index window start positions by window contents (EXACT EQUALITY via tuple keys)
+    window_starts = {}
+    windows = zip(*[residues[offset:] for offset in range(window_size)])
+    for start, window in enumerate(windows):
+        starts = window_starts.get(window)
+        if starts is None:
+            window_starts[window] = [start]
+        else:
+            starts.append(start)
     
-    # Compare all pairs of windows using EXACT EQUALITY
-    for i in range(len(residues) - window_size + 1):
-        window1 = residues[i:i + window_size]
-        for j in range(i + window_size, len(residues) - window_size + 1):
-            window2 = residues[j:j + window_size]
-            # EXACT EQUALITY comparison only
-            if window1 == window2:
-                repetition_count += 1
+    # Count pairs of equal windows that do not overlap
+    # Start positions are appended in increasing order, so each list is sorted
+    repetition_count = 0
+    for starts in window_starts.values():
+        total = len(starts)
+        if total < 2:
+            continue
+        for index, start in enumerate(starts):
+            repetition_count += total - bisect_left(starts, start + window_size, index + 1)
     
     return {'repetition_count': repetition_count}
 
@@ -10,7 +10,7 @@ Reads Phase 0 output only. Does not modify Phase 0.
 """
 
 
-def phase1(residues):
+def phase1(residues, return_cluster_labels=False):
     """
     Phase 1 segmentation pipeline.
     
@@ -20,34 +20,36 @@ def phase1(residues):
     
     Args:
         residues: list of opaque residues (floats from Phase 0)
+        return_cluster_labels: also return the cluster index of every residue,
+            so later phases can reuse this clustering (default: False)
     
     Returns:
         Dictionary with structural metrics:
-        - 'boundary_positions': list of boundary indices
+        - 'boundary_positions': array('q') of boundary indices
         - 'cluster_count': number of clusters (int)
         - 'cluster_sizes': list of cluster sizes (unordered)
-        - 'distances': list of pairwise distances (raw numbers)
+        - 'distances': array('d') of pairwise distances (raw numbers)
         - 'repetition_count': number of exact repetitions (int)
         - 'survival_count': number of surviving sequences (int)
+        - 'cluster_labels': array('i') of cluster indices per residue (only if return_cluster_labels)
     """
-    from phase1.boundary import detect_boundaries  # pylint: disable=import-outside-toplevel
+    from phase1.boundary import BOUNDARY_THRESHOLD  # pylint: disable=import-outside-toplevel
     from phase1.cluster import cluster_residues  # pylint: disable=import-outside-toplevel
-    from phase1.distance import pairwise_distances  # pylint: disable=import-outside-toplevel
+    from phase1.distance import difference_kernel  # pylint: disable=import-outside-toplevel
     from phase1.pattern import detect_repetition  # pylint: disable=import-outside-toplevel
     
-    # Boundary detection
-    boundary_positions = detect_boundaries(residues)
+    # Distance measurement and boundary detection (one pass over differences)
+    difference_result = difference_kernel(residues, BOUNDARY_THRESHOLD)
+    boundary_positions = difference_result['boundary_positions']
+    distances = difference_result['distances']
     
     # Clustering
-    cluster_result = cluster_residues(residues)
-    
-    # Distance measurement
-    distances = pairwise_distances(residues)
+    cluster_result = cluster_residues(residues, return_labels=return_cluster_labels)
     
     # Pattern detection
     pattern_result = detect_repetition(residues)
     
-    return {
+    metrics = {
         'boundary_positions': boundary_positions,
         'cluster_count': cluster_result['cluster_count'],
         'cluster_sizes': cluster_result['cluster_sizes'],
@@ -55,3 +57,8 @@ def phase1(residues):
         'repetition_count': pattern_result['repetition_count'],
         'survival_count': 0  # Requires multiple sequences, handled separately if needed
     }
+    if return_cluster_labels:
+        metrics['cluster_labels'] = cluster_result['cluster_labels']
+    
+    return metrics
+
@@ -0,0 +1,163 @@
+"""
+THRESHOLD_ONSET — Phase 2: ACCUMULATOR
+
+Incremental multi-run Phase 2.
+Runs are added one at a time; earlier runs are never recomputed.
+Returns identity metrics only (hashes and counts).
+
+result() equals phase2_multi_run over every run added so far.
+With a store factory the merged tables are kept in stores (e.g. on
+disk, see phase2.store) and can be streamed in sorted hash order.
+"""
+
+from phase2.identity import IDENTITY_PERSISTENCE_THRESHOLD, _generate_identity_hash
+from phase2.partial import build_partial, finalize_partial, hash_partial, merge_partials, new_partial
+from phase2.segment_index import SegmentTable, as_segment_index
+
+
+class Phase2Accumulator:
+    """
+    Stateful Phase 2 multi-run pipeline.
+
+    add_run(residues, phase1_metrics) costs O(new run): the run is reduced
+    to a partial and merged into the running partial. Segments are
+    interned in one table and hashed once (counts are keyed by segment ID).
+
+    Identity hashes depend on persistence counts, so an identity changes
+    whenever its segment appears in another run. changed_identities()
+    reports what the latest result() changed.
+    """
+    def __init__(self, store_factory=None):
+        """
+        Args:
+            store_factory: callable returning an empty store (e.g. SqliteStore);
+                           default: in-memory dicts
+        """
+        self._partial = new_partial(store_factory=store_factory)
+        # Stores hold the tables out of memory: no shared segment table
+        self._table = SegmentTable() if store_factory is None else None
+        self._touched = {}  # segment IDs seen since the last result(), in order
+        self._identities = {}
+        self._changes = {}
+        self._result_runs = 0
+
+    @property
+    def run_count(self):
+        """Number of runs added so far."""
+        return self._partial['runs']
+
+    def add_run(self, residues, phase1_metrics):
+        """
+        Add one run (in run order).
+
+        Args:
+            residues: list of opaque residues (floats from Phase 0) or SegmentIndex
+            phase1_metrics: dictionary with Phase 1 structural metrics for the run
+        """
+        from phase2.phase2 import _reconstruct_clusters  # pylint: disable=import-outside-toplevel
+
+        # A run indexed in another hash mode cannot merge (merge_partials raises)
+        index = as_segment_index(residues, table=self._table)
+        clusters = _reconstruct_clusters(index.residues, phase1_metrics)[0]
+        run_partial = build_partial(index, clusters)
+        if self._partial['hashed']:
+            run_partial = hash_partial(run_partial)
+
+        merge_partials(self._partial, run_partial)
+        self._touched.update(run_partial['segment_runs'])
+
+    def result(self):
+        """
+        Phase 2 metrics over every run added so far.
+
+        Returns:
+            Dictionary with identity metrics (same as phase2_multi_run)
+        """
+        metrics = finalize_partial(self._partial)
+
+        # Only segments seen in new runs can change identity (counts only grow),
+        # unless identities were withheld last time (fewer than two runs)
+        segment_runs = self._partial['segment_runs']
+        if self._partial['runs'] < 2:
+            counts = ()
+        elif self._result_runs < 2:
+            counts = segment_runs.items()
+        else:
+            counts = ((key, segment_runs.get(key)) for key in self._touched)
+
+        changes = {}
+        for key, count in counts:
+            if count < IDENTITY_PERSISTENCE_THRESHOLD:
+                continue
+            segment_hash = key if self._partial['hashed'] else self._partial['table'].hash_of(key)
+            identity_hash = _generate_identity_hash(segment_hash, count)
+            previous = self._identities.get(key)
+            if previous != identity_hash:
+                changes[segment_hash] = (previous, identity_hash)
+                self._identities[key] = identity_hash
+
+        self._changes = changes
+        self._touched = {}
+        self._result_runs = self._partial['runs']
+        return metrics
+
+    def stream(self, metric, sort=True):
+        """
+        Stream one table of result() without building it.
+
+        Args:
+            metric: 'persistence_counts', 'repeatability_counts',
+                    'stability_counts' or 'identity_mappings'
+            sort: yield in sorted hash order (default) or in result() order
+
+        Returns:
+            Iterator of (hash, count) pairs, or (segment hash, identity hash)
+            pairs for 'identity_mappings'
+        """
+        partial = self._partial
+        tables = {
+            'persistence_counts': ('segment_runs', partial['runs'] >= 2),
+            'identity_mappings': ('segment_runs', partial['runs'] >= 2),
+            'repeatability_counts': ('window_counts', partial['length'] >= 2),
+            'stability_counts': ('cluster_runs', partial['cluster_sequences'] >= 2),
+        }
+        if metric not in tables:
+            raise ValueError(f"Unknown Phase 2 table: {metric!r}")
+        name, available = tables[metric]
+        if not available:
+            return iter(())
+
+        table = partial[name]
+        if partial['hashed']:
+            # Stores are keyed by hash and sort on their own
+            pairs = table.items(sort=sort)
+        else:
+            pairs = table.items()
+            if name != 'cluster_runs':
+                hash_of = partial['table'].hash_of
+                pairs = ((hash_of(segment_id), count) for segment_id, count in pairs)
+            pairs = iter(sorted(pairs)) if sort else iter(pairs)
+
+        if metric == 'identity_mappings':
+            return (
+                (seg_hash, _generate_identity_hash(seg_hash, count))
+                for seg_hash, count in pairs if count >= IDENTITY_PERSISTENCE_THRESHOLD
+            )
+        return pairs
+
+    def close(self):
+        """Release the stores (e.g. remove temporary database files)."""
+        for name in ('segment_runs', 'window_counts', 'cluster_runs'):
+            table = self._partial[name]
+            if not isinstance(table, dict):
+                table.close()
+
+    def changed_identities(self):
+        """
+        Identities changed by the latest result() (compared with the one before).
+
+        Returns:
+            Dictionary mapping segment hash to (previous identity hash or None,
+            current identity hash), for new and updated identities
+        """
+        return dict(self._changes)
@@ -0,0 +1,283 @@
+"""
+THRESHOLD_ONSET — Phase 2: AUTOMATON
+
+Generalized suffix automaton over all runs.
+Finds repeated segments of ANY length without slicing windows.
+Returns counts and hashes only. No names, no labels, no interpretation.
+
+Each state holds the segments that share one set of end positions
+(run, position). Per state:
+- length: length of its longest segment
+- run count: number of runs containing its segments (last-run marking
+  up the suffix links)
+- representative end position, to recover the residues
+
+Residues are compared by their exact bytes (same as hash_segment), and
+segment hashes are hash_segment of the residue tuple, so a length-2
+segment gets the same hash and identity as in assign_identity_hashes.
+
+CONSTRAINT: Uses EXACT EQUALITY only.
+"""
+
+from bisect import bisect_left, bisect_right
+
+from phase2 import hashing
+from phase2.hashing import hash_key, segment_key
+from phase2.identity import IDENTITY_PERSISTENCE_THRESHOLD, _generate_identity_hash
+from phase2.intern import InternTable
+from phase2.segment_index import SEGMENT_WINDOW, raw_residues
+
+
+class SuffixAutomaton:
+    """
+    Generalized suffix automaton of several residue sequences.
+
+    Built in time linear in the total number of residues (transitions
+    are dicts keyed by residue ID).
+    """
+    def __init__(self, residue_sequences):
+        """
+        Args:
+            residue_sequences: list of residue sequences or SegmentIndex objects (in run order)
+        """
+        self.hash_mode = hashing.HASH_MODE
+        self.sequences = [raw_residues(sequence) for sequence in residue_sequences]
+        self.symbols = InternTable()
+
+        # State 0 is the root (empty segment)
+        self.length = [0]
+        self.link = [-1]
+        self.next = [{}]
+        self.end = [(-1, -1)]
+
+        # State of every prefix, per run (to count occurrences)
+        self._prefix_states = []
+        for run, sequence in enumerate(self.sequences):
+            last = 0
+            states = []
+            for position, residue in enumerate(sequence):
+                symbol = self.symbols.intern(segment_key((residue,)))
+                last = self._extend(last, symbol, (run, position))
+                states.append(last)
+            self._prefix_states.append(states)
+
+        self.run_counts = self._count_runs()
+        self._tin = None
+        self._tout = None
+        self._run_tins = None
+
+    def _new_state(self, length, link, transitions, end):
+        self.length.append(length)
+        self.link.append(link)
+        self.next.append(transitions)
+        self.end.append(end)
+        return len(self.length) - 1
+
+    def _clone(self, p, q, symbol):
+        """Split q at length[p] + 1 and redirect p's suffix path to the clone."""
+        clone = self._new_state(self.length[p] + 1, self.link[q], dict(self.next[q]), self.end[q])
+        while p != -1 and self.next[p].get(symbol) == q:
+            self.next[p][symbol] = clone
+            p = self.link[p]
+        self.link[q] = clone
+        return clone
+
+    def _extend(self, last, symbol, end):
+        """Append one residue to the run ending in state last; return the new last state."""
+        q = self.next[last].get(symbol)
+        if q is not None:
+            # Segment already present (from an earlier run)
+            if self.length[last] + 1 == self.length[q]:
+                return q
+            return self._clone(last, q, symbol)
+
+        current = self._new_state(self.length[last] + 1, 0, {}, end)
+        p = last
+        while p != -1 and symbol not in self.next[p]:
+            self.next[p][symbol] = current
+            p = self.link[p]
+        if p != -1:
+            q = self.next[p][symbol]
+            if self.length[p] + 1 == self.length[q]:
+                self.link[current] = q
+            else:
+                self.link[current] = self._clone(p, q, symbol)
+        return current
+
+    def _count_runs(self):
+        """Number of runs containing each state's segments."""
+        run_counts = [0] * len(self.length)
+        last_run = [-1] * len(self.length)
+        for run, states in enumerate(self._prefix_states):
+            for state in states:
+                # Mark the state and its suffix-link ancestors once per run
+                while state > 0 and last_run[state] != run:
+                    last_run[state] = run
+                    run_counts[state] += 1
+                    state = self.link[state]
+        return run_counts
+
+    def __len__(self):
+        """Number of states (including the root)."""
+        return len(self.length)
+
+    def find(self, segment):
+        """
+        State containing a segment.
+
+        Args:
+            segment: tuple of residues
+
+        Returns:
+            State number, or None if the segment occurs in no run
+        """
+        state = 0
+        for residue in segment:
+            symbol = self.symbols.get(segment_key((residue,)))
+            state = self.next[state].get(symbol) if symbol is not None else None
+            if state is None:
+                return None
+        return state
+
+    def residues_of(self, state):
+        """Longest segment of a state (tuple of residues)."""
+        run, position = self.end[state]
+        return tuple(self.sequences[run][position + 1 - self.length[state]:position + 1])
+
+    def segment_hash(self, segment):
+        """Hash of a segment (same as hash_segment, internal identifier only)."""
+        return hash_key(segment_key(tuple(segment)), self.hash_mode)
+
+    def run_count(self, segment):
+        """
+        Number of runs containing a segment.
+
+        Args:
+            segment: tuple of residues
+
+        Returns:
+            Run count (int)
+        """
+        state = self.find(segment)
+        return 0 if state is None or state == 0 else self.run_counts[state]
+
+    def occurrences(self, segment):
+        """
+        Per-run occurrence counts of a segment (overlapping occurrences count).
+
+        Args:
+            segment: tuple of residues (non-empty)
+
+        Returns:
+            Dictionary mapping run number to occurrence count (runs in order,
+            runs without occurrences omitted)
+        """
+        state = self.find(segment)
+        if state is None or state == 0:
+            return {}
+        self._index_link_tree()
+
+        # Occurrences end at prefixes whose state lies in state's suffix-link subtree
+        low = self._tin[state]
+        high = self._tout[state]
+        counts = {}
+        for run, tins in enumerate(self._run_tins):
+            count = bisect_right(tins, high) - bisect_left(tins, low)
+            if count:
+                counts[run] = count
+        return counts
+
+    def _index_link_tree(self):
+        """Euler-tour numbering of the suffix-link tree (built on first query)."""
+        if self._tin is not None:
+            return
+        children = [[] for _ in self.length]
+        for state in range(1, len(self.length)):
+            children[self.link[state]].append(state)
+
+        tin = [0] * len(self.length)
+        tout = [0] * len(self.length)
+        counter = 0
+        stack = [(0, False)]
+        while stack:
+            state, done = stack.pop()
+            if done:
+                tout[state] = counter - 1
+                continue
+            tin[state] = counter
+            counter += 1
+            stack.append((state, True))
+            stack.extend((child, False) for child in children[state])
+
+        self._tin = tin
+        self._tout = tout
+        self._run_tins = [sorted(tin[state] for state in states) for states in self._prefix_states]
+
+    def maximal_segments(self, threshold=IDENTITY_PERSISTENCE_THRESHOLD, min_length=SEGMENT_WINDOW):
+        """
+        Maximal segments occurring in at least threshold runs.
+
+        A segment is maximal if no longer segment containing it occurs in
+        at least threshold runs.
+
+        Args:
+            threshold: fixed run-count threshold (default: IDENTITY_PERSISTENCE_THRESHOLD)
+            min_length: shortest segment reported (default: SEGMENT_WINDOW)
+
+        Returns:
+            List of (segment tuple, run count), in state order
+        """
+        run_counts = self.run_counts
+        extendable = [False] * len(self.length)
+        for state in range(1, len(self.length)):
+            # Left extensions of a state's longest segment are its suffix-link children
+            if run_counts[state] >= threshold:
+                extendable[self.link[state]] = True
+
+        segments = []
+        for state in range(1, len(self.length)):
+            if run_counts[state] < threshold or extendable[state] or self.length[state] < min_length:
+                continue
+            # Right extensions follow transitions
+            if any(run_counts[target] >= threshold for target in self.next[state].values()):
+                continue
+            segments.append((self.residues_of(state), run_counts[state]))
+        return segments
+
+
+def assign_automaton_identities(residue_sequences, threshold=IDENTITY_PERSISTENCE_THRESHOLD,
+                                min_length=SEGMENT_WINDOW):
+    """
+    Assign internal identity hashes to maximal persistent segments of any length.
+
+    Optional identity source next to assign_identity_hashes (same format).
+
+    Args:
+        residue_sequences: list of residue sequences or SegmentIndex objects (each from a Phase 0 iteration)
+        threshold: fixed persistence threshold for identity assignment (default: IDENTITY_PERSISTENCE_THRESHOLD)
+        min_length: shortest segment given an identity (default: SEGMENT_WINDOW)
+
+    Returns:
+        Dictionary with:
+        - 'identity_mappings': dict mapping segment hash to identity hash (both are internal identifiers)
+        - 'identity_persistence': dict mapping identity hash to persistence count (int)
+    """
+    identity_mappings = {}
+    identity_persistence = {}
+    if len(residue_sequences) < 2:
+        return {
+            'identity_mappings': identity_mappings,
+            'identity_persistence': identity_persistence
+        }
+
+    automaton = SuffixAutomaton(residue_sequences)
+    for segment, persistence_count in automaton.maximal_segments(threshold, min_length):
+        segment_hash = automaton.segment_hash(segment)
+        identity_hash = _generate_identity_hash(segment_hash, persistence_count)
+        identity_mappings[segment_hash] = identity_hash
+        identity_persistence[identity_hash] = persistence_count
+
+    return {
+        'identity_mappings': identity_mappings,
+        'identity_persistence': identity_persistence
+    }
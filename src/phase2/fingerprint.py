@@ -0,0 +1,90 @@
+"""
+THRESHOLD_ONSET — Phase 2: FINGERPRINT
+
+Order-independent cluster hashes.
+Hashes are INTERNAL ONLY - not names, not symbols.
+
+A cluster is compared as a multiset of residues (EXACT EQUALITY of the
+float64 bit patterns, so 0.0 and -0.0 differ and NaNs compare by their
+bits). No sort: each residue's bit pattern is mixed by two independent
+64-bit mixers and the mixes are summed (mod 2**64). Sums are
+commutative, so the fingerprint (size, sum 1, sum 2) does not depend on
+residue order, and it can be extended residue by residue (add the
+mixes). The fingerprint is digested with hash_key, once per cluster.
+
+Mixing and summing are vectorized with NumPy when it is installed; the
+pure-Python fallback gives the same hashes.
+
+In legacy hash mode the original sorted-tuple md5 hashes are kept
+(NaNs sorted last, so they do not depend on residue order either).
+"""
+
+import struct
+
+from phase2 import hashing
+from phase2.hashing import hash_key, hash_segment
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fingerprints fall back to Python ints
+    np = None
+
+_MASK64 = (1 << 64) - 1
+
+# FIXED mixer constants (splitmix64 and murmur3 fmix64)
+_GOLDEN = 0x9E3779B97F4A7C15
+_SPLIT_1, _SPLIT_2 = 0xBF58476D1CE4E5B9, 0x94D049BB133111EB
+_FMIX_1, _FMIX_2 = 0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53
+
+_DOUBLE = struct.Struct('<d')
+_BITS = struct.Struct('<Q')
+_FINGERPRINT = struct.Struct('<3Q')
+
+
+def _mix_sums(bits):
+    """(Sum of splitmix64, sum of fmix64) over uint64 bit patterns, mod 2**64."""
+    if np is not None:
+        split = bits + np.uint64(_GOLDEN)
+        split = (split ^ (split >> np.uint64(30))) * np.uint64(_SPLIT_1)
+        split = (split ^ (split >> np.uint64(27))) * np.uint64(_SPLIT_2)
+        split ^= split >> np.uint64(31)
+        fmix = bits ^ (bits >> np.uint64(33))
+        fmix = (fmix * np.uint64(_FMIX_1)) ^ ((fmix * np.uint64(_FMIX_1)) >> np.uint64(33))
+        fmix = (fmix * np.uint64(_FMIX_2)) ^ ((fmix * np.uint64(_FMIX_2)) >> np.uint64(33))
+        return int(split.sum(dtype=np.uint64)), int(fmix.sum(dtype=np.uint64))
+
+    split_sum = fmix_sum = 0
+    for value in bits:
+        split = (value + _GOLDEN) & _MASK64
+        split = ((split ^ (split >> 30)) * _SPLIT_1) & _MASK64
+        split = ((split ^ (split >> 27)) * _SPLIT_2) & _MASK64
+        split_sum += split ^ (split >> 31)
+        fmix = value ^ (value >> 33)
+        fmix = (fmix * _FMIX_1) & _MASK64
+        fmix ^= fmix >> 33
+        fmix = (fmix * _FMIX_2) & _MASK64
+        fmix_sum += fmix ^ (fmix >> 33)
+    return split_sum & _MASK64, fmix_sum & _MASK64
+
+
+def hash_cluster(cluster):
+    """
+    Hash of one cluster, independent of residue order (no sort).
+
+    Args:
+        cluster: list of residues (any order)
+
+    Returns:
+        Hash value (internal identifier only)
+    """
+    if hashing.HASH_MODE == hashing.LEGACY_HASH_MODE:
+        # Normalize cluster for comparison (sort residues for exact equality)
+        values = sorted(value for value in cluster if value == value)
+        values += [value for value in cluster if value != value]  # NaN: fixed position (last)
+        return hash_segment(tuple(values))
+
+    if np is not None:
+        bits = np.asarray(cluster, dtype='<f8').view('<u8')
+    else:
+        bits = [_BITS.unpack(_DOUBLE.pack(value))[0] for value in cluster]
+    return hash_key(_FINGERPRINT.pack(len(cluster), *_mix_sums(bits)))
@@ -0,0 +1,105 @@
+"""
+THRESHOLD_ONSET — Phase 2: HASHING
+
+Shared segment hashing for Phases 2-3.
+Hashes are INTERNAL ONLY - mechanical identifiers, not names, not symbols.
+
+Two fixed modes:
+- 'binary' (default): raw float64 bit patterns, packed little-endian,
+  digested with a fixed-key BLAKE2b (128-bit, hex)
+- 'legacy': md5 of str(tuple), the original Phase 2 hashes, for
+  freeze comparisons and existing artifacts
+
+Both modes give 32-character hex digests. Segments that compare equal
+as float64 tuples hash equally in binary mode (0.0 and -0.0 differ,
+as in legacy mode).
+"""
+
+import hashlib
+import struct
+
+BINARY_HASH_MODE = 'binary'
+LEGACY_HASH_MODE = 'legacy'
+HASH_MODES = (BINARY_HASH_MODE, LEGACY_HASH_MODE)
+
+# Active mode (fixed, external). Read at call time.
+HASH_MODE = BINARY_HASH_MODE
+
+# Fixed digest key and size (not secret; separates these digests from other uses)
+HASH_KEY = b'THRESHOLD_ONSET:segment'
+HASH_DIGEST_SIZE = 16
+
+_BINARY_BASE = hashlib.blake2b(digest_size=HASH_DIGEST_SIZE, key=HASH_KEY)
+_PACKERS = {}
+
+
+def set_hash_mode(mode):
+    """
+    Select the hashing mode for Phases 2-3.
+
+    Args:
+        mode: 'binary' or 'legacy'
+
+    Returns:
+        Previous mode (str)
+    """
+    global HASH_MODE  # pylint: disable=global-statement
+    if mode not in HASH_MODES:
+        raise ValueError(f"Unknown hash mode: {mode!r} (expected one of {HASH_MODES})")
+    previous = HASH_MODE
+    HASH_MODE = mode
+    return previous
+
+
+def segment_key(segment):
+    """
+    Canonical bytes of a segment for the active mode.
+
+    Equal keys give equal hashes; segments can be interned by key and
+    hashed later (hash_key), once per distinct key.
+
+    Args:
+        segment: tuple of residues
+
+    Returns:
+        bytes (packed float64 in binary mode, str(tuple) in legacy mode)
+    """
+    if HASH_MODE == LEGACY_HASH_MODE:
+        return str(segment).encode('utf-8')
+
+    packer = _PACKERS.get(len(segment))
+    if packer is None:
+        packer = _PACKERS[len(segment)] = struct.Struct(f'<{len(segment)}d')
+    return packer.pack(*segment)
+
+
+def hash_key(key, mode=None):
+    """
+    Digest canonical segment bytes (from segment_key).
+
+    Args:
+        key: canonical segment bytes
+        mode: mode the key was made in (default: active mode)
+
+    Returns:
+        Hash value (internal identifier only)
+    """
+    if (mode or HASH_MODE) == LEGACY_HASH_MODE:
+        return hashlib.md5(key).hexdigest()
+
+    digest = _BINARY_BASE.copy()
+    digest.update(key)
+    return digest.hexdigest()
+
+
+def hash_segment(segment):
+    """
+    Generate internal identity hash for a segment, unit or cluster.
+
+    Args:
+        segment: tuple of residues
+
+    Returns:
+        Hash value (internal identifier only)
+    """
+    return hash_key(segment_key(segment))
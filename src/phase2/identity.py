@@ -11,6 +11,8 @@ They are NOT to be displayed as names or used as symbols.
 
 import hashlib
 
+from phase2.segment_index import as_segment_index
+
 # FIXED threshold for identity assignment (non-adaptive)
 # This value is external and fixed, not computed from data
 IDENTITY_PERSISTENCE_THRESHOLD = 2
@@ -24,7 +26,7 @@ def assign_identity_hashes(residue_sequences, threshold=IDENTITY_PERSISTENCE_THR
     Hashes are INTERNAL ONLY - not names, not symbols.
     
     Args:
-        residue_sequences: list of residue sequences (each from a Phase 0 iteration)
+        residue_sequences: list of residue sequences or SegmentIndex objects (each from a Phase 0 iteration)
         threshold: fixed persistence threshold for identity assignment (default: IDENTITY_PERSISTENCE_THRESHOLD)
     
     Returns:
@@ -45,16 +47,12 @@ def assign_identity_hashes(residue_sequences, threshold=IDENTITY_PERSISTENCE_THR
     segment_persistence = {}
     
     for sequence in residue_sequences:
-        seen_in_this_iteration = set()
+        index = as_segment_index(sequence, SEGMENT_WINDOW)
         
-        for i in range(len(sequence) - SEGMENT_WINDOW + 1):
-            segment = tuple(sequence[i:i + SEGMENT_WINDOW])
-            segment_hash = _hash_segment(segment)
-            
-            # Count persistence (only once per iteration)
-            if segment_hash not in seen_in_this_iteration:
-                segment_persistence[segment_hash] = segment_persistence.get(segment_hash, 0) + 1
-                seen_in_this_iteration.add(segment_hash)
+        # Count persistence (only once per iteration)
+        for segment_id in index.counts:
+            segment_hash = index.segment_hash(segment_id)
+            segment_persistence[segment_hash] = segment_persistence.get(segment_hash, 0) + 1
     
     # Assign identity hashes only to segments that persist above threshold
     identity_mappings = {}
@@ -73,20 +71,6 @@ def assign_identity_hashes(residue_sequences, threshold=IDENTITY_PERSISTENCE_THR
     }
 
 
-def _hash_segment(segment):
-    """
-    Generate hash for a segment (internal tracking only).
-    
-    Args:
-        segment: tuple of residues (fixed window)
-    
-    Returns:
-        Hash value (internal identifier only)
-    """
-    segment_bytes = str(segment).encode('utf-8')
-    return hashlib.md5(segment_bytes).hexdigest()
-
-
 def _generate_identity_hash(segment_hash, persistence_count):
     """
     Generate identity hash for a persistent segment.
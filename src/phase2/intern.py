@@ -0,0 +1,101 @@
+"""
+THRESHOLD_ONSET — Phase 2: INTERN
+
+Dense integer IDs for hashes and segments.
+IDs are INTERNAL ONLY - positions in a table, not names, not symbols.
+
+Phase 2 and Phase 3 internals count on IDs; hex hashes are produced
+only at the public API boundary.
+"""
+
+from array import array
+
+
+class InternTable:
+    """
+    Dense interning table.
+
+    The first distinct key gets ID 0, the next ID 1, and so on.
+    Keys are kept in ID order, so ID -> key is a list index.
+    """
+    def __init__(self, keys=()):
+        """
+        Args:
+            keys: optional initial keys, interned in order
+        """
+        self._ids = {}
+        self.keys = []
+        for key in keys:
+            self.intern(key)
+
+    def intern(self, key):
+        """Return the ID of key, assigning the next ID if key is new."""
+        key_id = self._ids.get(key)
+        if key_id is None:
+            key_id = self._ids[key] = len(self.keys)
+            self.keys.append(key)
+        return key_id
+
+    def get(self, key, default=None):
+        """Return the ID of key, or default if key was never interned."""
+        return self._ids.get(key, default)
+
+    def __getitem__(self, key_id):
+        """Key for an ID."""
+        return self.keys[key_id]
+
+    def __contains__(self, key):
+        return key in self._ids
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class CountTable:
+    """
+    Counts keyed by interned ID, in first-insertion order.
+
+    Counts live in an array indexed by ID and the insertion order in a
+    second array, so an entry costs 12 bytes instead of a dict entry
+    plus key and count objects. Same interface as the stores in
+    phase2.store (add_counts, get, items, len, close); counts added are
+    positive.
+    """
+    def __init__(self):
+        self._counts = array('q')
+        self._order = array('i')  # IDs in first-insertion order
+
+    def add_counts(self, pairs):
+        """
+        Add counts.
+
+        Args:
+            pairs: iterable of (ID, count)
+        """
+        counts = self._counts
+        order = self._order
+        for key_id, count in pairs:
+            if key_id >= len(counts):
+                counts.frombytes(bytes(counts.itemsize * (key_id + 1 - len(counts))))
+            if not counts[key_id]:
+                order.append(key_id)
+            counts[key_id] += count
+
+    def get(self, key_id, default=None):
+        """Count of an ID (default if absent)."""
+        if key_id < len(self._counts) and self._counts[key_id]:
+            return self._counts[key_id]
+        return default
+
+    def items(self):
+        """(ID, count) pairs in first-insertion order."""
+        counts = self._counts
+        return ((key_id, counts[key_id]) for key_id in self._order)
+
+    def __len__(self):
+        return len(self._order)
+
+    def close(self):
+        """Release the table."""
+        self._counts = array('q')
+        self._order = array('i')
@@ -0,0 +1,152 @@
+"""
+THRESHOLD_ONSET — Phase 2: MULTI-LENGTH
+
+Persistence and repeatability for every window length at once.
+Returns counts only. No names, no labels, no interpretation.
+
+Each run is read once, residue by residue, without concatenating the
+runs. At every residue the segments ending there are interned for all
+lengths at once: length k from (ID of the length k - 1 segment ending at
+the previous residue, this residue). The last max_window residues are
+carried across the seam into the next run, so no window is re-read and
+each distinct segment is hashed once (same hashes as hash_segment).
+
+Per-length tables use the existing Phase 2 formats:
+- persistence as in measure_persistence (runs containing the segment)
+- repeatability as in phase2_multi_run (windows in the concatenated
+  runs, including windows across the seams between runs)
+
+CONSTRAINT: Uses EXACT EQUALITY only.
+"""
+
+from array import array
+
+from phase2 import hashing
+from phase2.hashing import hash_key, segment_key
+from phase2.intern import InternTable
+from phase2.persistence import PERSISTENCE_THRESHOLD
+from phase2.repeatable import REPEATABILITY_THRESHOLD
+from phase2.segment_index import SEGMENT_WINDOW, raw_residues
+
+# FIXED longest window length for multi-length counting (non-adaptive)
+MAX_WINDOW = 6
+
+
+def count_segment_lengths(residue_sequences, max_window=MAX_WINDOW, min_window=SEGMENT_WINDOW,
+                          persistence_threshold=PERSISTENCE_THRESHOLD,
+                          repeatability_threshold=REPEATABILITY_THRESHOLD):
+    """
+    Persistence and repeatability counts for window lengths min_window..max_window.
+
+    Args:
+        residue_sequences: list of residue sequences or SegmentIndex objects (in run order)
+        max_window: longest window length (default: MAX_WINDOW)
+        min_window: shortest window length (default: SEGMENT_WINDOW)
+        persistence_threshold: fixed persistence threshold (default: PERSISTENCE_THRESHOLD)
+        repeatability_threshold: fixed repeatability threshold (default: REPEATABILITY_THRESHOLD)
+
+    Returns:
+        Dictionary mapping window length to a dictionary with:
+        - 'persistence_counts': dict mapping segment hash to number of runs containing it
+        - 'persistent_segment_hashes': list of hashes that persist above threshold
+        - 'repeatability_counts': dict mapping segment hash to window count
+        - 'repeatable_unit_hashes': list of hashes that repeat above threshold
+    """
+    if not 1 <= min_window <= max_window:
+        raise ValueError("Window lengths must satisfy 1 <= min_window <= max_window")
+
+    mode = hashing.HASH_MODE
+
+    # Per length (indexed by window length), by segment ID: windows, last run seen, hash
+    symbols = InternTable()
+    levels = [{} for _ in range(max_window + 1)]  # (prefix ID, residue ID) -> segment ID
+    window_counts = [array('q') for _ in range(max_window + 1)]
+    last_run = [array('i') for _ in range(max_window + 1)]
+    run_counts = [{} for _ in range(max_window + 1)]  # segment ID -> runs, in first-run order
+    hashes = [[] for _ in range(max_window + 1)]
+    counted = [
+        (window, window_counts[window], last_run[window], run_counts[window], hashes[window])
+        for window in range(min_window, max_window + 1)
+    ]
+
+    recent = []     # last max_window residues (carried across seams)
+    previous = []   # previous[k - 1]: ID of the length k segment ending at the previous residue
+    seen = 0        # residues read so far (all runs)
+    run_count = 0
+    for run, sequence in enumerate(residue_sequences):
+        run_count = run + 1
+        in_run = 0
+        for residue in raw_residues(sequence):
+            seen += 1
+            in_run += 1
+            recent.append(residue)
+            if seen > max_window:
+                del recent[0]
+
+            # Length 1: residues interned by their exact bytes; length k extends
+            # the length k - 1 segment ending at the previous residue
+            symbol = symbols.intern(segment_key((residue,)))
+            current = [symbol]
+            for level, prefix in zip(levels[2:], previous):
+                key = (prefix << 32) | symbol
+                segment_id = level.get(key)
+                if segment_id is None:
+                    segment_id = level[key] = len(level)
+                current.append(segment_id)
+            previous = current
+
+            for (window, counts, last, runs, level_hashes), segment_id in zip(counted, current[min_window - 1:]):
+                if segment_id == len(counts):
+                    counts.append(1)
+                    last.append(-1)
+                    level_hashes.append(hash_key(segment_key(tuple(recent[-window:])), mode))
+                else:
+                    counts[segment_id] += 1
+                # Persistence counts a segment once per run (windows fully inside the run)
+                if window <= in_run and last[segment_id] != run:
+                    last[segment_id] = run
+                    runs[segment_id] = runs.get(segment_id, 0) + 1
+
+    return {
+        window: _length_table(
+            hashes[window], window_counts[window], run_counts[window], run_count, seen,
+            persistence_threshold, repeatability_threshold
+        )
+        for window in range(min_window, max_window + 1)
+    }
+
+
+def _length_table(hashes, window_counts, run_counts, run_count, length,
+                  persistence_threshold, repeatability_threshold):
+    """
+    Per-length persistence and repeatability tables.
+
+    Args:
+        hashes: segment hash per segment ID
+        window_counts: windows per segment ID (all runs, seams included)
+        run_counts: dict mapping segment ID to runs containing it (first-run order)
+        run_count: number of runs
+        length: total number of residues
+        persistence_threshold, repeatability_threshold: fixed thresholds
+
+    Returns:
+        Dictionary in the format of count_segment_lengths values
+    """
+    persistence_counts = {}
+    if run_count >= 2:
+        persistence_counts = {hashes[segment_id]: count for segment_id, count in run_counts.items()}
+
+    repeatability_counts = {}
+    if length >= 2:
+        repeatability_counts = dict(zip(hashes, window_counts))
+
+    return {
+        'persistence_counts': persistence_counts,
+        'persistent_segment_hashes': [
+            seg_hash for seg_hash, count in persistence_counts.items() if count >= persistence_threshold
+        ],
+        'repeatability_counts': repeatability_counts,
+        'repeatable_unit_hashes': [
+            unit_hash for unit_hash, count in repeatability_counts.items() if count >= repeatability_threshold
+        ],
+    }
@@ -0,0 +1,269 @@
+"""
+THRESHOLD_ONSET — Phase 2: PARTIAL
+
+Per-run Phase 2 partial counts and their merge.
+Counts only. No names, no labels, no interpretation.
+
+A partial summarizes a contiguous block of runs:
+- table: SegmentTable the segment IDs refer to (None until a run is merged)
+- segment_runs: segment ID -> number of runs containing it
+- window_counts: segment ID -> windows in the concatenated runs
+  (including windows across the seams between runs)
+- head / tail: first and last window - 1 residues (to rebuild seams)
+- cluster_runs: cluster hash -> number of runs containing it
+
+Segment hashes are resolved only in finalize_partial (once per distinct
+segment, cached by the table). A merged partial counts in CountTables
+(arrays indexed by ID); a partial from another table (e.g. a pool
+worker) is translated into the merged table by segment key.
+
+Every table keeps first-occurrence order. Merging block [a, b] with the
+block right after it is associative, and new_partial() is its identity,
+so partials can be computed anywhere (e.g. a process pool) and combined
+in run order. finalize_partial() returns the same metrics, in the same
+order, as the serial Phase 2 multi-run pipeline.
+
+A hashed partial (see hash_partial) is keyed by segment hash instead of
+segment ID, and its tables may be stores (see phase2.store) instead of
+dicts, so the merged tables can live on disk.
+"""
+
+from phase2 import hashing
+from phase2.fingerprint import hash_cluster
+from phase2.hashing import hash_key, segment_key
+from phase2.identity import IDENTITY_PERSISTENCE_THRESHOLD, _generate_identity_hash
+from phase2.intern import CountTable
+from phase2.persistence import PERSISTENCE_THRESHOLD
+from phase2.repeatable import REPEATABILITY_THRESHOLD
+from phase2.segment_index import SEGMENT_WINDOW
+from phase2.store import DictStore, SqliteStore, StoreView
+from phase2.stability import STABILITY_THRESHOLD
+
+
+def new_partial(window=SEGMENT_WINDOW, store_factory=None):
+    """
+    Empty partial (covers no runs).
+
+    Args:
+        window: fixed segment window size (default: SEGMENT_WINDOW)
+        store_factory: callable returning an empty store (e.g. SqliteStore);
+                       if given, the partial is hashed and its tables are stores
+                       (default: CountTables keyed by segment ID)
+
+    Returns:
+        Partial dictionary
+    """
+    def table():
+        return CountTable() if store_factory is None else store_factory()
+
+    return {
+        'hash_mode': hashing.HASH_MODE,
+        'window': window,
+        'hashed': store_factory is not None,
+        'table': None,
+        'runs': 0,
+        'cluster_sequences': 0,
+        'length': 0,
+        'segment_runs': table(),
+        'window_counts': table(),
+        'head': [],
+        'tail': [],
+        'cluster_runs': {} if store_factory is None else store_factory(),
+    }
+
+
+def build_partial(index, clusters=None):
+    """
+    Partial for one run.
+
+    Args:
+        index: SegmentIndex of the run's residues
+        clusters: list of clusters (each a list of residues) for the run,
+                  or None if the run has no Phase 1 clusters
+
+    Returns:
+        Partial dictionary
+    """
+    residues = index.residues
+    edge = index.window - 1
+
+    partial = new_partial(index.window)
+    partial['hash_mode'] = index.hash_mode
+    partial['table'] = index.table
+    partial['runs'] = 1
+    partial['length'] = len(residues)
+    partial['window_counts'] = dict(index.counts)
+    partial['segment_runs'] = dict.fromkeys(partial['window_counts'], 1)
+    partial['head'] = list(residues[:edge])
+    partial['tail'] = list(residues[max(0, len(residues) - edge):]) if edge else []
+
+    if clusters is not None:
+        # Clusters are compared as multisets (order-independent hashes)
+        partial['cluster_sequences'] = 1
+        partial['cluster_runs'] = dict.fromkeys(map(hash_cluster, clusters), 1)
+    return partial
+
+
+def hash_partial(partial):
+    """
+    Copy of a partial keyed by segment hash instead of segment ID.
+
+    Args:
+        partial: unhashed partial (dict or CountTable tables)
+
+    Returns:
+        Hashed partial (dict tables, same order)
+    """
+    if partial['hashed']:
+        return partial
+    hash_of = partial['table'].hash_of if partial['table'] is not None else None
+    hashed = dict(partial)
+    hashed['hashed'] = True
+    hashed['table'] = None
+    hashed['window_counts'] = {
+        hash_of(segment_id): count for segment_id, count in partial['window_counts'].items()
+    }
+    if partial['runs'] == 1:
+        # One run: every segment is in exactly that run (no need to hash again)
+        hashed['segment_runs'] = dict.fromkeys(hashed['window_counts'], 1)
+    else:
+        hashed['segment_runs'] = {
+            hash_of(segment_id): count for segment_id, count in partial['segment_runs'].items()
+        }
+    hashed['cluster_runs'] = dict(partial['cluster_runs'].items())
+    return hashed
+
+
+def _add_counts(table, pairs):
+    """Add (key, count) pairs to a dict, a CountTable or a store."""
+    if isinstance(table, dict):
+        for key, count in pairs:
+            table[key] = table.get(key, 0) + count
+    else:
+        table.add_counts(pairs)
+
+
+def merge_partials(left, right):
+    """
+    Merge the partial of the runs right after left's runs into left.
+
+    left is updated in place and returned; right is not modified.
+    If left is hashed, right is hashed first (if it is not already).
+
+    Args:
+        left: partial for runs [a, b]
+        right: partial for runs [b + 1, c]
+
+    Returns:
+        Partial for runs [a, c]
+    """
+    if left['hash_mode'] != right['hash_mode'] or left['window'] != right['window']:
+        raise ValueError("Cannot merge partials built with different hash modes or windows")
+    if right['hash_mode'] != hashing.HASH_MODE:
+        raise ValueError("Partials must be merged in the hash mode they were built in")
+    if left['hashed'] and not right['hashed']:
+        right = hash_partial(right)
+    elif right['hashed'] and not left['hashed']:
+        raise ValueError("Cannot merge a hashed partial into an unhashed one")
+
+    window = left['window']
+    edge = window - 1
+
+    # Segment IDs of right in left's table (translated by key if the tables differ)
+    segment_id = None
+    if not left['hashed'] and right['table'] is not None:
+        if left['table'] is None:
+            left['table'] = right['table']
+        if right['table'] is not left['table']:
+            right_keys = right['table'].keys
+            intern = left['table'].intern
+            segment_id = lambda right_id: intern(right_keys[right_id])  # noqa: E731
+
+    def translated(pairs):
+        if segment_id is None:
+            return pairs
+        return ((segment_id(right_id), count) for right_id, count in pairs)
+
+    _add_counts(left['segment_runs'], translated(right['segment_runs'].items()))
+
+    # Windows across the seam come after left's windows and before right's
+    joined = left['tail'] + right['head']
+    seams = []
+    for start in range(len(left['tail'])):
+        if start + window <= len(joined):
+            key = segment_key(tuple(joined[start:start + window]))
+            seams.append((hash_key(key, left['hash_mode']) if left['hashed'] else left['table'].intern(key), 1))
+    _add_counts(left['window_counts'], seams)
+    _add_counts(left['window_counts'], translated(right['window_counts'].items()))
+
+    _add_counts(left['cluster_runs'], right['cluster_runs'].items())
+
+    left['head'] = (left['head'] + right['head'])[:edge]
+    tail = left['tail'] + right['tail']
+    left['tail'] = tail[max(0, len(tail) - edge):] if edge else []
+    left['runs'] += right['runs']
+    left['cluster_sequences'] += right['cluster_sequences']
+    left['length'] += right['length']
+    return left
+
+
+def finalize_partial(partial, views=False):
+    """
+    Phase 2 multi-run metrics from a merged partial.
+
+    Segment hashes are resolved here (cached by the partial's table, so
+    each segment is hashed once across calls).
+
+    Args:
+        partial: partial covering all runs (in run order)
+        views: for a partial with store tables, return the count tables as
+               read-only StoreViews over the stores instead of dicts (the
+               tables are streamed, never loaded; the stores must stay open)
+
+    Returns:
+        Dictionary with identity metrics (same keys and order as phase2_multi_run)
+    """
+    if partial['hashed'] or partial['table'] is None:
+        segment_hash = None
+    else:
+        segment_hash = partial['table'].hash_of
+    views = views and isinstance(partial['segment_runs'], (DictStore, SqliteStore))
+
+    def counts(name):
+        """Count table of the result: a view over the store, or a dict keyed by hash."""
+        if views:
+            return StoreView(partial[name])
+        if segment_hash is None or name == 'cluster_runs':
+            return dict(partial[name].items())
+        return {segment_hash(segment_id): count for segment_id, count in partial[name].items()}
+
+    persistence_counts = {}
+    identity_mappings = {}
+    identity_persistence = {}
+    if partial['runs'] >= 2:
+        persistence_counts = counts('segment_runs')
+        for seg_hash, count in persistence_counts.items():
+            if count >= IDENTITY_PERSISTENCE_THRESHOLD:
+                identity_hash = _generate_identity_hash(seg_hash, count)
+                identity_mappings[seg_hash] = identity_hash
+                identity_persistence[identity_hash] = count
+
+    repeatability_counts = counts('window_counts') if partial['length'] >= 2 else {}
+    stability_counts = counts('cluster_runs') if partial['cluster_sequences'] >= 2 else {}
+
+    return {
+        'persistence_counts': persistence_counts,
+        'persistent_segment_hashes': [
+            seg_hash for seg_hash, count in persistence_counts.items() if count >= PERSISTENCE_THRESHOLD
+        ],
+        'repeatability_counts': repeatability_counts,
+        'repeatable_unit_hashes': [
+            unit_hash for unit_hash, count in repeatability_counts.items() if count >= REPEATABILITY_THRESHOLD
+        ],
+        'identity_mappings': identity_mappings,
+        'identity_persistence': identity_persistence,
+        'stability_counts': stability_counts,
+        'stable_cluster_hashes': [
+            cluster_hash for cluster_hash, count in stability_counts.items() if count >= STABILITY_THRESHOLD
+        ],
+    }
@@ -9,14 +9,14 @@ CONSTRAINT: Thresholds must be FIXED, EXTERNAL, and NON-ADAPTIVE.
 No learning, tuning, or optimization allowed.
 """
 
-import hashlib
+from phase2.segment_index import as_segment_index
 
 # FIXED threshold for persistence detection (non-adaptive)
 # This value is external and fixed, not computed from data
 PERSISTENCE_THRESHOLD = 2
 
 
-def measure_persistence(residue_sequences, threshold=PERSISTENCE_THRESHOLD):
+def measure_persistence(residue_sequences, threshold=PERSISTENCE_THRESHOLD, prefilter=False):
     """
     Measure persistence of segments across multiple Phase 0 iterations.
     
@@ -24,39 +24,50 @@ def measure_persistence(residue_sequences, threshold=PERSISTENCE_THRESHOLD):
     Uses EXACT EQUALITY for segment comparison.
     
     Args:
-        residue_sequences: list of residue sequences (each from a Phase 0 iteration)
+        residue_sequences: list of residue sequences or SegmentIndex objects (each from a Phase 0 iteration)
         threshold: fixed persistence threshold (default: PERSISTENCE_THRESHOLD)
+        prefilter: opt-in two-pass counting (True or a CountMinSketch, see
+                   phase2.sketch); the full persistence_counts table is then
+                   never built
     
     Returns:
         Dictionary with:
         - 'persistence_counts': dict mapping segment hash to persistence count (int)
+          (absent with prefilter)
+        - 'persistent_segment_counts': with prefilter only, dict mapping the
+          hashes of segments that persist above threshold to their (exact) count
         - 'persistent_segment_hashes': list of hashes for segments that persist above threshold
     """
+    counts_key = 'persistent_segment_counts' if prefilter else 'persistence_counts'
     if len(residue_sequences) < 2:
         return {
-            'persistence_counts': {},
+            counts_key: {},
             'persistent_segment_hashes': []
         }
     
-    # Track segments across iterations using EXACT EQUALITY
-    segment_counts = {}
-    
     # Use fixed window size for segment definition
     SEGMENT_WINDOW = 2
     
+    if prefilter:
+        from phase2.sketch import prefiltered_persistence  # pylint: disable=import-outside-toplevel
+        sketch = None if prefilter is True else prefilter
+        segment_counts = prefiltered_persistence(residue_sequences, threshold, sketch, SEGMENT_WINDOW)
+        return {
+            'persistent_segment_counts': segment_counts,
+            'persistent_segment_hashes': list(segment_counts)
+        }
+    
+    # Track segments across iterations using EXACT EQUALITY
+    segment_counts = {}
+    
     for sequence in residue_sequences:
-        # Extract all segments of fixed window size
-        seen_in_this_iteration = set()
+        # Segment hashes come from the per-sequence index (hashed once)
+        index = as_segment_index(sequence, SEGMENT_WINDOW)
         
-        for i in range(len(sequence) - SEGMENT_WINDOW + 1):
-            segment = tuple(sequence[i:i + SEGMENT_WINDOW])
-            # Generate internal hash for segment (mechanical identifier only)
-            segment_hash = _hash_segment(segment)
-            
-            # Count persistence (only once per iteration)
-            if segment_hash not in seen_in_this_iteration:
-                segment_counts[segment_hash] = segment_counts.get(segment_hash, 0) + 1
-                seen_in_this_iteration.add(segment_hash)
+        # Count persistence (only once per iteration)
+        for segment_id in index.counts:
+            segment_hash = index.segment_hash(segment_id)
+            segment_counts[segment_hash] = segment_counts.get(segment_hash, 0) + 1
     
     # Identify segments that persist above threshold
     persistent_hashes = [
@@ -68,20 +79,3 @@ def measure_persistence(residue_sequences, threshold=PERSISTENCE_THRESHOLD):
         'persistence_counts': segment_counts,
         'persistent_segment_hashes': persistent_hashes
     }
-
-
-def _hash_segment(segment):
-    """
-    Generate internal identity hash for a segment.
-    
-    Hash is for internal tracking only, not a name or symbol.
-    
-    Args:
-        segment: tuple of residues (fixed window)
-    
-    Returns:
-        Hash value (internal identifier only)
-    """
-    # Convert segment to bytes for hashing
-    segment_bytes = str(segment).encode('utf-8')
-    return hashlib.md5(segment_bytes).hexdigest()
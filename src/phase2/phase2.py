@@ -20,7 +20,7 @@ def phase2(residues, phase1_metrics):
     Returns identity metrics only (hashes and counts).
     
     Args:
-        residues: list of opaque residues (floats from Phase 0)
+        residues: list of opaque residues (floats from Phase 0) or SegmentIndex
         phase1_metrics: dictionary with Phase 1 structural metrics
     
     Returns:
@@ -38,6 +38,11 @@ def phase2(residues, phase1_metrics):
     from phase2.repeatable import detect_repeatable_units  # pylint: disable=import-outside-toplevel
     from phase2.identity import assign_identity_hashes  # pylint: disable=import-outside-toplevel
     from phase2.stability import measure_stability  # pylint: disable=import-outside-toplevel
+    from phase2.segment_index import as_segment_index, raw_residues  # pylint: disable=import-outside-toplevel
+    
+    # Segment hashes are computed once and shared by every step below
+    index = as_segment_index(residues)
+    residues = raw_residues(residues)
     
     # For Phase 2, we need multiple iterations to measure persistence
     # Since Phase 0 runs once, we'll treat the single residue sequence as one iteration
@@ -46,11 +51,11 @@ def phase2(residues, phase1_metrics):
     
     # Persistence measurement (requires multiple iterations)
     # For single iteration, persistence is measured within the sequence
-    residue_sequences = [residues]  # Single iteration for now
+    residue_sequences = [index]  # Single iteration for now
     persistence_result = measure_persistence(residue_sequences)
     
     # Repeatable unit detection (works on single sequence)
-    repeatable_result = detect_repeatable_units(residues)
+    repeatable_result = detect_repeatable_units(index)
     
     # Identity hash assignment (requires multiple iterations)
     identity_result = assign_identity_hashes(residue_sequences)
@@ -78,8 +83,10 @@ def _reconstruct_clusters(residues, phase1_metrics):
     """
     Reconstruct clusters from residues using Phase 1 clustering logic.
     
-    This is necessary because Phase 1 only returns cluster_count and cluster_sizes,
-    not the actual cluster contents. We need to reconstruct them for stability measurement.
+    Phase 1 returns cluster_count and cluster_sizes, and (when asked) the
+    cluster index of every residue. Cluster contents are rebuilt from those
+    labels, so clustering runs once per run. If the labels are missing,
+    Phase 1's clustering engine is run once to produce them.
     
     Args:
         residues: list of opaque residues (floats from Phase 0)
@@ -89,40 +96,28 @@ def _reconstruct_clusters(residues, phase1_metrics):
         List of cluster sequences (single iteration for now)
         Each cluster is a list of residues
     """
-    # Import Phase 1 clustering to reconstruct clusters
-    from phase1.cluster import cluster_residues  # pylint: disable=import-outside-toplevel
+    labels = phase1_metrics.get('cluster_labels') if phase1_metrics else None
     
-    # Re-cluster using Phase 1 logic (same threshold)
-    # This is mechanical reconstruction, not modification of Phase 1
-    cluster_result = cluster_residues(residues)
-    
-    # We need to reconstruct actual cluster contents
-    # Since Phase 1 doesn't return cluster contents, we'll use the same clustering logic
-    # to get the actual clusters
-    from phase1.distance import absolute_difference  # pylint: disable=import-outside-toplevel
-    from phase1.cluster import CLUSTER_THRESHOLD  # pylint: disable=import-outside-toplevel
+    if labels is None or len(labels) != len(residues):
+        # Re-cluster using Phase 1 logic (same threshold)
+        # This is mechanical reconstruction, not modification of Phase 1
+        from phase1.cluster import cluster_residues  # pylint: disable=import-outside-toplevel
+        labels = cluster_residues(residues, return_labels=True)['cluster_labels']
     
+    # Labels are assigned in creation order, so a new label is always the next index
     clusters = []
-    cluster_centers = []
-    
-    for residue in residues:
-        assigned = False
-        for idx, center in enumerate(cluster_centers):
-            if absolute_difference(residue, center) <= CLUSTER_THRESHOLD:
-                clusters[idx].append(residue)
-                cluster_centers[idx] = sum(clusters[idx]) / len(clusters[idx])
-                assigned = True
-                break
-        
-        if not assigned:
+    for residue, label in zip(residues, labels):
+        if label == len(clusters):
             clusters.append([residue])
-            cluster_centers.append(residue)
+        else:
+            clusters[label].append(residue)
     
     # Return as sequence of clusters (single iteration)
     return [clusters]
 
 
-def phase2_multi_run(residue_sequences, phase1_metrics_list):
+def phase2_multi_run(residue_sequences, phase1_metrics_list, workers=1, chunksize=1,
+                     identity_source='segments', store_factory=None, prefilter=False):
     """
     Phase 2 identity pipeline with multiple runs.
     
@@ -131,9 +126,31 @@ def phase2_multi_run(residue_sequences, phase1_metrics_list):
     Performs identity detection without naming.
     Returns identity metrics only (hashes and counts).
     
+    Each run is reduced to a partial (segment set, window counts, seam
+    residues, cluster hashes); partials are merged in run order. Windows
+    across the seams between runs are counted exactly as if the runs were
+    concatenated, without building the concatenation.
+    
     Args:
-        residue_sequences: list of residue sequences (each from a separate Phase 0 run)
+        residue_sequences: list of residue sequences or SegmentIndex objects (each from a separate Phase 0 run)
         phase1_metrics_list: list of Phase 1 metrics (one per run)
+        workers: number of worker processes for per-run partials (1 = this process)
+        chunksize: runs handed to a worker at a time (only used if workers > 1)
+        identity_source: 'segments' (fixed-window persistent segments) or
+                         'automaton' (maximal persistent segments of any length,
+                         see phase2.automaton)
+        store_factory: callable returning an empty store (e.g. SqliteStore) to
+                       merge the run tables in, keyed by hash (see phase2.store);
+                       default: in-memory dicts (same result either way).
+                       The count tables of the result are then read-only
+                       StoreViews streamed from the stores (equal to the dicts)
+        prefilter: opt-in two-pass counting with count-min sketches (see
+                   phase2.sketch), in this process: the full persistence and
+                   repeatability tables are never built. 'persistence_counts'
+                   and 'repeatability_counts' are then replaced by
+                   'persistent_segment_counts' and 'repeatable_unit_counts'
+                   (exact counts, only for hashes above threshold); every
+                   other key is unchanged
     
     Returns:
         Dictionary with identity metrics:
@@ -146,39 +163,165 @@ def phase2_multi_run(residue_sequences, phase1_metrics_list):
         - 'stability_counts': dict mapping cluster hash to stability count
         - 'stable_cluster_hashes': list of stable cluster hashes
     """
-    from phase2.persistence import measure_persistence  # pylint: disable=import-outside-toplevel
-    from phase2.repeatable import detect_repeatable_units  # pylint: disable=import-outside-toplevel
-    from phase2.identity import assign_identity_hashes  # pylint: disable=import-outside-toplevel
-    from phase2.stability import measure_stability  # pylint: disable=import-outside-toplevel
+    from functools import reduce  # pylint: disable=import-outside-toplevel
+    from phase2.partial import new_partial, merge_partials, finalize_partial  # pylint: disable=import-outside-toplevel
+    from phase2.segment_index import as_segment_index, shared_table  # pylint: disable=import-outside-toplevel
     
-    # Persistence measurement across multiple runs
-    persistence_result = measure_persistence(residue_sequences)
+    if identity_source not in ('segments', 'automaton'):
+        raise ValueError(f"Unknown identity source: {identity_source!r}")
+    if prefilter and (workers > 1 or store_factory is not None):
+        raise ValueError("prefilter runs in this process and cannot be combined with workers or store_factory")
     
-    # Repeatable unit detection (aggregate across all runs)
-    # Combine all residues from all runs for repeatability detection
-    all_residues = []
-    for residues in residue_sequences:
-        all_residues.extend(residues)
-    repeatable_result = detect_repeatable_units(all_residues)
+    # Runs without Phase 1 metrics take no part in stability (as before)
+    phase1_metrics_list = list(phase1_metrics_list)[:len(residue_sequences)]
+    has_clusters = [True] * len(phase1_metrics_list) + [False] * (len(residue_sequences) - len(phase1_metrics_list))
+    phase1_metrics_list += [None] * (len(residue_sequences) - len(phase1_metrics_list))
     
-    # Identity hash assignment across multiple runs
-    identity_result = assign_identity_hashes(residue_sequences)
+    if prefilter:
+        metrics = _phase2_prefiltered(residue_sequences, phase1_metrics_list, has_clusters)
+    else:
+        if workers > 1 and len(residue_sequences) > 1:
+            from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+            from phase2 import hashing  # pylint: disable=import-outside-toplevel
+            from phase2.segment_index import raw_residues  # pylint: disable=import-outside-toplevel
+            
+            tasks = [
+                (_picklable_residues(raw_residues(residues)), phase1_metrics, clustered, hashing.HASH_MODE)
+                for residues, phase1_metrics, clustered in zip(residue_sequences, phase1_metrics_list, has_clusters)
+            ]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                partials = list(executor.map(_phase2_partial_task, tasks, chunksize=chunksize))
+        else:
+            # Segments are interned once per run, into one table shared across runs
+            # (with a store, each run has its own table). Each run is indexed,
+            # reduced to its partial and released before the next one is indexed.
+            table = shared_table(residue_sequences) if store_factory is None else None
+            indexes = (as_segment_index(residues, table=table) for residues in residue_sequences)
+            partials = (
+                _phase2_partial(index, phase1_metrics, clustered)
+                for index, phase1_metrics, clustered
+                in zip(indexes, phase1_metrics_list, has_clusters)
+            )
+        
+        merged = reduce(merge_partials, partials, new_partial(store_factory=store_factory))
+        # With stores, the count tables stay in them (released with the result)
+        metrics = finalize_partial(merged, views=True)
     
-    # Stability measurement across multiple runs
-    # Reconstruct clusters for each run
-    cluster_sequences = []
-    for residues, phase1_metrics in zip(residue_sequences, phase1_metrics_list):
-        clusters = _reconstruct_clusters(residues, phase1_metrics)
-        cluster_sequences.extend(clusters)
-    stability_result = measure_stability(cluster_sequences)
+    if identity_source == 'automaton':
+        from phase2.automaton import assign_automaton_identities  # pylint: disable=import-outside-toplevel
+        metrics.update(assign_automaton_identities(residue_sequences))
+    return metrics
+
+
+def _phase2_prefiltered(residue_sequences, phase1_metrics_list, has_clusters):
+    """
+    Phase 2 multi-run metrics with sketch pre-filtered segment counting.
+    
+    Args:
+        residue_sequences: list of residue sequences or SegmentIndex objects
+        phase1_metrics_list: Phase 1 metrics per run
+        has_clusters: per run, False if the run takes no part in stability
+    
+    Returns:
+        Dictionary with identity metrics (see phase2_multi_run, prefilter=True)
+    """
+    from phase2.fingerprint import hash_cluster  # pylint: disable=import-outside-toplevel
+    from phase2.identity import IDENTITY_PERSISTENCE_THRESHOLD, _generate_identity_hash  # pylint: disable=import-outside-toplevel
+    from phase2.persistence import PERSISTENCE_THRESHOLD  # pylint: disable=import-outside-toplevel
+    from phase2.repeatable import REPEATABILITY_THRESHOLD  # pylint: disable=import-outside-toplevel
+    from phase2.segment_index import raw_residues  # pylint: disable=import-outside-toplevel
+    from phase2.sketch import prefiltered_persistence, prefiltered_run_repeatability  # pylint: disable=import-outside-toplevel
+    from phase2.stability import STABILITY_THRESHOLD  # pylint: disable=import-outside-toplevel
+    
+    sequences = [raw_residues(residues) for residues in residue_sequences]
+    
+    # Identities need every segment at or above their own threshold too
+    persistence_counts = {}
+    identity_mappings = {}
+    identity_persistence = {}
+    if len(sequences) >= 2:
+        persistence_counts = prefiltered_persistence(
+            sequences, min(PERSISTENCE_THRESHOLD, IDENTITY_PERSISTENCE_THRESHOLD)
+        )
+        for seg_hash, count in persistence_counts.items():
+            if count >= IDENTITY_PERSISTENCE_THRESHOLD:
+                identity_hash = _generate_identity_hash(seg_hash, count)
+                identity_mappings[seg_hash] = identity_hash
+                identity_persistence[identity_hash] = count
+    persistent_segment_counts = {
+        seg_hash: count for seg_hash, count in persistence_counts.items() if count >= PERSISTENCE_THRESHOLD
+    }
+    
+    repeatable_unit_counts = {}
+    if sum(len(residues) for residues in sequences) >= 2:
+        repeatable_unit_counts = prefiltered_run_repeatability(sequences, REPEATABILITY_THRESHOLD)
+    
+    # Cluster hashes are few: counted exactly, as in the partials
+    stability_counts = {}
+    cluster_sequences = 0
+    for residues, phase1_metrics, clustered in zip(sequences, phase1_metrics_list, has_clusters):
+        if clustered:
+            cluster_sequences += 1
+            clusters = _reconstruct_clusters(residues, phase1_metrics)[0]
+            for cluster_hash in dict.fromkeys(map(hash_cluster, clusters)):
+                stability_counts[cluster_hash] = stability_counts.get(cluster_hash, 0) + 1
+    if cluster_sequences < 2:
+        stability_counts = {}
     
     return {
-        'persistence_counts': persistence_result['persistence_counts'],
-        'persistent_segment_hashes': persistence_result['persistent_segment_hashes'],
-        'repeatability_counts': repeatable_result['repeatability_counts'],
-        'repeatable_unit_hashes': repeatable_result['repeatable_unit_hashes'],
-        'identity_mappings': identity_result['identity_mappings'],
-        'identity_persistence': identity_result['identity_persistence'],
-        'stability_counts': stability_result['stability_counts'],
-        'stable_cluster_hashes': stability_result['stable_cluster_hashes']
-    }
\ No newline at end of file
+        'persistent_segment_counts': persistent_segment_counts,
+        'persistent_segment_hashes': list(persistent_segment_counts),
+        'repeatable_unit_counts': repeatable_unit_counts,
+        'repeatable_unit_hashes': list(repeatable_unit_counts),
+        'identity_mappings': identity_mappings,
+        'identity_persistence': identity_persistence,
+        'stability_counts': stability_counts,
+        'stable_cluster_hashes': [
+            cluster_hash for cluster_hash, count in stability_counts.items() if count >= STABILITY_THRESHOLD
+        ],
+    }
+
+
+def _phase2_partial(index, phase1_metrics, has_clusters=True):
+    """
+    Phase 2 partial for one run.
+    
+    Args:
+        index: SegmentIndex of the run's residues
+        phase1_metrics: Phase 1 metrics for the run
+        has_clusters: False if the run takes no part in stability
+    
+    Returns:
+        Partial dictionary (see phase2.partial)
+    """
+    from phase2.partial import build_partial  # pylint: disable=import-outside-toplevel
+    
+    if not has_clusters:
+        return build_partial(index)
+    clusters = _reconstruct_clusters(index.residues, phase1_metrics)[0]
+    return build_partial(index, clusters)
+
+
+def _phase2_partial_task(task):
+    """
+    Pool worker: Phase 2 partial for one run.
+    
+    Args:
+        task: (residues, phase1_metrics, has_clusters, hash_mode)
+    
+    Returns:
+        Partial dictionary (see phase2.partial)
+    """
+    from phase2.hashing import set_hash_mode  # pylint: disable=import-outside-toplevel
+    from phase2.segment_index import SegmentIndex  # pylint: disable=import-outside-toplevel
+    
+    residues, phase1_metrics, has_clusters, hash_mode = task
+    set_hash_mode(hash_mode)
+    return _phase2_partial(SegmentIndex(residues), phase1_metrics, has_clusters)
+
+
+def _picklable_residues(residues):
+    """Residues in a form that can be sent to a worker process (memoryviews are copied)."""
+    if isinstance(residues, memoryview):
+        return residues.tolist()
+    return residues
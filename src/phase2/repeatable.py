@@ -9,14 +9,14 @@ CONSTRAINT: Uses EXACT EQUALITY only.
 No approximate matching or abstraction allowed.
 """
 
-import hashlib
+from phase2.segment_index import as_segment_index
 
 # FIXED threshold for repeatability detection (non-adaptive)
 # This value is external and fixed, not computed from data
 REPEATABILITY_THRESHOLD = 2
 
 
-def detect_repeatable_units(residues, threshold=REPEATABILITY_THRESHOLD):
+def detect_repeatable_units(residues, threshold=REPEATABILITY_THRESHOLD, prefilter=False):
     """
     Detect units that repeat consistently across different contexts.
     
@@ -24,34 +24,47 @@ def detect_repeatable_units(residues, threshold=REPEATABILITY_THRESHOLD):
     No abstraction or compression.
     
     Args:
-        residues: list of opaque residues (floats from Phase 0)
+        residues: list of opaque residues (floats from Phase 0) or SegmentIndex
         threshold: fixed repeatability threshold (default: REPEATABILITY_THRESHOLD)
+        prefilter: opt-in two-pass counting (True or a CountMinSketch, see
+                   phase2.sketch); the full repeatability_counts table is then
+                   never built
     
     Returns:
         Dictionary with:
         - 'repeatability_counts': dict mapping unit hash to repeat count (int)
+          (absent with prefilter)
+        - 'repeatable_unit_counts': with prefilter only, dict mapping the
+          hashes of units that repeat above threshold to their (exact) count
         - 'repeatable_unit_hashes': list of hashes for units that repeat above threshold
     """
+    counts_key = 'repeatable_unit_counts' if prefilter else 'repeatability_counts'
     if len(residues) < 2:
         return {
-            'repeatability_counts': {},
+            counts_key: {},
             'repeatable_unit_hashes': []
         }
     
     # Fixed window size for unit definition
     UNIT_WINDOW = 2
     
+    if prefilter:
+        from phase2.sketch import prefiltered_repeatability  # pylint: disable=import-outside-toplevel
+        sketch = None if prefilter is True else prefilter
+        unit_counts = prefiltered_repeatability(residues, threshold, sketch, UNIT_WINDOW)
+        return {
+            'repeatable_unit_counts': unit_counts,
+            'repeatable_unit_hashes': list(unit_counts)
+        }
+    
     # Track all units and their repeat counts
     unit_counts = {}
     
-    # Extract all units of fixed window size
-    for i in range(len(residues) - UNIT_WINDOW + 1):
-        unit = tuple(residues[i:i + UNIT_WINDOW])
-        # Generate internal hash for unit (mechanical identifier only)
-        unit_hash = _hash_unit(unit)
-        
-        # Count occurrences using EXACT EQUALITY
-        unit_counts[unit_hash] = unit_counts.get(unit_hash, 0) + 1
+    # Units come from the segment index (hashed once)
+    # Count occurrences using EXACT EQUALITY
+    index = as_segment_index(residues, UNIT_WINDOW)
+    for unit_id, count in index.counts.items():
+        unit_counts[index.segment_hash(unit_id)] = count
     
     # Identify units that repeat above threshold
     repeatable_hashes = [
@@ -63,20 +76,3 @@ def detect_repeatable_units(residues, threshold=REPEATABILITY_THRESHOLD):
         'repeatability_counts': unit_counts,
         'repeatable_unit_hashes': repeatable_hashes
     }
-
-
-def _hash_unit(unit):
-    """
-    Generate internal identity hash for a unit.
-    
-    Hash is for internal tracking only, not a name or symbol.
-    
-    Args:
-        unit: tuple of residues (fixed window)
-    
-    Returns:
-        Hash value (internal identifier only)
-    """
-    # Convert unit to bytes for hashing
-    unit_bytes = str(unit).encode('utf-8')
-    return hashlib.md5(unit_bytes).hexdigest()
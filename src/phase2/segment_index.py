@@ -0,0 +1,192 @@
+"""
+THRESHOLD_ONSET — Phase 2: SEGMENT INDEX
+
+Window segments of one residue sequence, interned once.
+Shared by every Phase 2 and Phase 3 function that reads segments.
+Hashes are INTERNAL ONLY - not names, not symbols.
+
+Segments are interned by their canonical bytes into dense integer IDs.
+The hex hash of a segment is computed lazily, once per distinct segment.
+
+CONSTRAINT: Uses EXACT EQUALITY only (same hashes as hash_segment).
+"""
+
+from array import array
+from collections import Counter
+
+from phase2 import hashing
+from phase2.hashing import hash_key, segment_key
+from phase2.intern import InternTable
+
+# Fixed window size for segment definition (same as Phase 2 SEGMENT_WINDOW)
+SEGMENT_WINDOW = 2
+
+
+class SegmentTable(InternTable):
+    """
+    Interning table for segments (canonical bytes -> dense ID).
+
+    Share one table across runs so equal segments get the same ID and
+    are hashed only once. The table is tied to the hash mode it was
+    created in.
+    """
+    def __init__(self):
+        super().__init__()
+        self.hash_mode = hashing.HASH_MODE
+        self._hashes = []
+
+    def hash_of(self, segment_id):
+        """
+        Hex hash of an interned segment (computed on first request).
+
+        Args:
+            segment_id: segment ID from this table
+
+        Returns:
+            Hash value (internal identifier only)
+        """
+        hashes = self._hashes
+        if len(hashes) <= segment_id:
+            hashes.extend([None] * (len(self.keys) - len(hashes)))
+        segment_hash = hashes[segment_id]
+        if segment_hash is None:
+            segment_hash = hashes[segment_id] = hash_key(self.keys[segment_id], self.hash_mode)
+        return segment_hash
+
+
+class SegmentIndex:
+    """
+    Per-sequence segment index.
+
+    Holds:
+    - residues: the residue sequence (not copied)
+    - window: fixed segment window size
+    - table: SegmentTable the segment IDs refer to
+    - ids: segment ID per window start position (array('i'))
+    - counts: dict mapping segment ID to its number of windows,
+      in first-occurrence order
+    - postings: segment ID -> start positions (built on request, not kept)
+    """
+    def __init__(self, residues, window=SEGMENT_WINDOW, table=None):
+        """
+        Args:
+            residues: list of opaque residues (floats from Phase 0)
+            window: fixed window size (default: SEGMENT_WINDOW)
+            table: SegmentTable to intern into (default: a new table)
+        """
+        if table is None:
+            table = SegmentTable()
+        elif table.hash_mode != hashing.HASH_MODE:
+            raise ValueError("SegmentTable was built in another hash mode")
+
+        self.residues = residues
+        self.window = window
+        self.table = table
+        self.hash_mode = table.hash_mode
+
+        windows = zip(*[residues[offset:] for offset in range(window)])
+        self.ids = array('i', map(table.intern, map(segment_key, windows)))
+        # Counter keeps first-occurrence order
+        self.counts = Counter(self.ids)
+        self._hashes = None
+
+    @property
+    def postings(self):
+        """Dict mapping segment ID to its start positions, in first-occurrence order."""
+        postings = {segment_id: [] for segment_id in self.counts}
+        for position, segment_id in enumerate(self.ids):
+            postings[segment_id].append(position)
+        return postings
+
+    def segment_hash(self, segment_id):
+        """Hex hash of a segment ID (internal identifier only)."""
+        return self.table.hash_of(segment_id)
+
+    @property
+    def hashes(self):
+        """Hex segment hash per window start position."""
+        if self._hashes is None:
+            hash_of = self.table.hash_of
+            self._hashes = [hash_of(segment_id) for segment_id in self.ids]
+        return self._hashes
+
+    def __len__(self):
+        """Number of residues in the indexed sequence."""
+        return len(self.residues)
+
+
+def as_segment_index(residues, window=SEGMENT_WINDOW, table=None):
+    """
+    Return a SegmentIndex for residues, reusing it if already built.
+
+    An existing index is reused only if its window and hash mode match
+    (and its table, if one is given); otherwise its residues are indexed
+    again.
+
+    Args:
+        residues: residue sequence or SegmentIndex
+        window: fixed window size (default: SEGMENT_WINDOW)
+        table: SegmentTable to intern into (default: the index's own, or a new one)
+
+    Returns:
+        SegmentIndex
+    """
+    if isinstance(residues, SegmentIndex):
+        if (residues.window == window and residues.hash_mode == hashing.HASH_MODE
+                and (table is None or residues.table is table)):
+            return residues
+        residues = residues.residues
+    if table is not None and table.hash_mode != hashing.HASH_MODE:
+        table = None
+    return SegmentIndex(residues, window, table)
+
+
+def shared_table(residue_sequences):
+    """
+    SegmentTable to index several residue sequences into.
+
+    The table of the first existing index in the current hash mode is
+    reused, so indexes already on it are not rebuilt.
+
+    Args:
+        residue_sequences: list of residue sequences or SegmentIndex objects
+
+    Returns:
+        SegmentTable
+    """
+    for residues in residue_sequences:
+        if isinstance(residues, SegmentIndex) and residues.hash_mode == hashing.HASH_MODE:
+            return residues.table
+    return SegmentTable()
+
+
+def index_sequences(residue_sequences, window=SEGMENT_WINDOW):
+    """
+    Index several residue sequences into one shared SegmentTable.
+
+    Existing indexes are reused if they already share a current table.
+
+    Args:
+        residue_sequences: list of residue sequences or SegmentIndex objects
+        window: fixed window size (default: SEGMENT_WINDOW)
+
+    Returns:
+        List of SegmentIndex objects (same order), all on one table
+    """
+    table = shared_table(residue_sequences)
+    return [as_segment_index(residues, window, table) for residues in residue_sequences]
+
+
+def raw_residues(residues):
+    """
+    Return the residue sequence behind a SegmentIndex (or residues unchanged).
+
+    Args:
+        residues: residue sequence or SegmentIndex
+
+    Returns:
+        Residue sequence
+    """
+    if isinstance(residues, SegmentIndex):
+        return residues.residues
+    return residues
@@ -0,0 +1,206 @@
+"""
+THRESHOLD_ONSET — Phase 2: SKETCH
+
+Count-min pre-filter for exact two-pass segment counting.
+Returns counts only. No names, no labels, no interpretation.
+
+Pass 1 adds every segment to a count-min sketch (fixed size, saturating
+byte counters). The sketch can only over-estimate, so every segment that
+reaches the threshold passes it. Pass 2 counts exactly, keeping only the
+segments the sketch lets through, and drops those still below the
+threshold. Peak memory is the sketch plus the candidate table instead of
+a table of every segment.
+
+The counts returned are EXACT, but only for segments at or above the
+threshold (singletons are never stored). They are returned under their
+own keys ('persistent_segment_counts', 'repeatable_unit_counts'), never
+as the full persistence_counts / repeatability_counts tables.
+
+By default a sketch is sized from the number of windows it will see
+(sketch_width): SKETCH_LOAD counters per window and row, rounded up to a
+power of two, at most SKETCH_WIDTH. A run of a few hundred residues gets
+a few kilobytes, not the full 16 MB.
+
+CONSTRAINT: Sketch sizes are FIXED, EXTERNAL, and NON-ADAPTIVE
+(a fixed function of the input length, never of the counts).
+"""
+
+from array import array
+from itertools import chain, islice, tee
+
+from phase2.hashing import hash_key, segment_key
+from phase2.segment_index import SEGMENT_WINDOW, raw_residues
+
+# FIXED sketch dimensions (non-adaptive): largest counters per row, rows
+SKETCH_WIDTH = 1 << 22
+SKETCH_DEPTH = 4
+
+# FIXED sizing of default sketches: counters per row per window, smallest width
+SKETCH_LOAD = 4
+MIN_SKETCH_WIDTH = 64
+
+# Counters saturate here (one byte each)
+_COUNTER_MAX = 255
+_MASK32 = (1 << 32) - 1
+
+
+class CountMinSketch:
+    """
+    Count-min sketch with saturating byte counters.
+
+    estimate(key) is never below the true count (up to _COUNTER_MAX).
+    Row positions come from the built-in hash of the key (bytes), so a
+    sketch is only meaningful within one process.
+    """
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        """
+        Args:
+            width: counters per row (default: SKETCH_WIDTH)
+            depth: number of rows (default: SKETCH_DEPTH)
+        """
+        self.width = width
+        self.depth = depth
+        self._rows = [array('B', bytes(width)) for _ in range(depth)]
+
+    def _positions(self, key):
+        value = hash(key)
+        low = value & _MASK32
+        high = ((value >> 32) & _MASK32) | 1
+        width = self.width
+        return [(low + row * high) % width for row in range(self.depth)]
+
+    def add(self, key):
+        """Count one occurrence of key."""
+        for row, position in zip(self._rows, self._positions(key)):
+            if row[position] < _COUNTER_MAX:
+                row[position] += 1
+
+    def estimate(self, key):
+        """Upper bound on the count of key (saturates at 255)."""
+        return min(row[position] for row, position in zip(self._rows, self._positions(key)))
+
+
+def sketch_width(windows):
+    """
+    Default sketch width for a number of windows.
+
+    Args:
+        windows: number of keys the sketch will count (upper bound)
+
+    Returns:
+        SKETCH_LOAD * windows rounded up to a power of two, between
+        MIN_SKETCH_WIDTH and SKETCH_WIDTH
+    """
+    width = MIN_SKETCH_WIDTH
+    while width < SKETCH_LOAD * windows and width < SKETCH_WIDTH:
+        width <<= 1
+    return width
+
+
+def _window_count(length, window):
+    return max(0, length - window + 1)
+
+
+def _window_keys(residues, window):
+    """Segment keys of every window of an iterable of residues, in position order (not stored)."""
+    shifted = tee(residues, window)
+    for offset, iterator in enumerate(shifted):
+        next(islice(iterator, offset, offset), None)  # advance by offset
+    return map(segment_key, zip(*shifted))
+
+
+def _check_threshold(threshold):
+    if not 1 <= threshold <= _COUNTER_MAX:
+        raise ValueError(f"Pre-filter thresholds must be between 1 and {_COUNTER_MAX}")
+
+
+def prefiltered_persistence(residue_sequences, threshold, sketch=None, window=SEGMENT_WINDOW):
+    """
+    Exact persistence counts of segments in at least threshold sequences.
+
+    Args:
+        residue_sequences: list of residue sequences or SegmentIndex objects
+        threshold: fixed persistence threshold
+        sketch: CountMinSketch for pass 1 (default: a new one)
+        window: fixed segment window size (default: SEGMENT_WINDOW)
+
+    Returns:
+        Dictionary mapping segment hash to persistence count, for segments
+        with count >= threshold (first-occurrence order, as measure_persistence)
+    """
+    _check_threshold(threshold)
+    sequences = [raw_residues(sequence) for sequence in residue_sequences]
+    if sketch is None:
+        windows = sum(_window_count(len(residues), window) for residues in sequences)
+        sketch = CountMinSketch(sketch_width(windows))
+
+    # Pass 1: each segment once per sequence
+    for residues in sequences:
+        for key in set(_window_keys(residues, window)):
+            sketch.add(key)
+
+    # Pass 2: exact counts of candidates only
+    counts = {}
+    for residues in sequences:
+        for key in dict.fromkeys(_window_keys(residues, window)):
+            if key in counts:
+                counts[key] += 1
+            elif sketch.estimate(key) >= threshold:
+                counts[key] = 1
+
+    return {hash_key(key): count for key, count in counts.items() if count >= threshold}
+
+
+def prefiltered_repeatability(residues, threshold, sketch=None, window=SEGMENT_WINDOW):
+    """
+    Exact window counts of units occurring at least threshold times.
+
+    Args:
+        residues: residue sequence or SegmentIndex
+        threshold: fixed repeatability threshold
+        sketch: CountMinSketch for pass 1 (default: a new one)
+        window: fixed unit window size (default: SEGMENT_WINDOW)
+
+    Returns:
+        Dictionary mapping unit hash to repeat count, for units with
+        count >= threshold (first-occurrence order, as detect_repeatable_units)
+    """
+    return prefiltered_run_repeatability([residues], threshold, sketch, window)
+
+
+def prefiltered_run_repeatability(residue_sequences, threshold, sketch=None, window=SEGMENT_WINDOW):
+    """
+    Exact window counts over several runs, as if the runs were concatenated.
+
+    Windows across the seams between runs are counted (as in
+    phase2_multi_run); the runs are never concatenated.
+
+    Args:
+        residue_sequences: list of residue sequences or SegmentIndex objects (in run order)
+        threshold: fixed repeatability threshold
+        sketch: CountMinSketch for pass 1 (default: a new one)
+        window: fixed unit window size (default: SEGMENT_WINDOW)
+
+    Returns:
+        Dictionary mapping unit hash to repeat count, for units with
+        count >= threshold (first-occurrence order)
+    """
+    _check_threshold(threshold)
+    sequences = [raw_residues(residues) for residues in residue_sequences]
+    if sketch is None:
+        windows = _window_count(sum(len(residues) for residues in sequences), window)
+        sketch = CountMinSketch(sketch_width(windows))
+
+    # Pass 1: every window
+    for key in _window_keys(chain.from_iterable(sequences), window):
+        sketch.add(key)
+
+    # Pass 2: exact counts of candidates only
+    counts = {}
+    for key in _window_keys(chain.from_iterable(sequences), window):
+        if key in counts:
+            counts[key] += 1
+        elif sketch.estimate(key) >= threshold:
+            counts[key] = 1
+
+    return {hash_key(key): count for key, count in counts.items() if count >= threshold}
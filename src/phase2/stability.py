@@ -9,7 +9,7 @@ CONSTRAINT: Uses EXACT EQUALITY only.
 No approximate matching or abstraction allowed.
 """
 
-import hashlib
+from phase2.fingerprint import hash_cluster
 
 # FIXED threshold for stability detection (non-adaptive)
 # This value is external and fixed, not computed from data
@@ -40,6 +40,7 @@ def measure_stability(cluster_sequences, threshold=STABILITY_THRESHOLD):
         }
     
     # Track clusters across iterations using EXACT EQUALITY
+    # Clusters are compared as multisets (order-independent hashes)
     cluster_counts = {}
     
     for cluster_sequence in cluster_sequences:
@@ -47,10 +48,8 @@ def measure_stability(cluster_sequences, threshold=STABILITY_THRESHOLD):
         seen_in_this_iteration = set()
         
         for cluster in cluster_sequence:
-            # Normalize cluster for comparison (sort residues for exact equality)
-            normalized_cluster = tuple(sorted(cluster))
             # Generate internal hash for cluster (mechanical identifier only)
-            cluster_hash = _hash_cluster(normalized_cluster)
+            cluster_hash = hash_cluster(cluster)
             
             # Count stability (only once per iteration)
             if cluster_hash not in seen_in_this_iteration:
@@ -67,20 +66,3 @@ def measure_stability(cluster_sequences, threshold=STABILITY_THRESHOLD):
         'stability_counts': cluster_counts,
         'stable_cluster_hashes': stable_hashes
     }
-
-
-def _hash_cluster(cluster):
-    """
-    Generate internal identity hash for a cluster.
-    
-    Hash is for internal tracking only, not a name or symbol.
-    
-    Args:
-        cluster: tuple of sorted residues (normalized cluster)
-    
-    Returns:
-        Hash value (internal identifier only)
-    """
-    # Convert cluster to bytes for hashing
-    cluster_bytes = str(cluster).encode('utf-8')
-    return hashlib.md5(cluster_bytes).hexdigest()
@@ -0,0 +1,182 @@
+"""
+THRESHOLD_ONSET — Phase 2: STORE
+
+Pluggable count tables for Phase 2 partials.
+Counts only. No names, no labels, no interpretation.
+
+A store maps a key (segment or cluster hash) to a count:
+- add_counts(pairs): add counts, creating keys as needed
+- get(key, default): count of one key
+- items(sort=False): (key, count) in first-insertion order, or in
+  sorted key order with sort=True (streamed, not loaded at once)
+
+DictStore keeps the table in memory (default). SqliteStore keeps it in
+a sqlite database and writes in batched upserts, so the table can grow
+beyond memory. Both return identical results in identical order.
+
+StoreView exposes a store as a read-only mapping, so a result table can
+stay in its store instead of being loaded into a dict.
+"""
+
+import os
+import sqlite3
+import tempfile
+import weakref
+from collections.abc import ItemsView, Mapping
+
+# FIXED number of pending rows written per executemany batch
+STORE_BATCH_SIZE = 10000
+
+
+class DictStore:
+    """In-memory count table (a dict)."""
+    def __init__(self):
+        self._counts = {}
+
+    def add_counts(self, pairs):
+        """
+        Add counts.
+
+        Args:
+            pairs: iterable of (key, count)
+        """
+        counts = self._counts
+        for key, count in pairs:
+            counts[key] = counts.get(key, 0) + count
+
+    def get(self, key, default=None):
+        """Count of key (default if absent)."""
+        return self._counts.get(key, default)
+
+    def items(self, sort=False):
+        """(key, count) pairs in first-insertion order (or sorted by key)."""
+        if sort:
+            return iter(sorted(self._counts.items()))
+        return iter(self._counts.items())
+
+    def __len__(self):
+        return len(self._counts)
+
+    def close(self):
+        """Release the table."""
+        self._counts = {}
+
+
+class SqliteStore:
+    """
+    Disk-backed count table (sqlite).
+
+    Rows are upserted in batches of batch_size. The rowid of a key is
+    assigned on first insertion and never changes, so rowid order is
+    first-insertion order.
+    """
+    def __init__(self, path=None, batch_size=STORE_BATCH_SIZE):
+        """
+        Args:
+            path: database file (default: a temporary file, removed by close())
+            batch_size: pending rows per batched upsert (default: STORE_BATCH_SIZE)
+        """
+        self._temporary = None
+        if path is None:
+            handle, path = tempfile.mkstemp(prefix='threshold_onset_', suffix='.sqlite')
+            os.close(handle)
+            self._temporary = path
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+        self._connection = sqlite3.connect(path)
+        # Released on close(), or when the store is garbage collected
+        self._release = weakref.finalize(self, SqliteStore._release_files, self._connection, self._temporary)
+        self._connection.execute('PRAGMA journal_mode = OFF')
+        self._connection.execute('PRAGMA synchronous = OFF')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS counts (key TEXT PRIMARY KEY, count INTEGER NOT NULL)'
+        )
+
+    def add_counts(self, pairs):
+        """
+        Add counts (written in batches).
+
+        Args:
+            pairs: iterable of (key, count)
+        """
+        pending = self._pending
+        for pair in pairs:
+            pending.append(pair)
+            if len(pending) >= self.batch_size:
+                self._flush()
+
+    def _flush(self):
+        if self._pending:
+            with self._connection:
+                self._connection.executemany(
+                    'INSERT INTO counts (key, count) VALUES (?, ?) '
+                    'ON CONFLICT (key) DO UPDATE SET count = count + excluded.count',
+                    self._pending
+                )
+            self._pending.clear()
+
+    def get(self, key, default=None):
+        """Count of key (default if absent)."""
+        self._flush()
+        row = self._connection.execute('SELECT count FROM counts WHERE key = ?', (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def items(self, sort=False):
+        """(key, count) pairs in first-insertion order (or sorted by key), streamed."""
+        self._flush()
+        order = 'key' if sort else 'rowid'
+        return iter(self._connection.execute(f'SELECT key, count FROM counts ORDER BY {order}'))
+
+    def __len__(self):
+        self._flush()
+        return self._connection.execute('SELECT COUNT(*) FROM counts').fetchone()[0]
+
+    def close(self):
+        """Close the database (a temporary file is removed)."""
+        self._pending.clear()
+        self._release()
+
+    @staticmethod
+    def _release_files(connection, temporary):
+        connection.close()
+        if temporary is not None:
+            os.remove(temporary)
+
+
+class _StoreItems(ItemsView):
+    """Items of a StoreView, streamed from the store."""
+    def __iter__(self):
+        return self._mapping.store.items()
+
+
+class StoreView(Mapping):
+    """
+    Read-only mapping over a store (same keys, counts and order).
+
+    Nothing is loaded: lookups and iteration go to the store. The view
+    keeps the store alive; the store must not be closed while the view
+    is in use.
+    """
+    def __init__(self, store):
+        """
+        Args:
+            store: DictStore or SqliteStore
+        """
+        self.store = store
+
+    def __getitem__(self, key):
+        count = self.store.get(key)
+        if count is None:
+            raise KeyError(key)
+        return count
+
+    def __iter__(self):
+        return (key for key, _ in self.store.items())
+
+    def __len__(self):
+        return len(self.store)
+
+    def items(self):
+        """(key, count) pairs in first-insertion order, streamed."""
+        return _StoreItems(self)
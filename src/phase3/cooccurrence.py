@@ -0,0 +1,85 @@
+"""
+THRESHOLD_ONSET — Phase 3: RELATION
+
+Sliding-window co-occurrence counting.
+Shared by interaction and influence detection.
+
+A pair counts once per window start at which both identities are in
+the window (the window's identities form a set). The window keeps a
+multiset of its identities; an identity is present while its
+multiplicity is positive. Each present identity remembers the start at
+which it entered, and when it leaves, every identity still present is
+credited with the number of starts the two were present together.
+
+Work is proportional to identities entering and leaving (times the
+identities present), not to window size times pairs per window, so
+large windows stay practical.
+
+CONSTRAINT: Only EXACT EQUALITY allowed.
+"""
+
+from phase3.identities import PAIR_BITS
+
+
+def count_window_pairs(identity_sets, window):
+    """
+    Co-occurrence counts of identity ID pairs over a sliding window.
+
+    Args:
+        identity_sets: identity ID collection per residue position
+        window: fixed window size
+
+    Returns:
+        Dict mapping packed pair (smaller ID first) to number of window
+        starts containing both identities
+    """
+    length = len(identity_sets)
+    pair_counts = {}
+    if length < window:
+        return pair_counts
+
+    multiplicity = {}
+    entered = {}  # identity ID -> window start since which it is present
+
+    def leave(identity_id, start):
+        """Remove an identity absent from start on; credit pairs still present."""
+        since = entered.pop(identity_id)
+        for other_id, other_since in entered.items():
+            if identity_id < other_id:
+                pair = identity_id << PAIR_BITS | other_id
+            else:
+                pair = other_id << PAIR_BITS | identity_id
+            pair_counts[pair] = pair_counts.get(pair, 0) + start - max(since, other_since)
+
+    # First window
+    for identity_ids in identity_sets[:window]:
+        for identity_id in identity_ids:
+            multiplicity[identity_id] = multiplicity.get(identity_id, 0) + 1
+    entered = dict.fromkeys(multiplicity, 0)
+
+    for start in range(1, length - window + 1):
+        # Entering residue first, so an identity in both residues stays present
+        arrived = []
+        for identity_id in identity_sets[start + window - 1]:
+            count = multiplicity.get(identity_id, 0)
+            multiplicity[identity_id] = count + 1
+            if count == 0:
+                arrived.append(identity_id)
+
+        for identity_id in identity_sets[start - 1]:
+            count = multiplicity[identity_id] - 1
+            if count:
+                multiplicity[identity_id] = count
+            else:
+                del multiplicity[identity_id]
+                leave(identity_id, start)
+
+        # Arrivals after departures: they never overlapped
+        for identity_id in arrived:
+            entered[identity_id] = start
+
+    # Every identity still present leaves after the last start
+    end = length - window + 1
+    for identity_id in list(entered):
+        leave(identity_id, end)
+    return pair_counts
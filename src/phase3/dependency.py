@@ -10,7 +10,7 @@ Fixed window size (non-adaptive).
 Temporal ordering only (no interpretation).
 """
 
-import hashlib
+from phase3.identities import PAIR_BITS, map_residues_to_identities, unpack_pair_counts
 
 # FIXED thresholds for dependency detection (non-adaptive)
 # These values are external and fixed, not computed from data
@@ -26,7 +26,7 @@ def measure_dependencies(residues, phase2_metrics, threshold=DEPENDENCY_THRESHOL
     Uses EXACT EQUALITY for hash comparison.
     
     Args:
-        residues: list of opaque residues (floats from Phase 0)
+        residues: list of opaque residues (floats from Phase 0) or SegmentIndex
         phase2_metrics: dictionary with Phase 2 identity metrics
         threshold: fixed dependency threshold (default: DEPENDENCY_THRESHOLD)
         window: fixed window size for dependency detection (default: DEPENDENCY_WINDOW)
@@ -42,18 +42,17 @@ def measure_dependencies(residues, phase2_metrics, threshold=DEPENDENCY_THRESHOL
             'dependency_pairs': set()
         }
     
-    # Map residues to identity hashes
+    # Map residues to identity IDs
     # Use same segment window as Phase 2 (SEGMENT_WINDOW = 2)
     SEGMENT_WINDOW = 2
-    residue_to_identity = _map_residues_to_identities(residues, phase2_metrics, SEGMENT_WINDOW)
+    # Identities are dense IDs in sorted-hash order (hashes restored on return)
+    residue_to_identity, identity_table = map_residues_to_identities(residues, phase2_metrics, SEGMENT_WINDOW)
     
     # Track dependency counts
     dependency_counts = {}
     
     # Scan residues with fixed window
     for i in range(len(residues) - window + 1):
-        window_residues = residues[i:i + window]
-        
         # Get identity hashes for residues in this window (in order)
         window_identities = []
         for residue_idx in range(i, i + window):
@@ -70,15 +69,18 @@ def measure_dependencies(residues, phase2_metrics, threshold=DEPENDENCY_THRESHOL
                 # Use exact equality for hash comparison
                 if hash1 != hash2:
                     # Temporal dependency: hash1 appears before hash2
-                    # Use canonical ordering (smaller hash first) for consistency
+                    # Use canonical ordering (smaller hash first, same as smaller ID) for consistency
                     if hash1 < hash2:
-                        pair = (hash1, hash2)
+                        pair = hash1 << PAIR_BITS | hash2
                     else:
-                        pair = (hash2, hash1)
+                        pair = hash2 << PAIR_BITS | hash1
                     
                     # Count dependency using EXACT EQUALITY
                     dependency_counts[pair] = dependency_counts.get(pair, 0) + 1
     
+    # Restore hash pairs at the API boundary
+    dependency_counts = unpack_pair_counts(dependency_counts, identity_table)
+    
     # Identify dependency pairs above threshold
     dependency_pairs = {
         pair for pair, count in dependency_counts.items()
@@ -89,72 +91,3 @@ def measure_dependencies(residues, phase2_metrics, threshold=DEPENDENCY_THRESHOL
         'dependency_counts': dependency_counts,
         'dependency_pairs': dependency_pairs
     }
-
-
-def _map_residues_to_identities(residues, phase2_metrics, segment_window):
-    """
-    Map residue indices to identity hashes.
-    
-    Creates segments from residues, hashes them, and looks up in identity_mappings.
-    
-    Args:
-        residues: list of opaque residues (floats from Phase 0)
-        phase2_metrics: dictionary with Phase 2 identity metrics
-        segment_window: fixed window size for segment creation
-    
-    Returns:
-        Dictionary mapping residue index to set of identity hashes
-    """
-    residue_to_identity = {}
-    
-    if 'identity_mappings' not in phase2_metrics:
-        return residue_to_identity
-    
-    identity_mappings = phase2_metrics['identity_mappings']
-    
-    # Create segments and map to identity hashes
-    for i in range(len(residues) - segment_window + 1):
-        segment = tuple(residues[i:i + segment_window])
-        segment_hash = _hash_segment(segment)
-        
-        # Look up identity hash in identity_mappings
-        if segment_hash in identity_mappings:
-            identity_hash = identity_mappings[segment_hash]
-            
-            # Map all residue indices in this segment to the identity hash
-            for residue_idx in range(i, i + segment_window):
-                if residue_idx not in residue_to_identity:
-                    residue_to_identity[residue_idx] = set()
-                residue_to_identity[residue_idx].add(identity_hash)
-    
-    # Also map from repeatable_unit_hashes
-    if 'repeatable_unit_hashes' in phase2_metrics:
-        repeatable_hashes = phase2_metrics['repeatable_unit_hashes']
-        
-        for i in range(len(residues) - segment_window + 1):
-            unit = tuple(residues[i:i + segment_window])
-            unit_hash = _hash_segment(unit)
-            
-            if unit_hash in repeatable_hashes:
-                for residue_idx in range(i, i + segment_window):
-                    if residue_idx not in residue_to_identity:
-                        residue_to_identity[residue_idx] = set()
-                    residue_to_identity[residue_idx].add(unit_hash)
-    
-    return residue_to_identity
-
-
-def _hash_segment(segment):
-    """
-    Generate hash for a segment (internal tracking only).
-    
-    Uses same hashing method as Phase 2 for consistency.
-    
-    Args:
-        segment: tuple of residues (fixed window)
-    
-    Returns:
-        Hash value (internal identifier only)
-    """
-    segment_bytes = str(segment).encode('utf-8')
-    return hashlib.md5(segment_bytes).hexdigest()
@@ -8,15 +8,321 @@ CONSTRAINT: Graph structures are INTERNAL ONLY.
 Nodes are identity hashes (internal identifiers only).
 Edges are hash pairs (internal identifiers only).
 No node names, no edge labels, no graph visualization.
+
+The graph is stored compactly: node hashes get integer IDs (sorted hash
+order), complete subgraphs are kept as clique membership (one clique ID
+per node) and all other edges as a CSR adjacency (offsets + targets).
+Edges, edge count, degrees and neighbors are answered without expanding
+any clique, so memory is linear in nodes plus explicit edges. Edge sets
+of several graphs are compared and counted (edge_overlap) from clique
+membership and explicit edges, also without expanding any clique.
 """
 
-import hashlib
+from array import array
+from bisect import bisect_left
+from collections.abc import Set
+from itertools import combinations
+
+# Clique ID of nodes in no clique
+NO_CLIQUE = -1
 
 # FIXED threshold for co-occurrence to create edge (non-adaptive)
 # This value is external and fixed, not computed from data
 CO_OCCURRENCE_THRESHOLD = 1
 
 
+class EdgeView(Set):
+    """
+    Read-only set of edges (hash pair tuples, smaller hash first).
+
+    Membership and length are answered from the compact graph; iteration
+    expands edges lazily. Comparisons between edge views (==, <=, >=)
+    use the compact graphs (no expansion); set operations with other
+    sets return sets.
+    """
+    def __init__(self, graph):
+        self._graph = graph
+
+    @property
+    def graph(self):
+        """CompactGraph behind the view."""
+        return self._graph
+
+    def __eq__(self, other):
+        if isinstance(other, EdgeView):
+            if len(self) != len(other):
+                return False
+            return self._graph.same_structure(other.graph) or self.__le__(other)
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __le__(self, other):
+        if isinstance(other, EdgeView):
+            return edge_overlap([self._graph, other.graph])[0] == len(self)
+        return super().__le__(other)
+
+    def __ge__(self, other):
+        if isinstance(other, EdgeView):
+            return edge_overlap([self._graph, other.graph])[0] == len(other)
+        return super().__ge__(other)
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return set(it)
+
+    def __contains__(self, edge):
+        if not isinstance(edge, tuple) or len(edge) != 2:
+            return False
+        hash1, hash2 = edge
+        # Canonical ordering only (smaller hash first)
+        return hash1 < hash2 and self._graph.has_edge(hash1, hash2)
+
+    def __iter__(self):
+        return self._graph.iter_edges()
+
+    def __len__(self):
+        return self._graph.edge_count
+
+
+class CompactGraph:
+    """
+    Undirected graph of identity hashes: cliques plus explicit edges.
+
+    Cliques must be disjoint. Explicit edges inside a clique and self
+    loops are dropped (the clique already links the pair).
+    """
+    def __init__(self, nodes, cliques=(), edges=()):
+        """
+        Args:
+            nodes: iterable of node hashes (internal identifiers only)
+            cliques: iterable of disjoint node hash collections (each fully linked)
+            edges: iterable of hash pair tuples (explicit edges)
+        """
+        cliques = [sorted(set(clique)) for clique in cliques]
+        edges = list(edges)
+        all_nodes = set(nodes)
+        for clique in cliques:
+            all_nodes.update(clique)
+        for hash1, hash2 in edges:
+            all_nodes.add(hash1)
+            all_nodes.add(hash2)
+
+        # Node IDs in sorted hash order
+        self._hashes = sorted(all_nodes)
+        self._ids = {node_hash: node_id for node_id, node_hash in enumerate(self._hashes)}
+        node_count = len(self._hashes)
+
+        # Clique membership
+        self._clique_of = array('q', [NO_CLIQUE]) * node_count
+        self._cliques = []
+        edge_count = 0
+        for clique in cliques:
+            if len(clique) < 2:
+                continue
+            members = array('q', [self._ids[node_hash] for node_hash in clique])
+            clique_id = len(self._cliques)
+            for node_id in members:
+                if self._clique_of[node_id] != NO_CLIQUE:
+                    raise ValueError("Cliques must be disjoint")
+                self._clique_of[node_id] = clique_id
+            self._cliques.append(members)
+            edge_count += len(members) * (len(members) - 1) // 2
+
+        # Explicit edges outside cliques (CSR adjacency, sorted targets)
+        pairs = set()
+        for hash1, hash2 in edges:
+            id1 = self._ids[hash1]
+            id2 = self._ids[hash2]
+            if id1 == id2 or (self._clique_of[id1] != NO_CLIQUE
+                              and self._clique_of[id1] == self._clique_of[id2]):
+                continue
+            pairs.add((id1, id2) if id1 < id2 else (id2, id1))
+        edge_count += len(pairs)
+
+        degrees = [0] * node_count
+        for id1, id2 in pairs:
+            degrees[id1] += 1
+            degrees[id2] += 1
+        self._offsets = array('q', [0]) * (node_count + 1)
+        for node_id, degree in enumerate(degrees):
+            self._offsets[node_id + 1] = self._offsets[node_id] + degree
+        self._targets = array('q', [0]) * self._offsets[node_count]
+        fill = list(self._offsets[:node_count])
+        for id1, id2 in sorted(pairs):
+            self._targets[fill[id1]] = id2
+            fill[id1] += 1
+            self._targets[fill[id2]] = id1
+            fill[id2] += 1
+        for node_id in range(node_count):
+            start, end = self._offsets[node_id], self._offsets[node_id + 1]
+            self._targets[start:end] = array('q', sorted(self._targets[start:end]))
+
+        self.node_count = node_count
+        self.edge_count = edge_count
+        self.edges = EdgeView(self)
+
+    def node_hashes(self):
+        """Node hashes in node ID order (sorted)."""
+        return self._hashes
+
+    def node_id(self, node_hash):
+        """Integer ID of a node hash."""
+        return self._ids[node_hash]
+
+    def clique_id(self, node_hash):
+        """Clique ID of a node hash (NO_CLIQUE if in none or not a node)."""
+        node_id = self._ids.get(node_hash)
+        return NO_CLIQUE if node_id is None else self._clique_of[node_id]
+
+    def same_structure(self, other):
+        """
+        True if other stores the same graph (nodes, cliques, explicit edges).
+
+        Compared on the compact arrays (linear in nodes plus explicit edges).
+        """
+        if self is other:
+            return True
+        return (self._hashes == other.node_hashes()
+                and self._offsets == other._offsets  # pylint: disable=protected-access
+                and self._targets == other._targets  # pylint: disable=protected-access
+                and sorted(map(tuple, self._cliques)) == sorted(map(tuple, other._cliques)))  # pylint: disable=protected-access
+
+    def clique_members(self, node_id):
+        """Node IDs in the clique of node_id (empty if in none)."""
+        clique_id = self._clique_of[node_id]
+        return self._cliques[clique_id] if clique_id != NO_CLIQUE else ()
+
+    def explicit_neighbor_ids(self, node_id):
+        """Node IDs linked to node_id by explicit (non-clique) edges."""
+        return self._targets[self._offsets[node_id]:self._offsets[node_id + 1]]
+
+    def degree(self, node_hash):
+        """
+        Number of edges at a node.
+
+        Args:
+            node_hash: node hash
+
+        Returns:
+            Degree (int)
+        """
+        node_id = self._ids[node_hash]
+        clique_size = len(self.clique_members(node_id))
+        explicit = self._offsets[node_id + 1] - self._offsets[node_id]
+        return (clique_size - 1 if clique_size else 0) + explicit
+
+    def neighbors(self, node_hash):
+        """
+        Neighbor hashes of a node (lazily, no clique expansion up front).
+
+        Args:
+            node_hash: node hash
+
+        Returns:
+            Iterator of neighbor hashes
+        """
+        node_id = self._ids[node_hash]
+        for other_id in self.clique_members(node_id):
+            if other_id != node_id:
+                yield self._hashes[other_id]
+        for other_id in self.explicit_neighbor_ids(node_id):
+            yield self._hashes[other_id]
+
+    def has_edge(self, hash1, hash2):
+        """True if the two node hashes are linked (exact equality)."""
+        id1 = self._ids.get(hash1)
+        id2 = self._ids.get(hash2)
+        if id1 is None or id2 is None or id1 == id2:
+            return False
+        if self._clique_of[id1] != NO_CLIQUE and self._clique_of[id1] == self._clique_of[id2]:
+            return True
+        targets = self.explicit_neighbor_ids(id1)
+        position = bisect_left(targets, id2)
+        return position < len(targets) and targets[position] == id2
+
+    def iter_explicit_edges(self):
+        """Explicit (non-clique) edges as hash pair tuples (smaller hash first)."""
+        hashes = self._hashes
+        for id1 in range(self.node_count):
+            for id2 in self.explicit_neighbor_ids(id1):
+                if id1 < id2:
+                    yield (hashes[id1], hashes[id2])
+
+    def iter_edges(self):
+        """Edges as hash pair tuples (smaller hash first), expanded lazily."""
+        hashes = self._hashes
+        for members in self._cliques:
+            for id1, id2 in combinations(members, 2):
+                yield (hashes[id1], hashes[id2])
+        yield from self.iter_explicit_edges()
+
+
+def edge_overlap(graphs):
+    """
+    Edges common to all graphs and edges in any graph, counted exactly.
+
+    No clique is expanded. Nodes are grouped by their clique in every
+    graph; two nodes of one group are linked in the graphs where that
+    clique exists. Clique edges are counted per group, explicit edges are
+    checked one by one.
+
+    Args:
+        graphs: list of CompactGraph
+
+    Returns:
+        (common edge count, total edge count), as len of the intersection
+        and union of the edge sets
+    """
+    if not graphs:
+        return 0, 0
+    first = graphs[0]
+    if all(first.same_structure(graph) for graph in graphs[1:]):
+        return first.edge_count, first.edge_count
+
+    # Group nodes by their clique in every graph (only nodes in some clique)
+    groups = {}
+    for node_hash in set().union(*(graph.node_hashes() for graph in graphs)):
+        key = tuple(graph.clique_id(node_hash) for graph in graphs)
+        if any(clique_id != NO_CLIQUE for clique_id in key):
+            groups[key] = groups.get(key, 0) + 1
+
+    # Groups sharing a clique of some graph (graph index, clique ID)
+    groups_of_clique = {}
+    for key in groups:
+        for position, clique_id in enumerate(key):
+            if clique_id != NO_CLIQUE:
+                groups_of_clique.setdefault((position, clique_id), []).append(key)
+
+    common = 0
+    linked_pairs = 0  # ordered pairs of distinct nodes linked by a clique in some graph
+    for key, size in groups.items():
+        if NO_CLIQUE not in key:
+            common += size * (size - 1) // 2
+        linked = set()
+        for position, clique_id in enumerate(key):
+            if clique_id != NO_CLIQUE:
+                linked.update(groups_of_clique[(position, clique_id)])
+        linked_pairs += size * (sum(groups[other] for other in linked) - 1)
+    total = linked_pairs // 2
+
+    def clique_linked(hash1, hash2, every):
+        links = (graph.clique_id(hash1) != NO_CLIQUE and graph.clique_id(hash1) == graph.clique_id(hash2)
+                 for graph in graphs)
+        return all(links) if every else any(links)
+
+    # Explicit edges: counted once, unless a clique already counted them
+    explicit = set()
+    for graph in graphs:
+        explicit.update(graph.iter_explicit_edges())
+    for hash1, hash2 in explicit:
+        if not clique_linked(hash1, hash2, every=False):
+            total += 1
+        if not clique_linked(hash1, hash2, every=True) and all(graph.has_edge(hash1, hash2) for graph in graphs):
+            common += 1
+    return common, total
+
+
 def build_graph(phase2_metrics, threshold=CO_OCCURRENCE_THRESHOLD):
     """
     Build graph structure from identity hashes.
@@ -31,7 +337,8 @@ def build_graph(phase2_metrics, threshold=CO_OCCURRENCE_THRESHOLD):
     Returns:
         Dictionary with:
         - 'nodes': set of identity hashes (internal identifiers only)
-        - 'edges': set of hash pair tuples (internal identifiers only)
+        - 'edges': set-like view of hash pair tuples (internal identifiers only)
+        - 'graph': CompactGraph (degree and neighbor queries)
     """
     # Extract all identity hashes from Phase 2 metrics
     nodes = set()
@@ -53,56 +360,19 @@ def build_graph(phase2_metrics, threshold=CO_OCCURRENCE_THRESHOLD):
         nodes.update(phase2_metrics['identity_mappings'].values())
     
     # Create edges based on co-occurrence in identity_mappings
-    # If two segment hashes map to different identity hashes, create edge
-    edges = set()
-    
+    # Every pair of distinct identity hashes in the mapping context is linked:
+    # one clique, stored as membership (never expanded into pairs)
+    cliques = []
     if 'identity_mappings' in phase2_metrics:
-        identity_mappings = phase2_metrics['identity_mappings']
-        identity_hashes = list(identity_mappings.values())
-        
-        # Create edges between identity hashes that co-occur
-        # (appear in the same mapping context)
-        for i, hash1 in enumerate(identity_hashes):
-            for hash2 in identity_hashes[i+1:]:
-                # Use exact equality for hash comparison
-                if hash1 != hash2:
-                    # Create undirected edge (both directions)
-                    edge1 = (hash1, hash2)
-                    edge2 = (hash2, hash1)
-                    # Use canonical ordering (smaller hash first) to avoid duplicates
-                    if hash1 < hash2:
-                        edges.add((hash1, hash2))
-                    else:
-                        edges.add((hash2, hash1))
+        cliques.append(set(phase2_metrics['identity_mappings'].values()))
+    
+    # Identity hashes sharing persistent segments are identity_mappings
+    # values, already linked by the clique above
     
-    # Also create edges from persistent segments that share identity hashes
-    # This captures relationships between different identity types
-    if 'persistent_segment_hashes' in phase2_metrics and 'identity_mappings' in phase2_metrics:
-        persistent_hashes = phase2_metrics['persistent_segment_hashes']
-        identity_mappings = phase2_metrics['identity_mappings']
-        
-        # Map persistent segments to their identity hashes
-        persistent_to_identity = {}
-        for seg_hash in persistent_hashes:
-            if seg_hash in identity_mappings:
-                identity_hash = identity_mappings[seg_hash]
-                if identity_hash not in persistent_to_identity:
-                    persistent_to_identity[identity_hash] = []
-                persistent_to_identity[identity_hash].append(seg_hash)
-        
-        # Create edges between identity hashes that share persistent segments
-        identity_list = list(persistent_to_identity.keys())
-        for i, hash1 in enumerate(identity_list):
-            for hash2 in identity_list[i+1:]:
-                # Use exact equality for hash comparison
-                if hash1 != hash2:
-                    # Use canonical ordering
-                    if hash1 < hash2:
-                        edges.add((hash1, hash2))
-                    else:
-                        edges.add((hash2, hash1))
+    graph = CompactGraph(nodes, cliques)
     
     return {
         'nodes': nodes,
-        'edges': edges
+        'edges': graph.edges,
+        'graph': graph
     }
@@ -0,0 +1,94 @@
+"""
+THRESHOLD_ONSET — Phase 3: RELATION
+
+Residue-to-identity mapping on dense integer IDs.
+Shared by interaction, dependency and influence detection.
+
+Identity hashes are interned in sorted order, so comparing IDs gives the
+same canonical pair ordering (smaller hash first) as comparing hashes.
+Hex hashes are restored only when results leave Phase 3 functions.
+
+CONSTRAINT: Only EXACT EQUALITY allowed.
+"""
+
+from phase2.intern import InternTable
+from phase2.segment_index import as_segment_index
+
+# Bits per identity ID in a packed pair key (pair = low << PAIR_BITS | high)
+PAIR_BITS = 32
+PAIR_MASK = (1 << PAIR_BITS) - 1
+
+
+def map_residues_to_identities(residues, phase2_metrics, segment_window):
+    """
+    Map residue indices to identity IDs.
+
+    Reads segment IDs from the segment index (interned once per sequence)
+    and looks their hashes up in identity_mappings and repeatable_unit_hashes.
+
+    Args:
+        residues: list of opaque residues (floats from Phase 0) or SegmentIndex
+        phase2_metrics: dictionary with Phase 2 identity metrics
+        segment_window: fixed window size for segment creation
+
+    Returns:
+        (residue_to_identity, identity_table) where residue_to_identity maps
+        residue index to set of identity IDs, and identity_table maps IDs
+        back to identity hashes (InternTable, IDs in sorted-hash order)
+    """
+    residue_to_identity = {}
+
+    if 'identity_mappings' not in phase2_metrics:
+        return residue_to_identity, InternTable()
+
+    identity_mappings = phase2_metrics['identity_mappings']
+    repeatable_hashes = set(phase2_metrics.get('repeatable_unit_hashes', ()))
+    index = as_segment_index(residues, segment_window)
+
+    # Identity hashes per distinct segment (each segment hashed at most once)
+    segment_identities = {}
+    for segment_id in index.counts:
+        segment_hash = index.segment_hash(segment_id)
+        identities = []
+        if segment_hash in identity_mappings:
+            identities.append(identity_mappings[segment_hash])
+        if segment_hash in repeatable_hashes:
+            identities.append(segment_hash)
+        if identities:
+            segment_identities[segment_id] = identities
+
+    identity_table = InternTable(sorted({identity_hash
+                                         for identities in segment_identities.values()
+                                         for identity_hash in identities}))
+    segment_identities = {segment_id: [identity_table.get(identity_hash) for identity_hash in identities]
+                          for segment_id, identities in segment_identities.items()}
+
+    # Map all residue indices in each segment to the segment's identities
+    for i, segment_id in enumerate(index.ids):
+        identity_ids = segment_identities.get(segment_id)
+        if identity_ids is None:
+            continue
+        for residue_idx in range(i, i + segment_window):
+            if residue_idx not in residue_to_identity:
+                residue_to_identity[residue_idx] = set()
+            residue_to_identity[residue_idx].update(identity_ids)
+
+    return residue_to_identity, identity_table
+
+
+def unpack_pair_counts(pair_counts, identity_table):
+    """
+    Convert packed ID pair counts back to hash pair counts.
+
+    Args:
+        pair_counts: dict mapping packed pair key (low << PAIR_BITS | high) to count
+        identity_table: InternTable from map_residues_to_identities
+
+    Returns:
+        Dictionary mapping (hash1, hash2) tuple to count, hash1 < hash2
+    """
+    hashes = identity_table.keys
+    return {
+        (hashes[pair >> PAIR_BITS], hashes[pair & PAIR_MASK]): count
+        for pair, count in pair_counts.items()
+    }
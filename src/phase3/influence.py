@@ -10,7 +10,8 @@ Fixed window size (non-adaptive).
 Influence strength is raw count (no normalization, no semantics).
 """
 
-import hashlib
+from phase3.cooccurrence import count_window_pairs
+from phase3.identities import map_residues_to_identities, unpack_pair_counts
 
 # FIXED thresholds for influence detection (non-adaptive)
 # These values are external and fixed, not computed from data
@@ -27,7 +28,7 @@ def measure_influence(residues, phase2_metrics, threshold=INFLUENCE_THRESHOLD, w
     Uses EXACT EQUALITY for hash comparison.
     
     Args:
-        residues: list of opaque residues (floats from Phase 0)
+        residues: list of opaque residues (floats from Phase 0) or SegmentIndex
         phase2_metrics: dictionary with Phase 2 identity metrics
         threshold: fixed influence threshold (default: INFLUENCE_THRESHOLD)
         window: fixed window size for influence detection (default: INFLUENCE_WINDOW)
@@ -43,44 +44,24 @@ def measure_influence(residues, phase2_metrics, threshold=INFLUENCE_THRESHOLD, w
             'influence_strengths': {}
         }
     
-    # Map residues to identity hashes
+    # Map residues to identity IDs
     # Use same segment window as Phase 2 (SEGMENT_WINDOW = 2)
     SEGMENT_WINDOW = 2
-    residue_to_identity = _map_residues_to_identities(residues, phase2_metrics, SEGMENT_WINDOW)
+    # Identities are dense IDs in sorted-hash order (hashes restored on return)
+    residue_to_identity, identity_table = map_residues_to_identities(residues, phase2_metrics, SEGMENT_WINDOW)
     
-    # Track influence counts and strengths
-    influence_counts = {}
-    influence_strengths = {}
+    # Count co-occurrence over a sliding window of identity sets
+    # (pairs are updated only as identities enter and leave the window)
+    identity_sets = [residue_to_identity.get(residue_idx, ()) for residue_idx in range(len(residues))]
+    influence_counts = count_window_pairs(identity_sets, window)
     
-    # Scan residues with fixed window
-    for i in range(len(residues) - window + 1):
-        window_residues = residues[i:i + window]
-        
-        # Get identity hashes for residues in this window
-        window_identities = set()
-        for residue_idx in range(i, i + window):
-            if residue_idx in residue_to_identity:
-                identity_hashes = residue_to_identity[residue_idx]
-                window_identities.update(identity_hashes)
-        
-        # Create influence pairs from identities in same window
-        identity_list = list(window_identities)
-        for j, hash1 in enumerate(identity_list):
-            for hash2 in identity_list[j+1:]:
-                # Use exact equality for hash comparison
-                if hash1 != hash2:
-                    # Use canonical ordering (smaller hash first)
-                    if hash1 < hash2:
-                        pair = (hash1, hash2)
-                    else:
-                        pair = (hash2, hash1)
-                    
-                    # Count influence using EXACT EQUALITY
-                    influence_counts[pair] = influence_counts.get(pair, 0) + 1
-                    
-                    # Influence strength is raw count (no normalization, no semantics)
-                    # For now, strength equals count (raw number)
-                    influence_strengths[pair] = float(influence_counts[pair])
+    # Influence strength is raw count (no normalization, no semantics)
+    # For now, strength equals count (raw number)
+    influence_strengths = {pair: float(count) for pair, count in influence_counts.items()}
+    
+    # Restore hash pairs at the API boundary
+    influence_counts = unpack_pair_counts(influence_counts, identity_table)
+    influence_strengths = unpack_pair_counts(influence_strengths, identity_table)
     
     # Filter by threshold (only pairs above threshold)
     filtered_counts = {
@@ -97,72 +78,3 @@ def measure_influence(residues, phase2_metrics, threshold=INFLUENCE_THRESHOLD, w
         'influence_counts': filtered_counts,
         'influence_strengths': filtered_strengths
     }
-
-
-def _map_residues_to_identities(residues, phase2_metrics, segment_window):
-    """
-    Map residue indices to identity hashes.
-    
-    Creates segments from residues, hashes them, and looks up in identity_mappings.
-    
-    Args:
-        residues: list of opaque residues (floats from Phase 0)
-        phase2_metrics: dictionary with Phase 2 identity metrics
-        segment_window: fixed window size for segment creation
-    
-    Returns:
-        Dictionary mapping residue index to set of identity hashes
-    """
-    residue_to_identity = {}
-    
-    if 'identity_mappings' not in phase2_metrics:
-        return residue_to_identity
-    
-    identity_mappings = phase2_metrics['identity_mappings']
-    
-    # Create segments and map to identity hashes
-    for i in range(len(residues) - segment_window + 1):
-        segment = tuple(residues[i:i + segment_window])
-        segment_hash = _hash_segment(segment)
-        
-        # Look up identity hash in identity_mappings
-        if segment_hash in identity_mappings:
-            identity_hash = identity_mappings[segment_hash]
-            
-            # Map all residue indices in this segment to the identity hash
-            for residue_idx in range(i, i + segment_window):
-                if residue_idx not in residue_to_identity:
-                    residue_to_identity[residue_idx] = set()
-                residue_to_identity[residue_idx].add(identity_hash)
-    
-    # Also map from repeatable_unit_hashes
-    if 'repeatable_unit_hashes' in phase2_metrics:
-        repeatable_hashes = phase2_metrics['repeatable_unit_hashes']
-        
-        for i in range(len(residues) - segment_window + 1):
-            unit = tuple(residues[i:i + segment_window])
-            unit_hash = _hash_segment(unit)
-            
-            if unit_hash in repeatable_hashes:
-                for residue_idx in range(i, i + segment_window):
-                    if residue_idx not in residue_to_identity:
-                        residue_to_identity[residue_idx] = set()
-                    residue_to_identity[residue_idx].add(unit_hash)
-    
-    return residue_to_identity
-
-
-def _hash_segment(segment):
-    """
-    Generate hash for a segment (internal tracking only).
-    
-    Uses same hashing method as Phase 2 for consistency.
-    
-    Args:
-        segment: tuple of residues (fixed window)
-    
-    Returns:
-        Hash value (internal identifier only)
-    """
-    segment_bytes = str(segment).encode('utf-8')
-    return hashlib.md5(segment_bytes).hexdigest()
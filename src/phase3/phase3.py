@@ -12,6 +12,7 @@ Reads Phase 0, Phase 1, and Phase 2 output only. Does not modify them.
 """
 
 from collections import deque
+from types import MappingProxyType
 
 # FIXED thresholds for Phase 3 gate (non-adaptive)
 # These values are external and fixed, not computed from data
@@ -19,7 +20,7 @@ MIN_PERSISTENT_RELATIONS = 1
 MIN_STABILITY_RATIO = 0.6
 
 
-def phase3(residues, phase1_metrics, phase2_metrics):
+def phase3(residues, phase1_metrics, phase2_metrics, graph_metrics=None):
     """
     Phase 3 relation pipeline.
     
@@ -28,145 +29,145 @@ def phase3(residues, phase1_metrics, phase2_metrics):
     Returns relation metrics only (graph structures, counts, hash pairs).
     
     Args:
-        residues: list of opaque residues (floats from Phase 0)
+        residues: list of opaque residues (floats from Phase 0) or SegmentIndex
         phase1_metrics: dictionary with Phase 1 structural metrics
         phase2_metrics: dictionary with Phase 2 identity metrics
+        graph_metrics: optional result of build_graph_metrics(phase2_metrics),
+                       shared (not copied) when the same Phase 2 metrics serve many runs
     
     Returns:
         Dictionary with relation metrics:
-        - 'graph_nodes': set of identity hashes (node identifiers, internal only)
-        - 'graph_edges': set of tuples (hash_pair) representing edges (internal identifiers only)
+        - 'graph_nodes': frozenset of identity hashes (node identifiers, internal only)
+        - 'graph_edges': set-like view of tuples (hash_pair) representing edges (internal identifiers only)
         - 'node_count': number of nodes (int)
         - 'edge_count': number of edges (int)
-        - 'degree_counts': dict mapping node hash to degree count (int)
+        - 'degree_counts': read-only mapping of node hash to degree count (int)
         - 'interaction_counts': dict mapping hash pair tuple to interaction count (int)
         - 'interaction_pairs': set of hash pair tuples (internal identifiers only)
         - 'dependency_counts': dict mapping hash pair tuple to dependency count (int)
         - 'dependency_pairs': set of hash pair tuples (internal identifiers only)
         - 'influence_counts': dict mapping hash pair tuple to influence count (int)
         - 'influence_strengths': dict mapping hash pair tuple to raw number (float)
-        - 'path_lengths': list of path lengths (raw numbers, int)
+        - 'path_lengths': tuple of path lengths (raw numbers, int)
     """
-    from phase3.graph import build_graph  # pylint: disable=import-outside-toplevel
-    from phase3.interaction import detect_interactions  # pylint: disable=import-outside-toplevel
-    from phase3.dependency import measure_dependencies  # pylint: disable=import-outside-toplevel
-    from phase3.influence import measure_influence  # pylint: disable=import-outside-toplevel
-    
-    # Build graph structure
-    graph_result = build_graph(phase2_metrics)
-    graph_nodes = graph_result['nodes']
-    graph_edges = graph_result['edges']
-    
-    # Detect interactions
-    interaction_result = detect_interactions(residues, phase2_metrics)
-    interaction_counts = interaction_result['interaction_counts']
-    interaction_pairs = interaction_result['interaction_pairs']
-    
-    # Measure dependencies
-    dependency_result = measure_dependencies(residues, phase2_metrics)
-    dependency_counts = dependency_result['dependency_counts']
-    dependency_pairs = dependency_result['dependency_pairs']
-    
-    # Measure influence
-    influence_result = measure_influence(residues, phase2_metrics)
-    influence_counts = influence_result['influence_counts']
-    influence_strengths = influence_result['influence_strengths']
-    
-    # Compute graph metrics
-    node_count = len(graph_nodes)
-    edge_count = len(graph_edges)
-    
-    # Compute degree counts
-    degree_counts = _compute_degree_counts(graph_nodes, graph_edges)
-    
-    # Compute path lengths
-    path_lengths = _compute_path_lengths(graph_nodes, graph_edges)
+    from phase3.scanner import scan_relations  # pylint: disable=import-outside-toplevel
+    from phase2.segment_index import as_segment_index  # pylint: disable=import-outside-toplevel
+    
+    # Segment hashes are computed once and shared by every detector below
+    residues = as_segment_index(residues)
+    
+    # Graph structure and graph metrics depend on Phase 2 metrics only
+    if graph_metrics is None:
+        graph_metrics = build_graph_metrics(phase2_metrics)
+    
+    # Detect interactions, measure dependencies and influence (one fused pass,
+    # same results as detect_interactions, measure_dependencies, measure_influence)
+    relation_result = scan_relations(residues, phase2_metrics)
+    interaction_counts = relation_result['interaction_counts']
+    interaction_pairs = relation_result['interaction_pairs']
+    dependency_counts = relation_result['dependency_counts']
+    dependency_pairs = relation_result['dependency_pairs']
+    influence_counts = relation_result['influence_counts']
+    influence_strengths = relation_result['influence_strengths']
     
     return {
-        'graph_nodes': graph_nodes,
-        'graph_edges': graph_edges,
-        'node_count': node_count,
-        'edge_count': edge_count,
-        'degree_counts': degree_counts,
+        'graph_nodes': graph_metrics['graph_nodes'],
+        'graph_edges': graph_metrics['graph_edges'],
+        'node_count': graph_metrics['node_count'],
+        'edge_count': graph_metrics['edge_count'],
+        'degree_counts': graph_metrics['degree_counts'],
         'interaction_counts': interaction_counts,
         'interaction_pairs': interaction_pairs,
         'dependency_counts': dependency_counts,
         'dependency_pairs': dependency_pairs,
         'influence_counts': influence_counts,
         'influence_strengths': influence_strengths,
-        'path_lengths': path_lengths
+        'path_lengths': graph_metrics['path_lengths']
     }
 
 
-def _compute_degree_counts(nodes, edges):
+def build_graph_metrics(phase2_metrics):
+    """
+    Graph structure and graph metrics for Phase 2 metrics.
+    
+    Depends on Phase 2 metrics only, so it is computed once and reused
+    for every run that shares the same Phase 2 metrics.
+    
+    Args:
+        phase2_metrics: dictionary with Phase 2 identity metrics
+    
+    Returns:
+        Dictionary with:
+        - 'graph_nodes': frozenset of identity hashes (node identifiers, internal only)
+        - 'graph_edges': set-like view of tuples (hash_pair) representing edges (internal identifiers only)
+        - 'node_count': number of nodes (int)
+        - 'edge_count': number of edges (int)
+        - 'degree_counts': read-only mapping of node hash to degree count (int)
+        - 'path_lengths': tuple of path lengths (raw numbers, int)
+    """
+    from phase3.graph import build_graph  # pylint: disable=import-outside-toplevel
+    
+    # Build graph structure
+    graph_result = build_graph(phase2_metrics)
+    graph = graph_result['graph']
+    
+    # Read-only: every run that shares these metrics sees the same objects
+    return {
+        'graph_nodes': frozenset(graph_result['nodes']),
+        'graph_edges': graph_result['edges'],
+        'node_count': graph.node_count,
+        'edge_count': graph.edge_count,
+        'degree_counts': MappingProxyType(_compute_degree_counts(graph)),
+        'path_lengths': tuple(_compute_path_lengths(graph))
+    }
+
+
+def _compute_degree_counts(graph):
     """
     Compute degree counts for each node in graph.
     
     Degree = number of edges connected to node.
-    Uses exact hash equality.
+    Read from clique membership and explicit adjacency (no edge walk).
     
     Args:
-        nodes: set of node hashes (internal identifiers only)
-        edges: set of edge tuples (hash pairs, internal identifiers only)
+        graph: CompactGraph (internal identifiers only)
     
     Returns:
         Dictionary mapping node hash to degree count (int)
     """
-    degree_counts = {}
-    
-    # Initialize all nodes with degree 0
-    for node in nodes:
-        degree_counts[node] = 0
-    
-    # Count edges for each node
-    for edge in edges:
-        hash1, hash2 = edge
-        # Use exact equality for hash comparison
-        if hash1 in nodes:
-            degree_counts[hash1] = degree_counts.get(hash1, 0) + 1
-        if hash2 in nodes:
-            degree_counts[hash2] = degree_counts.get(hash2, 0) + 1
-    
-    return degree_counts
+    return {node: graph.degree(node) for node in graph.node_hashes()}
 
 
-def _compute_path_lengths(nodes, edges):
+def _compute_path_lengths(graph):
     """
     Compute shortest path lengths between nodes using BFS.
     
     Path length = number of edges in path.
     Only computes paths between nodes that are actually connected.
-    Uses exact hash equality for node/edge matching.
+    A clique is expanded once per BFS (its first reached member reaches
+    all others), so each BFS is linear in nodes plus explicit edges.
     
     Args:
-        nodes: set of node hashes (internal identifiers only)
-        edges: set of edge tuples (hash pairs, internal identifiers only)
+        graph: CompactGraph (internal identifiers only)
     
     Returns:
         List of path lengths (raw numbers, int)
     """
-    if len(nodes) < 2:
+    node_count = graph.node_count
+    if node_count < 2:
         return []
     
-    # Build adjacency list
-    adjacency = {}
-    for node in nodes:
-        adjacency[node] = []
-    
-    for edge in edges:
-        hash1, hash2 = edge
-        # Use exact equality for hash comparison
-        if hash1 in nodes and hash2 in nodes:
-            adjacency[hash1].append(hash2)
-            adjacency[hash2].append(hash1)
-    
     # Compute shortest paths using BFS from each node
     path_lengths = []
-    node_list = list(nodes)
     
-    for start_node in node_list:
-        # BFS from start_node
-        visited = {start_node}
+    for start_node in range(node_count):
+        if not graph.clique_members(start_node) and not graph.explicit_neighbor_ids(start_node):
+            continue
+        
+        # BFS from start_node (node IDs)
+        visited = bytearray(node_count)
+        visited[start_node] = 1
+        expanded_cliques = set()
         queue = deque([(start_node, 0)])  # (node, distance)
         
         while queue:
@@ -176,17 +177,23 @@ def _compute_path_lengths(nodes, edges):
             if distance > 0:
                 path_lengths.append(distance)
             
-            # Explore neighbors
-            for neighbor in adjacency[current_node]:
-                # Use exact equality for hash comparison
-                if neighbor not in visited:
-                    visited.add(neighbor)
+            # Explore neighbors: clique members (once per clique), then explicit edges
+            members = graph.clique_members(current_node)
+            if members and members[0] not in expanded_cliques:
+                expanded_cliques.add(members[0])
+                for neighbor in members:
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        queue.append((neighbor, distance + 1))
+            for neighbor in graph.explicit_neighbor_ids(current_node):
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
                     queue.append((neighbor, distance + 1))
     
     return path_lengths
 
 
-def phase3_multi_run(residue_sequences, phase1_metrics_list, phase2_metrics):
+def phase3_multi_run(residue_sequences, phase1_metrics_list, phase2_metrics, graph_metrics=None):
     """
     Phase 3 relation pipeline with multiple runs.
     
@@ -196,9 +203,11 @@ def phase3_multi_run(residue_sequences, phase1_metrics_list, phase2_metrics):
     Returns relation metrics only (graph structures, counts, hash pairs).
     
     Args:
-        residue_sequences: list of residue sequences (each from a separate Phase 0 run)
+        residue_sequences: list of residue sequences or SegmentIndex objects (each from a separate Phase 0 run)
         phase1_metrics_list: list of Phase 1 metrics (one per run)
         phase2_metrics: Phase 2 metrics from multi-run (aggregated)
+        graph_metrics: optional result of build_graph_metrics(phase2_metrics),
+            so callers that also need it build it only once
     
     Returns:
         Dictionary with relation metrics (if gate passes), or None (if gate fails)
@@ -207,6 +216,9 @@ def phase3_multi_run(residue_sequences, phase1_metrics_list, phase2_metrics):
     from phase3.persistence import measure_relation_persistence  # pylint: disable=import-outside-toplevel
     from phase3.stability import measure_relation_stability  # pylint: disable=import-outside-toplevel
     
+    # Graph and graph metrics depend on Phase 2 metrics only: computed once, shared by all runs
+    shared_graph = graph_metrics if graph_metrics is not None else build_graph_metrics(phase2_metrics)
+    
     # Step 1: Run Phase 3 for each run and collect relations
     relation_hashes_per_run = []
     relation_counts_per_run = []
@@ -214,7 +226,7 @@ def phase3_multi_run(residue_sequences, phase1_metrics_list, phase2_metrics):
     
     for residues, phase1_metrics in zip(residue_sequences, phase1_metrics_list):
         # Run Phase 3 for this run
-        phase3_metrics = phase3(residues, phase1_metrics, phase2_metrics)
+        phase3_metrics = phase3(residues, phase1_metrics, phase2_metrics, shared_graph)
         
         # Extract relations from Phase 3 metrics
         relation_result = extract_relations(phase3_metrics)
@@ -256,11 +268,14 @@ def phase3_multi_run(residue_sequences, phase1_metrics_list, phase2_metrics):
         return None  # Gate failed, refuse execution
     
     # Step 5: Aggregate graph structure (union of all nodes and edges)
+    # Every run shares one graph, so the union is that graph (edges stay compact,
+    # always an edge view: empty graph if there are no runs)
+    from phase3.graph import CompactGraph  # pylint: disable=import-outside-toplevel
     aggregated_nodes = set()
-    aggregated_edges = set()
-    for graph_metrics in graph_metrics_per_run:
-        aggregated_nodes.update(graph_metrics['graph_nodes'])
-        aggregated_edges.update(graph_metrics['graph_edges'])
+    aggregated_edges = CompactGraph(()).edges
+    if len(graph_metrics_per_run) > 0:
+        aggregated_nodes.update(shared_graph['graph_nodes'])
+        aggregated_edges = shared_graph['graph_edges']
     
     # Aggregate relation counts across all runs
     aggregated_relation_counts = {}
@@ -273,10 +288,9 @@ def phase3_multi_run(residue_sequences, phase1_metrics_list, phase2_metrics):
     for relation_set in relation_hashes_per_run:
         aggregated_relation_hashes.update(relation_set)
     
-    # Compute aggregated path lengths (from first run's graph)
+    # Aggregated path lengths (from first run's graph, the shared graph)
     if len(graph_metrics_per_run) > 0:
-        first_graph = graph_metrics_per_run[0]
-        path_lengths = _compute_path_lengths(first_graph['graph_nodes'], first_graph['graph_edges'])
+        path_lengths = list(shared_graph['path_lengths'])
     else:
         path_lengths = []
     
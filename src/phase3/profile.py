@@ -0,0 +1,160 @@
+"""
+THRESHOLD_ONSET — Phase 3: RELATION
+
+Co-occurrence profile for every window size at once.
+Counts only. No names, no labels, no interpretation.
+
+A window of size w misses identity a exactly when it fits in a gap
+between a's positions (or before the first, or after the last). With
+F_X(w) = sum over gaps g of X of max(0, g - w + 1), the number of
+window starts containing both a and b is
+
+    (n - w + 1) - F_a(w) - F_b(w) + F_{a|b}(w)
+
+where a|b is the union of a's and b's positions. The profile reduces the
+gap-length histogram of every identity and of every pair that
+co-occurs within max_window to its F table (1..max_window), and derives
+interaction/influence counts for any of those window sizes without
+rescanning residues.
+
+CONSTRAINT: Only EXACT EQUALITY allowed.
+Fixed maximum window size (non-adaptive).
+"""
+
+from phase3.cooccurrence import count_window_pairs
+from phase3.identities import PAIR_BITS, PAIR_MASK, map_residues_to_identities, unpack_pair_counts
+
+# FIXED largest window size for profiles (non-adaptive)
+PROFILE_MAX_WINDOW = 16
+
+
+def _missing_table(positions, length, max_window):
+    """
+    Window starts missing a set of positions, for every window size.
+
+    Gaps of at least max_window are pooled (their terms are linear in w).
+
+    Args:
+        positions: sorted residue positions
+        length: sequence length
+        max_window: largest window size
+
+    Returns:
+        List F where F[w] = sum over gaps g of max(0, g - w + 1), for 1 <= w <= max_window
+    """
+    # Gap-length histogram, gaps >= max_window pooled into the last bucket
+    gap_counts = [0] * (max_window + 1)
+    gap_sums = [0] * (max_window + 1)  # sum of (g + 1) per bucket
+    previous = -1
+    for position in list(positions) + [length]:
+        gap = position - previous - 1
+        if gap > 0:
+            bucket = gap if gap < max_window else max_window
+            gap_counts[bucket] += 1
+            gap_sums[bucket] += gap + 1
+        previous = position
+
+    # F[w] = sum over g >= w of (g + 1 - w), from suffix sums
+    missing = [0] * (max_window + 1)
+    count_suffix = 0
+    sum_suffix = 0
+    for window in range(max_window, 0, -1):
+        count_suffix += gap_counts[window]
+        sum_suffix += gap_sums[window]
+        missing[window] = sum_suffix - window * count_suffix
+    return missing
+
+
+class CooccurrenceProfile:
+    """
+    Missing-window tables of identities and co-occurring identity pairs.
+
+    counts(window) equals the interaction_counts of detect_interactions
+    (and the unfiltered influence_counts of measure_influence) for that
+    window size.
+    """
+    def __init__(self, residues, phase2_metrics, max_window=PROFILE_MAX_WINDOW):
+        """
+        Args:
+            residues: list of opaque residues (floats from Phase 0) or SegmentIndex
+            phase2_metrics: dictionary with Phase 2 identity metrics
+            max_window: largest window size (default: PROFILE_MAX_WINDOW)
+        """
+        # Use same segment window as Phase 2 (SEGMENT_WINDOW = 2)
+        SEGMENT_WINDOW = 2
+        residue_to_identity, self.identity_table = map_residues_to_identities(
+            residues, phase2_metrics, SEGMENT_WINDOW
+        )
+        self.length = len(residues)
+        self.max_window = max_window
+
+        positions = {}
+        for position in sorted(residue_to_identity):
+            for identity_id in residue_to_identity[position]:
+                positions.setdefault(identity_id, []).append(position)
+        self.identity_missing = {
+            identity_id: _missing_table(identity_positions, self.length, max_window)
+            for identity_id, identity_positions in positions.items()
+        }
+
+        # Pairs co-occurring in some window of size <= max_window also do at max_window
+        identity_sets = [residue_to_identity.get(position, ()) for position in range(self.length)]
+        widest = min(max_window, self.length)
+        self.pair_missing = {}
+        for pair in count_window_pairs(identity_sets, widest):
+            union = sorted(set(positions[pair >> PAIR_BITS]).union(positions[pair & PAIR_MASK]))
+            self.pair_missing[pair] = _missing_table(union, self.length, max_window)
+
+    def pair_counts(self, window):
+        """
+        Co-occurrence counts for one window size (packed ID pairs).
+
+        Args:
+            window: window size, 1 <= window <= max_window
+
+        Returns:
+            Dict mapping packed pair (smaller ID first) to number of window
+            starts containing both identities (pairs with count > 0)
+        """
+        if not 1 <= window <= self.max_window:
+            raise ValueError(f"Window size must be between 1 and {self.max_window}")
+        starts = self.length - window + 1
+        if starts <= 0:
+            return {}
+
+        missing = {
+            identity_id: table[window] for identity_id, table in self.identity_missing.items()
+        }
+        pair_counts = {}
+        for pair, table in self.pair_missing.items():
+            count = (starts - missing[pair >> PAIR_BITS] - missing[pair & PAIR_MASK]
+                     + table[window])
+            if count:
+                pair_counts[pair] = count
+        return pair_counts
+
+    def counts(self, window):
+        """
+        Co-occurrence counts for one window size (hash pairs).
+
+        Args:
+            window: window size, 1 <= window <= max_window
+
+        Returns:
+            Dictionary mapping (hash1, hash2) tuple to count, hash1 < hash2
+        """
+        return unpack_pair_counts(self.pair_counts(window), self.identity_table)
+
+    def sweep(self, windows=None):
+        """
+        Counts for several window sizes.
+
+        Args:
+            windows: iterable of window sizes (default: 1..max_window)
+
+        Returns:
+            Dictionary mapping window size to counts(window)
+        """
+        if windows is None:
+            windows = range(1, self.max_window + 1)
+        return {window: self.counts(window) for window in windows}
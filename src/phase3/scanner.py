@@ -0,0 +1,158 @@
+"""
+THRESHOLD_ONSET — Phase 3: RELATION
+
+Fused window scanner for interaction, dependency and influence.
+Builds the residue-to-identity map once and slides one window.
+
+Per window start i, with I(p) the identity IDs at residue p:
+- interaction (window 3): pairs of U3(i) = I(i) | I(i+1) | I(i+2)
+- influence (window 4): pairs of U4(i) = U3(i) | I(i+3)
+- dependency (window 2): pairs of I(i) | I(i+1), each counted once per
+  (position, identity) combination, i.e. weighted by the product of the
+  number of the two positions each identity appears at
+
+Windows with equal identity sets contribute equal pairs, so the pass
+counts windows per distinct set (U3, U4, and the (I(i), I(i+1)) pair)
+and pairs are generated once per distinct set, times its window count.
+The counts are EXACTLY those of detect_interactions, measure_dependencies
+and measure_influence.
+
+CONSTRAINT: Only EXACT EQUALITY allowed.
+Hash pairs only (no names, no labels).
+Fixed window sizes (non-adaptive).
+"""
+
+from collections import Counter
+from itertools import combinations
+
+from phase3.dependency import DEPENDENCY_THRESHOLD, DEPENDENCY_WINDOW
+from phase3.identities import PAIR_BITS, map_residues_to_identities, unpack_pair_counts
+from phase3.influence import INFLUENCE_THRESHOLD, INFLUENCE_WINDOW
+from phase3.interaction import INTERACTION_THRESHOLD, INTERACTION_WINDOW
+
+_EMPTY = frozenset()
+
+
+def scan_relations(residues, phase2_metrics,
+                   interaction_threshold=INTERACTION_THRESHOLD,
+                   dependency_threshold=DEPENDENCY_THRESHOLD,
+                   influence_threshold=INFLUENCE_THRESHOLD):
+    """
+    Interaction, dependency and influence counts in one pass.
+
+    Args:
+        residues: list of opaque residues (floats from Phase 0) or SegmentIndex
+        phase2_metrics: dictionary with Phase 2 identity metrics
+        interaction_threshold: fixed interaction threshold (default: INTERACTION_THRESHOLD)
+        dependency_threshold: fixed dependency threshold (default: DEPENDENCY_THRESHOLD)
+        influence_threshold: fixed influence threshold (default: INFLUENCE_THRESHOLD)
+
+    Returns:
+        Dictionary with the results of detect_interactions, measure_dependencies
+        and measure_influence:
+        - 'interaction_counts', 'interaction_pairs'
+        - 'dependency_counts', 'dependency_pairs'
+        - 'influence_counts', 'influence_strengths'
+    """
+    length = len(residues)
+
+    # Map residues to identity IDs (once for all three relations)
+    # Use same segment window as Phase 2 (SEGMENT_WINDOW = 2)
+    SEGMENT_WINDOW = 2
+    residue_to_identity, identity_table = map_residues_to_identities(residues, phase2_metrics, SEGMENT_WINDOW)
+    sets = [frozenset(residue_to_identity.get(position, _EMPTY)) for position in range(length)]
+
+    interaction_windows, influence_windows, dependency_windows = _count_windows(sets)
+    interaction_counts = _expand_pairs(interaction_windows)
+    influence_counts = _expand_pairs(influence_windows)
+    dependency_counts = _expand_dependency_pairs(dependency_windows)
+
+    # Restore hash pairs at the API boundary
+    interaction_counts = unpack_pair_counts(interaction_counts, identity_table)
+    dependency_counts = unpack_pair_counts(dependency_counts, identity_table)
+    influence_counts = unpack_pair_counts(influence_counts, identity_table)
+
+    influence_counts = {
+        pair: count for pair, count in influence_counts.items()
+        if count >= influence_threshold
+    }
+    return {
+        'interaction_counts': interaction_counts,
+        'interaction_pairs': {
+            pair for pair, count in interaction_counts.items() if count >= interaction_threshold
+        },
+        'dependency_counts': dependency_counts,
+        'dependency_pairs': {
+            pair for pair, count in dependency_counts.items() if count >= dependency_threshold
+        },
+        'influence_counts': influence_counts,
+        # Influence strength is raw count (no normalization, no semantics)
+        'influence_strengths': {pair: float(count) for pair, count in influence_counts.items()},
+    }
+
+
+def _count_windows(sets):
+    """
+    Window counts per distinct identity set, for all three window sizes.
+
+    Args:
+        sets: identity ID frozenset per residue position
+
+    Returns:
+        (interaction_windows, influence_windows, dependency_windows): Counters
+        of U3 sets, U4 sets and (I(i), I(i+1)) pairs
+    """
+    length = len(sets)
+    interaction_windows = Counter()
+    influence_windows = Counter()
+    dependency_windows = Counter()
+
+    # One pass with the widest window; narrower windows are its prefixes
+    for start in range(length - DEPENDENCY_WINDOW + 1):
+        first = sets[start]
+        second = sets[start + 1]
+        dependency_windows[first, second] += 1
+        if start + INTERACTION_WINDOW <= length:
+            narrow_ids = first | second | sets[start + 2]
+            interaction_windows[narrow_ids] += 1
+            if start + INFLUENCE_WINDOW <= length:
+                influence_windows[narrow_ids | sets[start + 3]] += 1
+    return interaction_windows, influence_windows, dependency_windows
+
+
+def _expand_pairs(windows):
+    """
+    Pair counts from window counts per distinct identity set.
+
+    Args:
+        windows: Counter mapping identity ID set to number of windows
+
+    Returns:
+        Dict mapping packed pair (smaller ID first) to window count
+    """
+    counts = {}
+    for identity_ids, window_count in windows.items():
+        for low, high in combinations(sorted(identity_ids), 2):
+            pair = low << PAIR_BITS | high
+            counts[pair] = counts.get(pair, 0) + window_count
+    return counts
+
+
+def _expand_dependency_pairs(windows):
+    """
+    Dependency pair counts from window counts per (I(i), I(i+1)) pair.
+
+    Args:
+        windows: Counter mapping (first set, second set) to number of windows
+
+    Returns:
+        Dict mapping packed pair (smaller ID first) to dependency count
+    """
+    counts = {}
+    for (first, second), window_count in windows.items():
+        for low, high in combinations(sorted(first | second), 2):
+            # One count per (position, identity) combination of the pair
+            weight = ((low in first) + (low in second)) * ((high in first) + (high in second))
+            pair = low << PAIR_BITS | high
+            counts[pair] = counts.get(pair, 0) + weight * window_count
+    return counts
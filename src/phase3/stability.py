@@ -10,6 +10,8 @@ Uses EXACT EQUALITY only.
 Fixed thresholds (non-adaptive).
 """
 
+from phase3.graph import EdgeView, edge_overlap
+
 # FIXED thresholds for stability measurement (non-adaptive)
 # These values are external and fixed, not computed from data
 # NOTE: Variance threshold applies to normalized frequency variance (0.0 to 1.0 range)
@@ -114,8 +116,12 @@ def measure_relation_stability(relation_hashes_per_run, relation_counts_per_run,
         graph_edges_per_run.append(edges)
     
     # Compute intersection of all edge sets (common edges)
-    if len(graph_edges_per_run) > 0:
-        common_edges = graph_edges_per_run[0].copy()
+    if len(graph_edges_per_run) > 0 and all(isinstance(edges, EdgeView) for edges in graph_edges_per_run):
+        # Compact edge views: common and total edges counted on the graphs (no expansion)
+        common_count, total_count = edge_overlap([edges.graph for edges in graph_edges_per_run])
+        common_edges_ratio = common_count / total_count if total_count > 0 else 0.0
+    elif len(graph_edges_per_run) > 0:
+        common_edges = set(graph_edges_per_run[0])
         for edges in graph_edges_per_run[1:]:
             # Use exact equality for edge comparison
             common_edges = common_edges.intersection(edges)
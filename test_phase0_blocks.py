@@ -0,0 +1,226 @@
+"""
+THRESHOLD_ONSET — Phase 0 Block Generation Test
+
+Tests that the block forms of Phase 0 actions are exact:
+a block of n residues must equal n successive scalar calls.
+Tests that seeded runs are reproducible and independent of each other,
+including when runs fan out to a process pool.
+Tests that recorded trace files replay bit-for-bit.
+
+CRITICAL: Output shows only pass/fail, never residue values.
+"""
+
+import sys
+import os
+import random
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from phase0.actions import InertiaAction, BoundedWalk, DecayNoise, WeakOscillator, FiniteAction
+from phase0.phase0 import phase0, phase0_batches
+from phase0.seed import derive_seed, spawn_rngs
+from phase0.tracefile import TraceWriter, read_trace
+from phase1.phase1 import phase1
+
+ACTION_CLASSES = [InertiaAction, BoundedWalk, DecayNoise, WeakOscillator, FiniteAction]
+BLOCK_SIZE = 257
+
+
+def test_generate_matches_scalar_calls():
+    """generate(n) must reproduce n scalar calls bit-for-bit."""
+    for action_class in ACTION_CLASSES:
+        random.seed(11)
+        scalar_action = action_class()
+        scalar = [scalar_action() for _ in range(BLOCK_SIZE)]
+
+        random.seed(11)
+        block_action = action_class()
+        block = [float(value) for value in block_action.generate(BLOCK_SIZE)]
+
+        assert block == scalar, action_class.__name__
+
+        # Internal state must carry over into the next call
+        random.seed(5)
+        next_block = block_action()
+        random.seed(5)
+        assert next_block == scalar_action(), action_class.__name__
+
+
+def test_long_blocks_match_scalar_calls():
+    """Long blocks (walk boundary hits, vectorized phases) match scalar calls and stream position."""
+    for action_class in ACTION_CLASSES:
+        scalar_rng = random.Random(21)
+        scalar_action = action_class(rng=scalar_rng)
+        scalar = [scalar_action() for _ in range(5000)]
+
+        block_rng = random.Random(21)
+        block_action = action_class(rng=block_rng)
+        block = [float(value) for value in block_action.generate(3000)]
+        block += [float(value) for value in block_action.generate(2000)]
+
+        assert block == scalar, action_class.__name__
+        assert block_rng.random() == scalar_rng.random(), action_class.__name__
+        if action_class is BoundedWalk:
+            assert 0.0 in scalar and 1.0 in scalar  # both boundaries are hit
+
+
+def test_generate_empty_block():
+    """generate(0) returns an empty block and leaves state untouched."""
+    for action_class in ACTION_CLASSES:
+        action = action_class()
+        assert len(action.generate(0)) == 0
+
+
+def test_batches_match_phase0():
+    """phase0_batches must yield phase0's traces in phase0's order."""
+    def make_actions():
+        counters = [iter(range(0, 10 ** 6, 3)), iter(range(1, 10 ** 6, 7))]
+        return [lambda c=counter: float(next(c)) for counter in counters]
+
+    expected = [trace for trace, _, _ in phase0(make_actions(), steps=50)]
+
+    collected = []
+    last_count = 0
+    for block, count, step_count in phase0_batches(make_actions(), steps=50, block_steps=16):
+        collected.extend(block.tolist())
+        assert count == step_count == len(collected)
+        last_count = count
+
+    assert collected == expected
+    assert last_count == 100
+
+
+def test_batches_use_generate():
+    """Actions with generate(n) are drawn a block at a time, same values."""
+    random.seed(3)
+    expected = [trace for trace, _, _ in phase0([FiniteAction()], steps=100)]
+
+    random.seed(3)
+    collected = []
+    for block, _, _ in phase0_batches([FiniteAction()], steps=100, block_steps=32):
+        collected.extend(block.tolist())
+
+    assert collected == expected
+
+    # Block sizes below one step are rejected when called, not silently empty
+    for block_steps in (0, -5):
+        try:
+            phase0_batches([FiniteAction()], steps=10, block_steps=block_steps)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("block_steps < 1 must be rejected")
+
+
+def test_seeded_streams_are_reproducible():
+    """A run seed fans out into the same independent streams every time."""
+    def run(seed):
+        actions = [action_class(rng=rng) for action_class, rng
+                   in zip(ACTION_CLASSES, spawn_rngs(seed, len(ACTION_CLASSES)))]
+        return [trace for trace, _, _ in phase0(actions, steps=40)]
+
+    run_seed = derive_seed(1234, 3)
+    assert run(run_seed) == run(run_seed)
+    assert run(run_seed) != run(derive_seed(1234, 4))
+
+    # Global stream state must not leak into seeded runs
+    random.seed(0)
+    first = run(run_seed)
+    random.seed(99)
+    assert run(run_seed) == first
+
+
+def test_seeded_batches_match_phase0():
+    """With independent streams, block order cannot change any residue."""
+    def make_actions():
+        return [action_class(rng=rng) for action_class, rng
+                in zip(ACTION_CLASSES, spawn_rngs(42, len(ACTION_CLASSES)))]
+
+    expected = [trace for trace, _, _ in phase0(make_actions(), steps=75)]
+    collected = []
+    for block, _, _ in phase0_batches(make_actions(), steps=75, block_steps=20):
+        collected.extend(block.tolist())
+
+    assert collected == expected
+
+
+def test_pool_runs_match_inline_runs():
+    """The process-pool multi-run driver returns inline results, in run order."""
+    from main import run_multi_run  # pylint: disable=import-outside-toplevel
+
+    inline = run_multi_run("finite", 4, seed=2026, workers=1)
+    pooled = run_multi_run("finite", 4, seed=2026, workers=2, chunksize=2)
+
+    assert pooled[0] == inline[0]
+    assert pooled[1] == inline[1]
+
+
+def test_trace_file_round_trip():
+    """Recorded traces replay exactly, and Phase 1 accepts the mapped view."""
+    actions = [FiniteAction(rng=rng) for rng in spawn_rngs(8, 2)]
+    residues = [trace for trace, _, _ in phase0(actions, steps=60)]
+
+    with tempfile.TemporaryDirectory() as trace_dir:
+        path = os.path.join(trace_dir, 'run.trace')
+        with TraceWriter(path, variant='finite', seed=8, steps=60, action_count=2) as writer:
+            writer.write_block(residues[:40])
+            for trace in residues[40:]:
+                writer.write(trace)
+
+        header, replayed = read_trace(path)
+        assert header['variant'] == 'finite'
+        assert header['seed'] == 8
+        assert header['steps'] == 60
+        assert header['action_count'] == 2
+        assert header['residue_count'] == len(residues)
+        assert replayed.tolist() == residues
+        assert phase1(replayed) == phase1(residues)
+        replayed.release()
+
+
+def test_replay_requires_matching_configuration():
+    """Traces recorded with another variant or seed are not replayed."""
+    from main import has_recorded_traces, record_traces, replay_traces  # pylint: disable=import-outside-toplevel
+
+    sequences = [[float(value) for value in range(10)], [1.0, 2.0]]
+    with tempfile.TemporaryDirectory() as trace_dir:
+        assert not has_recorded_traces(trace_dir, 2, 'finite', 5)
+        record_traces(trace_dir, 'finite', 5, sequences)
+        assert has_recorded_traces(trace_dir, 2, 'finite', 5)
+        assert not has_recorded_traces(trace_dir, 3, 'finite', 5)
+        assert not has_recorded_traces(trace_dir, 2, 'inertia', 5)
+        assert not has_recorded_traces(trace_dir, 2, 'finite', 6)
+        assert not has_recorded_traces(trace_dir, 2, 'finite', None)
+
+        replayed = replay_traces(trace_dir, 2, 'finite', 5)
+        assert [view.tolist() for view in replayed] == sequences
+        for view in replayed:
+            view.release()
+        for variant, seed in (('inertia', 5), ('finite', 6)):
+            try:
+                replay_traces(trace_dir, 2, variant, seed)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("Mismatched traces must not be replayed")
+
+        # Re-recording with the current configuration replaces the old traces
+        record_traces(trace_dir, 'inertia', None, sequences)
+        assert has_recorded_traces(trace_dir, 2, 'inertia', None)
+        assert not has_recorded_traces(trace_dir, 2, 'finite', 5)
+
+
+if __name__ == "__main__":
+    test_generate_matches_scalar_calls()
+    test_long_blocks_match_scalar_calls()
+    test_generate_empty_block()
+    test_batches_match_phase0()
+    test_batches_use_generate()
+    test_seeded_streams_are_reproducible()
+    test_seeded_batches_match_phase0()
+    test_pool_runs_match_inline_runs()
+    test_trace_file_round_trip()
+    test_replay_requires_matching_configuration()
+    print("[PASS] Phase 0 block generation")
@@ -0,0 +1,162 @@
+"""
+THRESHOLD_ONSET — Phase 1 Engine Equivalence Test
+
+Tests that the Phase 1 engines return exactly what the original
+pairwise implementations returned, on finite and continuous residues.
+
+CRITICAL: Output shows only pass/fail, never residue values.
+"""
+
+import sys
+import os
+import random
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from phase1 import distance
+from phase1.boundary import detect_boundaries
+from phase1.cluster import cluster_residues
+from phase1.distance import difference_kernel, pairwise_distances
+from phase1.online import OnlinePhase1
+from phase1.phase1 import phase1
+from phase1.pattern import detect_repetition
+
+
+def _finite_residues(seed, length, size=4):
+    """Finite residues (many exact repeats)."""
+    rng = random.Random(seed)
+    return [float(rng.randrange(size)) for _ in range(length)]
+
+
+def _continuous_residues(seed, length):
+    """Continuous residues (almost no exact repeats)."""
+    rng = random.Random(seed)
+    return [rng.random() for _ in range(length)]
+
+
+def _reference_repetition(residues, window_size):
+    """Original all-pairs repetition count."""
+    if len(residues) < window_size * 2:
+        return 0
+    count = 0
+    for i in range(len(residues) - window_size + 1):
+        window1 = residues[i:i + window_size]
+        for j in range(i + window_size, len(residues) - window_size + 1):
+            if window1 == residues[j:j + window_size]:
+                count += 1
+    return count
+
+
+def test_repetition_matches_reference():
+    """Hash-indexed repetition count equals the all-pairs count."""
+    for seed in range(6):
+        for window_size in (1, 2, 3, 5):
+            for residues in (_finite_residues(seed, 150), _continuous_residues(seed, 60),
+                             _finite_residues(seed, window_size * 2 - 1), []):
+                expected = _reference_repetition(residues, window_size)
+                assert detect_repetition(residues, window_size)['repetition_count'] == expected
+
+
+def _reference_clusters(residues, threshold):
+    """Original linear-scan greedy clustering (cluster contents)."""
+    clusters = []
+    cluster_centers = []
+    for residue in residues:
+        assigned = False
+        for idx, center in enumerate(cluster_centers):
+            if abs(residue - center) <= threshold:
+                clusters[idx].append(residue)
+                cluster_centers[idx] = sum(clusters[idx]) / len(clusters[idx])
+                assigned = True
+                break
+        if not assigned:
+            clusters.append([residue])
+            cluster_centers.append(residue)
+    return clusters
+
+
+def test_clusters_match_reference():
+    """Indexed running-sum clustering equals the linear-scan clustering."""
+    for seed in range(6):
+        residue_sets = [
+            _finite_residues(seed, 300, size=10),
+            _continuous_residues(seed, 400),
+            [value * 0.05 for value in _finite_residues(seed, 300, size=40)],
+        ]
+        for residues in residue_sets:
+            for threshold in (0.0, 0.05, 0.1, 0.3, 1.0):
+                expected = _reference_clusters(residues, threshold)
+                result = cluster_residues(residues, threshold, return_labels=True)
+
+                assert result['cluster_count'] == len(expected)
+                assert result['cluster_sizes'] == [len(cluster) for cluster in expected]
+
+                rebuilt = [[] for _ in range(result['cluster_count'])]
+                for residue, label in zip(residues, result['cluster_labels']):
+                    rebuilt[label].append(residue)
+                assert rebuilt == expected
+
+
+def test_clusters_with_infinite_residues():
+    """Infinite residues (inf - inf is NaN) cluster like the linear scan."""
+    inf = float('inf')
+    residue_sets = [
+        [inf, inf, 0.0, inf, 0.05],
+        [0.0, inf, -inf, inf, -inf, 0.02, 1e308, inf],
+        [value if value else inf for value in _finite_residues(1, 200, size=5)],
+    ]
+    for residues in residue_sets:
+        for threshold in (0.0, 0.1, inf):
+            expected = _reference_clusters(residues, threshold)
+            result = cluster_residues(residues, threshold, return_labels=True)
+            assert result['cluster_sizes'] == [len(cluster) for cluster in expected]
+            rebuilt = [[] for _ in range(result['cluster_count'])]
+            for residue, label in zip(residues, result['cluster_labels']):
+                rebuilt[label].append(residue)
+            assert rebuilt == expected
+
+
+def test_difference_kernel_matches_separate_passes():
+    """Fused kernel equals pairwise_distances and detect_boundaries, with and without NumPy."""
+    numpy_module = distance.np
+    try:
+        for module in {numpy_module, None}:
+            distance.np = module
+            for seed in range(4):
+                for residues in (_finite_residues(seed, 200, size=10), _continuous_residues(seed, 200),
+                                 [0.5], []):
+                    for threshold in (0.0, 0.1, 2):
+                        result = difference_kernel(residues, threshold)
+                        assert list(result['distances']) == pairwise_distances(residues)
+                        assert list(result['boundary_positions']) == detect_boundaries(residues, threshold)
+    finally:
+        distance.np = numpy_module
+
+
+def test_online_phase1_matches_batch():
+    """Streaming Phase 1 snapshots equal phase1() on the residues seen so far."""
+    for seed in range(4):
+        residues = _finite_residues(seed, 240, size=6) + _continuous_residues(seed, 60)
+
+        stream = OnlinePhase1(return_cluster_labels=True)
+        for count, trace in enumerate(residues, start=1):
+            stream.update(trace)
+            if count in (1, 3, 4, 50, 299):
+                assert stream.snapshot() == phase1(residues[:count], return_cluster_labels=True)
+        assert stream.snapshot() == phase1(residues, return_cluster_labels=True)
+
+        blocks = OnlinePhase1()
+        for start in range(0, len(residues), 37):
+            blocks.update_block(residues[start:start + 37])
+            seen = residues[:start + 37]
+            assert blocks.snapshot() == phase1(seen)
+
+
+if __name__ == "__main__":
+    test_repetition_matches_reference()
+    test_clusters_match_reference()
+    test_clusters_with_infinite_residues()
+    test_difference_kernel_matches_separate_passes()
+    test_online_phase1_matches_batch()
+    print("[PASS] Phase 1 engine equivalence")
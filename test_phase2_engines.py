@@ -0,0 +1,521 @@
+"""
+THRESHOLD_ONSET — Phase 2 Engine Equivalence Test
+
+Tests that the Phase 2 engines are exact:
+segment hashes must be stable in both hash modes, and every
+Phase 2 and Phase 3 module must hash segments the same way.
+
+CRITICAL: Output shows only pass/fail, never hash values.
+"""
+
+import sys
+import os
+import hashlib
+import random
+from collections.abc import Mapping
+from functools import reduce
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from phase2 import fingerprint, hashing
+from phase2.accumulator import Phase2Accumulator
+from phase2.automaton import SuffixAutomaton, assign_automaton_identities
+from phase2.fingerprint import hash_cluster
+from phase2.hashing import hash_segment, set_hash_mode
+from phase2.identity import assign_identity_hashes
+from phase2.intern import CountTable
+from phase2.multilength import count_segment_lengths
+from phase2.persistence import measure_persistence
+from phase2.partial import build_partial, finalize_partial, merge_partials, new_partial
+from phase2.phase2 import _reconstruct_clusters, phase2_multi_run
+from phase2.repeatable import detect_repeatable_units
+from phase2.sketch import MIN_SKETCH_WIDTH, SKETCH_WIDTH, CountMinSketch, sketch_width
+from phase2.stability import measure_stability
+from phase2.store import DictStore, SqliteStore, StoreView
+from phase2.segment_index import SegmentIndex, index_sequences
+from phase3.dependency import measure_dependencies
+from phase3.influence import measure_influence
+from phase3.interaction import detect_interactions
+from phase3.phase3 import phase3
+
+
+def _finite_sequences(seed, runs=4, length=120, size=5):
+    """Deterministic finite-state residue sequences (many repeated segments)."""
+    rng = random.Random(seed)
+    return [[float(rng.randrange(size)) for _ in range(length)] for _ in range(runs)]
+
+
+def test_legacy_mode_matches_md5():
+    """Legacy mode reproduces md5(str(tuple)) digests exactly."""
+    previous = set_hash_mode('legacy')
+    try:
+        for segment in [(0.1, 0.2), (1, -1), (3.0,), (0.5, 0.25, -0.0)]:
+            assert hash_segment(segment) == hashlib.md5(str(segment).encode('utf-8')).hexdigest()
+    finally:
+        set_hash_mode(previous)
+
+
+def test_binary_mode_is_exact():
+    """Binary digests follow float64 equality of the raw bit patterns."""
+    assert hashing.HASH_MODE == 'binary'
+    assert hash_segment((1.0, 2.0)) == hash_segment((1, 2))
+    assert hash_segment((1.0, 2.0)) != hash_segment((2.0, 1.0))
+    assert hash_segment((0.0, 1.0)) != hash_segment((-0.0, 1.0))
+    assert hash_segment((1.0, 2.0)) != hash_segment((1.0, 2.0, 0.0))
+    assert len(hash_segment((0.1, 0.2))) == 32
+
+    try:
+        set_hash_mode('unknown')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown hash mode accepted")
+
+
+def test_modules_share_segment_hashes():
+    """Persistence, identity and repeatability agree on segment hashes in both modes."""
+    sequences = _finite_sequences(7)
+    for mode in ('binary', 'legacy'):
+        previous = set_hash_mode(mode)
+        try:
+            persistence = measure_persistence(sequences)
+            identity = assign_identity_hashes(sequences)
+            repeatable = detect_repeatable_units(sequences[0])
+
+            assert list(identity['identity_mappings']) == persistence['persistent_segment_hashes']
+            expected = {hash_segment(tuple(sequences[0][i:i + 2])) for i in range(len(sequences[0]) - 1)}
+            assert set(repeatable['repeatability_counts']) == expected
+        finally:
+            set_hash_mode(previous)
+
+
+def _ordered(metrics):
+    """Metrics with dicts as item lists, so insertion order is compared too."""
+    return {key: list(value.items()) if isinstance(value, Mapping) else value
+            for key, value in metrics.items()}
+
+
+def test_segment_index_matches_raw_residues():
+    """Phase 2 and Phase 3 give identical results from raw residues and from indexes."""
+    sequences = _finite_sequences(11)
+    indexes = [SegmentIndex(sequence) for sequence in sequences]
+    phase1_metrics_list = [{} for _ in sequences]
+
+    assert indexes[0].hashes == [hash_segment(tuple(sequences[0][i:i + 2]))
+                                 for i in range(len(sequences[0]) - 1)]
+    for segment_id, positions in indexes[0].postings.items():
+        assert all(indexes[0].ids[position] == segment_id for position in positions)
+
+    # One table across runs: equal segments share an ID and a hash
+    shared = index_sequences(sequences)
+    assert len({index.table for index in shared}) == 1
+    assert len(shared[0].table) == len({hash_segment(tuple(sequence[i:i + 2]))
+                                        for sequence in sequences for i in range(len(sequence) - 1)})
+
+    raw_metrics = phase2_multi_run(sequences, phase1_metrics_list)
+    indexed_metrics = phase2_multi_run(indexes, phase1_metrics_list)
+    assert _ordered(indexed_metrics) == _ordered(raw_metrics)
+
+    for sequence, index in zip(sequences, indexes):
+        assert _ordered(phase3(index, {}, raw_metrics)) == _ordered(phase3(sequence, {}, raw_metrics))
+
+    # A stale index (other hash mode) is rebuilt, never reused
+    previous = set_hash_mode('legacy')
+    try:
+        assert _ordered(phase2_multi_run(indexes, phase1_metrics_list)) == \
+            _ordered(phase2_multi_run(sequences, phase1_metrics_list))
+    finally:
+        set_hash_mode(previous)
+
+
+def _reference_pair_counts(residues, phase2_metrics, window, ordered):
+    """Original hex-string pair counting (co-occurrence, or in-order pairs if ordered)."""
+    identity_mappings = phase2_metrics['identity_mappings']
+    repeatable_hashes = phase2_metrics['repeatable_unit_hashes']
+    residue_to_identity = {}
+    for i in range(len(residues) - 1):
+        segment_hash = hash_segment(tuple(residues[i:i + 2]))
+        for identity_hash, known in ((identity_mappings.get(segment_hash), True),
+                                     (segment_hash, segment_hash in repeatable_hashes)):
+            if identity_hash is not None and known:
+                for residue_idx in (i, i + 1):
+                    residue_to_identity.setdefault(residue_idx, set()).add(identity_hash)
+
+    counts = {}
+    for i in range(len(residues) - window + 1):
+        if ordered:
+            identities = [identity_hash for residue_idx in range(i, i + window)
+                          for identity_hash in residue_to_identity.get(residue_idx, ())]
+        else:
+            identities = list(set().union(*(residue_to_identity.get(residue_idx, set())
+                                             for residue_idx in range(i, i + window))))
+        for j, hash1 in enumerate(identities):
+            for hash2 in identities[j + 1:]:
+                if hash1 != hash2:
+                    pair = (min(hash1, hash2), max(hash1, hash2))
+                    counts[pair] = counts.get(pair, 0) + 1
+    return counts
+
+
+def test_interned_relations_match_hex_reference():
+    """Phase 3 detectors on integer IDs return the original hash-pair counts."""
+    sequences = _finite_sequences(3, size=6)
+    phase2_metrics = phase2_multi_run(sequences, [{} for _ in sequences])
+    for sequence in sequences:
+        interactions = detect_interactions(sequence, phase2_metrics)
+        dependencies = measure_dependencies(sequence, phase2_metrics)
+        influence = measure_influence(sequence, phase2_metrics)
+
+        assert interactions['interaction_counts'] == _reference_pair_counts(sequence, phase2_metrics, 3, False)
+        assert dependencies['dependency_counts'] == _reference_pair_counts(sequence, phase2_metrics, 2, True)
+        assert influence['influence_counts'] == _reference_pair_counts(sequence, phase2_metrics, 4, False)
+        assert influence['influence_strengths'] == {pair: float(count) for pair, count
+                                                    in influence['influence_counts'].items()}
+        assert all(hash1 < hash2 for hash1, hash2 in interactions['interaction_pairs'])
+        assert interactions['interaction_counts']
+
+
+def _reference_phase2_multi_run(residue_sequences, phase1_metrics_list):
+    """Serial Phase 2 multi-run: each component over all runs, repeatability over the concatenation."""
+    all_residues = [residue for residues in residue_sequences for residue in residues]
+    cluster_sequences = []
+    for residues, phase1_metrics in zip(residue_sequences, phase1_metrics_list):
+        cluster_sequences.extend(_reconstruct_clusters(residues, phase1_metrics))
+
+    persistence = measure_persistence(residue_sequences)
+    repeatable = detect_repeatable_units(all_residues)
+    identity = assign_identity_hashes(residue_sequences)
+    stability = measure_stability(cluster_sequences)
+    return {
+        'persistence_counts': persistence['persistence_counts'],
+        'persistent_segment_hashes': persistence['persistent_segment_hashes'],
+        'repeatability_counts': repeatable['repeatability_counts'],
+        'repeatable_unit_hashes': repeatable['repeatable_unit_hashes'],
+        'identity_mappings': identity['identity_mappings'],
+        'identity_persistence': identity['identity_persistence'],
+        'stability_counts': stability['stability_counts'],
+        'stable_cluster_hashes': stability['stable_cluster_hashes'],
+    }
+
+
+def test_partials_match_serial_pipeline():
+    """Merged per-run partials equal the serial pipeline, seams and order included."""
+    sequences = _finite_sequences(5, runs=6, length=40, size=3)
+    sequences[1] = sequences[1][:1]   # single-residue run (two seams meet)
+    sequences[3] = []                 # empty run
+    metrics = [{} for _ in sequences]
+
+    expected = _ordered(_reference_phase2_multi_run(sequences, metrics))
+    assert _ordered(phase2_multi_run(sequences, metrics)) == expected
+    assert _ordered(phase2_multi_run(sequences, metrics, workers=2, chunksize=2)) == expected
+
+    # Merge is associative: any grouping of consecutive runs gives the same result
+    def partial(sequence):
+        return build_partial(SegmentIndex(sequence), _reconstruct_clusters(sequence, {})[0])
+
+    left = reduce(merge_partials, [partial(sequence) for sequence in sequences[:4]], new_partial())
+    right = reduce(merge_partials, [partial(sequence) for sequence in sequences[4:]], new_partial())
+    assert _ordered(finalize_partial(merge_partials(left, right))) == expected
+
+    # Distinct values: every seam window is a new unit, placed between its runs
+    rng = random.Random(9)
+    continuous = [[rng.random() for _ in range(length)] for length in (5, 1, 0, 4, 2)]
+    assert _ordered(phase2_multi_run(continuous, [{}] * 5)) == \
+        _ordered(_reference_phase2_multi_run(continuous, [{}] * 5))
+
+    # Legacy hashes, fewer Phase 1 metrics than runs, and fewer than two runs
+    previous = set_hash_mode('legacy')
+    try:
+        assert _ordered(phase2_multi_run(sequences, metrics[:3])) == \
+            _ordered(_reference_phase2_multi_run(sequences, metrics[:3]))
+    finally:
+        set_hash_mode(previous)
+    for runs in (0, 1):
+        assert _ordered(phase2_multi_run(sequences[:runs], metrics[:runs])) == \
+            _ordered(_reference_phase2_multi_run(sequences[:runs], metrics[:runs]))
+
+
+def test_accumulator_matches_multi_run():
+    """Adding runs one at a time equals phase2_multi_run on the runs so far."""
+    sequences = _finite_sequences(13, runs=5, length=60, size=4)
+    metrics = [{} for _ in sequences]
+    accumulator = Phase2Accumulator()
+    previous_identities = {}
+
+    for count, (sequence, phase1_metrics) in enumerate(zip(sequences, metrics), start=1):
+        accumulator.add_run(sequence, phase1_metrics)
+        result = accumulator.result()
+        assert accumulator.run_count == count
+        assert _ordered(result) == _ordered(phase2_multi_run(sequences[:count], metrics[:count]))
+
+        # Reported changes turn the previous identity map into the current one
+        changes = accumulator.changed_identities()
+        assert all(previous_identities.get(seg_hash) == old for seg_hash, (old, _) in changes.items())
+        previous_identities.update((seg_hash, new) for seg_hash, (_, new) in changes.items())
+        assert previous_identities == result['identity_mappings']
+
+    # No new runs: nothing changes
+    accumulator.result()
+    assert accumulator.changed_identities() == {}
+
+
+def test_cluster_hashes_are_order_independent():
+    """Cluster hashes compare multisets exactly (signed zeros included)."""
+    rng = random.Random(5)
+    cluster = [rng.choice([0.1, 0.2, -0.0, 0.0, 3.0]) for _ in range(40)]
+    shuffled = cluster[:]
+    rng.shuffle(shuffled)
+    assert hash_cluster(cluster) == hash_cluster(shuffled)
+    assert hash_cluster([0.0, -0.0, 1.0]) == hash_cluster([-0.0, 1.0, 0.0])
+    assert hash_cluster([1.0, 3.0]) != hash_cluster([2.0, 2.0])
+    assert hash_cluster([1.0, 1.0]) != hash_cluster([1.0])
+    assert hash_cluster([0.0]) != hash_cluster([-0.0])
+    assert hash_cluster([0.0, 0.0, -0.0]) != hash_cluster([0.0, -0.0, -0.0])
+
+    # NaN compares by its bits, in any position; the pure-Python fallback gives the same hashes
+    with_nan = [float('nan'), 0.5, float('inf'), 0.5, float('nan'), -0.0]
+    for mode in ('binary', 'legacy'):
+        previous = set_hash_mode(mode)
+        try:
+            assert hash_cluster(with_nan) == hash_cluster(with_nan[::-1]) == hash_cluster(with_nan[2:] + with_nan[:2])
+        finally:
+            set_hash_mode(previous)
+    numpy_module = fingerprint.np
+    fingerprint.np = None
+    try:
+        assert hash_cluster(shuffled) == hash_cluster(cluster)
+        fallback = [hash_cluster(with_nan), hash_cluster(cluster)]
+    finally:
+        fingerprint.np = numpy_module
+    assert fallback == [hash_cluster(with_nan), hash_cluster(cluster)]
+
+    # Legacy mode keeps the sorted-tuple md5 hashes
+    previous = set_hash_mode('legacy')
+    try:
+        expected = hashlib.md5(str(tuple(sorted(shuffled))).encode('utf-8')).hexdigest()
+        assert hash_cluster(shuffled) == expected
+    finally:
+        set_hash_mode(previous)
+
+    # Stability via partials matches measure_stability
+    sequences = _finite_sequences(6, runs=3, length=60)
+    cluster_sequences = [[sequence[:10], sequence[10:30], sequence[5:15][::-1]] for sequence in sequences]
+    cluster_sequences[1].append(sequences[0][:10][::-1])
+    partial = new_partial()
+    for sequence, clusters in zip(sequences, cluster_sequences):
+        merge_partials(partial, build_partial(SegmentIndex(sequence), clusters))
+    stability = measure_stability(cluster_sequences)
+    assert finalize_partial(partial)['stability_counts'] == stability['stability_counts']
+    assert 2 in stability['stability_counts'].values()
+
+
+def test_multi_length_counts_match_per_window():
+    """One multi-length pass equals per-window persistence and repeatability."""
+    sequences = _finite_sequences(8, runs=4, length=80, size=3)
+    sequences.append([0.0, -0.0])  # shorter than most windows: seams cross it
+    sequences.insert(2, [])         # empty run: the seam joins its neighbours
+    metrics = [{} for _ in sequences]
+
+    for mode in ('binary', 'legacy'):
+        previous = set_hash_mode(mode)
+        try:
+            tables = count_segment_lengths(sequences, max_window=5)
+            assert list(tables) == [2, 3, 4, 5]
+            assert count_segment_lengths(iter(sequences), max_window=5) == tables  # runs read once
+
+            # Window 2 is the Phase 2 multi-run pipeline
+            expected = phase2_multi_run(sequences, metrics)
+            for key in ('persistence_counts', 'persistent_segment_hashes',
+                        'repeatability_counts', 'repeatable_unit_hashes'):
+                assert _ordered({key: tables[2][key]}) == _ordered({key: expected[key]})
+
+            concatenated = [residue for sequence in sequences for residue in sequence]
+            for window in (3, 4, 5):
+                persistence = {}
+                for sequence in sequences:
+                    index = SegmentIndex(sequence, window)
+                    for segment_id in index.postings:
+                        segment_hash = index.segment_hash(segment_id)
+                        persistence[segment_hash] = persistence.get(segment_hash, 0) + 1
+                index = SegmentIndex(concatenated, window)
+                repeatability = {index.segment_hash(segment_id): len(positions)
+                                 for segment_id, positions in index.postings.items()}
+                assert list(tables[window]['persistence_counts'].items()) == list(persistence.items())
+                assert list(tables[window]['repeatability_counts'].items()) == list(repeatability.items())
+        finally:
+            set_hash_mode(previous)
+
+    # A single run has repeatability but no persistence
+    single = count_segment_lengths(sequences[:1], max_window=3, min_window=3)[3]
+    assert single['persistence_counts'] == {} and single['repeatability_counts']
+
+
+def _brute_force_segments(sequences):
+    """Every segment (any length) -> per-run occurrence counts."""
+    occurrences = {}
+    for run, sequence in enumerate(sequences):
+        for start in range(len(sequence)):
+            for stop in range(start + 1, len(sequence) + 1):
+                runs = occurrences.setdefault(tuple(sequence[start:stop]), {})
+                runs[run] = runs.get(run, 0) + 1
+    return occurrences
+
+
+def test_suffix_automaton_matches_brute_force():
+    """Automaton run counts, occurrences and maximal segments are exact."""
+    sequences = _finite_sequences(9, runs=5, length=30, size=3)
+    sequences[2][4:8] = sequences[0][10:14]  # a longer shared segment
+    sequences.append([0.0, 2.0, 0.0])
+    automaton = SuffixAutomaton(sequences)
+    occurrences = _brute_force_segments(sequences)
+
+    for segment, runs in occurrences.items():
+        assert automaton.occurrences(segment) == runs
+        assert automaton.run_count(segment) == len(runs)
+    assert automaton.find((7.0,)) is None and automaton.occurrences((0.0, 7.0)) == {}
+    assert automaton.find((-0.0,)) is None and SuffixAutomaton([[0.0, -0.0]]).occurrences((-0.0,)) == {0: 1}
+    assert len(automaton) < 2 * sum(map(len, sequences))
+
+    # Maximal: in >= 2 runs and no one-residue extension is
+    persistent = {segment for segment, runs in occurrences.items() if len(runs) >= 2}
+    expected = {
+        segment for segment in persistent
+        if len(segment) >= 2 and not any(
+            segment + (residue,) in persistent or (residue,) + segment in persistent
+            for residue in {residue for sequence in sequences for residue in sequence}
+        )
+    }
+    found = automaton.maximal_segments(threshold=2)
+    assert {segment for segment, _ in found} == expected
+    assert all(count == len(occurrences[segment]) for segment, count in found)
+    assert max(len(segment) for segment, _ in found) >= 4
+
+    # Identities use the shared segment hash (length 2 as assign_identity_hashes)
+    identities = assign_automaton_identities(sequences)
+    fixed = assign_identity_hashes(sequences)['identity_mappings']
+    for segment, count in found:
+        segment_hash = hash_segment(segment)
+        assert identities['identity_persistence'][identities['identity_mappings'][segment_hash]] == count
+        if len(segment) == 2:
+            assert identities['identity_mappings'][segment_hash] == fixed[segment_hash]
+
+    metrics = [{} for _ in sequences]
+    automaton_metrics = phase2_multi_run(sequences, metrics, identity_source='automaton')
+    assert automaton_metrics['identity_mappings'] == identities['identity_mappings']
+    assert automaton_metrics['persistence_counts'] == phase2_multi_run(sequences, metrics)['persistence_counts']
+
+
+def test_prefiltered_counts_are_exact():
+    """Sketch pre-filtering keeps exact counts of every segment above threshold."""
+    rng = random.Random(10)
+    sequences = [[rng.choice([0.0, 1.0, rng.random()]) for _ in range(200)] for _ in range(4)]
+    concatenated = [residue for sequence in sequences for residue in sequence]
+
+    for tiny in (False, True):  # a tiny sketch lets many segments through pass 1
+        for threshold in (2, 3):
+            exact = measure_persistence(sequences, threshold)
+            prefilter = CountMinSketch(width=16, depth=2) if tiny else True
+            filtered = measure_persistence(sequences, threshold, prefilter=prefilter)
+            assert filtered['persistent_segment_hashes'] == exact['persistent_segment_hashes']
+            assert 'persistence_counts' not in filtered
+            assert list(filtered['persistent_segment_counts'].items()) == [
+                (seg_hash, exact['persistence_counts'][seg_hash]) for seg_hash in exact['persistent_segment_hashes']
+            ]
+
+            exact = detect_repeatable_units(concatenated, threshold)
+            prefilter = CountMinSketch(width=16, depth=2) if tiny else True
+            filtered = detect_repeatable_units(concatenated, threshold, prefilter=prefilter)
+            assert filtered['repeatable_unit_hashes'] == exact['repeatable_unit_hashes']
+            assert list(filtered['repeatable_unit_counts'].items()) == [
+                (unit_hash, exact['repeatability_counts'][unit_hash]) for unit_hash in exact['repeatable_unit_hashes']
+            ]
+
+    assert len(exact['repeatability_counts']) > len(filtered['repeatable_unit_counts'])
+
+    # Multi-run: every other key is unchanged, counts are the exact ones above threshold
+    sequences[2] = sequences[2][:1]  # seams meet across a single-residue run
+    metrics = [{} for _ in sequences[:-1]]
+    exact = phase2_multi_run(sequences, metrics)
+    filtered = phase2_multi_run(sequences, metrics, prefilter=True)
+    assert _ordered({key: value for key, value in filtered.items() if not key.endswith('_counts') or key == 'stability_counts'}) == \
+        _ordered({key: value for key, value in exact.items() if key not in ('persistence_counts', 'repeatability_counts')})
+    for counts_key, exact_key, hashes_key in (
+            ('persistent_segment_counts', 'persistence_counts', 'persistent_segment_hashes'),
+            ('repeatable_unit_counts', 'repeatability_counts', 'repeatable_unit_hashes')):
+        assert list(filtered[counts_key].items()) == [
+            (seg_hash, exact[exact_key][seg_hash]) for seg_hash in exact[hashes_key]
+        ]
+
+    # Default sketches are sized from the input
+    assert CountMinSketch(sketch_width(100)).width == 512
+    assert sketch_width(0) == MIN_SKETCH_WIDTH and sketch_width(10 ** 9) == SKETCH_WIDTH
+
+
+def test_stores_match_in_memory_tables():
+    """Dict and sqlite stores give the in-memory Phase 2 result, in order."""
+    sequences = _finite_sequences(11, runs=5, length=60)
+    metrics = [{} for _ in sequences]
+    expected = phase2_multi_run(sequences, metrics)
+    assert expected['stability_counts']
+
+    def small_sqlite():
+        return SqliteStore(batch_size=7)
+
+    for store_factory in (DictStore, small_sqlite):
+        result = phase2_multi_run(sequences, metrics, store_factory=store_factory)
+        assert _ordered(result) == _ordered(expected)
+        # Count tables are streamed from the stores, not loaded
+        assert isinstance(result['repeatability_counts'], StoreView) and result['repeatability_counts'] == expected['repeatability_counts']
+        for seg_hash in list(expected['persistence_counts'])[:5]:
+            assert result['persistence_counts'][seg_hash] == expected['persistence_counts'][seg_hash]
+        assert 'missing' not in result['stability_counts']
+        assert _ordered(phase2_multi_run(sequences, metrics, workers=2, store_factory=store_factory)) == _ordered(expected)
+
+        accumulator = Phase2Accumulator(store_factory)
+        reference = Phase2Accumulator()
+        for sequence, phase1_metrics in zip(sequences, metrics):
+            accumulator.add_run(sequence, phase1_metrics)
+            reference.add_run(sequence, phase1_metrics)
+            assert _ordered(accumulator.result()) == _ordered(reference.result())
+            assert accumulator.changed_identities() == reference.changed_identities()
+
+        for metric in ('persistence_counts', 'repeatability_counts', 'stability_counts', 'identity_mappings'):
+            assert list(accumulator.stream(metric)) == sorted(expected[metric].items())
+            assert list(accumulator.stream(metric, sort=False)) == list(reference.stream(metric, sort=False))
+            assert list(reference.stream(metric)) == sorted(expected[metric].items())
+        accumulator.close()
+
+    # Upserts add up and keep first-insertion order
+    store = SqliteStore(batch_size=2)
+    store.add_counts([('b', 1), ('a', 2), ('b', 3)])
+    store.add_counts([('c', 1)])
+    assert list(store.items()) == [('b', 4), ('a', 2), ('c', 1)]
+    assert list(store.items(sort=True)) == [('a', 2), ('b', 4), ('c', 1)]
+    assert store.get('a') == 2 and store.get('z') is None and len(store) == 3
+    path = store.path
+    store.close()
+    assert not os.path.exists(path)
+
+    # The in-memory tables count by ID with the same contract
+    table = CountTable()
+    table.add_counts([(5, 1), (2, 2), (5, 3)])
+    table.add_counts([(9, 1)])
+    assert list(table.items()) == [(5, 4), (2, 2), (9, 1)]
+    assert table.get(2) == 2 and table.get(3) is None and table.get(40) is None and len(table) == 3
+
+
+if __name__ == "__main__":
+    test_legacy_mode_matches_md5()
+    test_binary_mode_is_exact()
+    test_modules_share_segment_hashes()
+    test_segment_index_matches_raw_residues()
+    test_interned_relations_match_hex_reference()
+    test_partials_match_serial_pipeline()
+    test_accumulator_matches_multi_run()
+    test_cluster_hashes_are_order_independent()
+    test_multi_length_counts_match_per_window()
+    test_suffix_automaton_matches_brute_force()
+    test_prefiltered_counts_are_exact()
+    test_stores_match_in_memory_tables()
+    print("[PASS] Phase 2 engines")
@@ -0,0 +1,280 @@
+"""
+THRESHOLD_ONSET — Phase 3 Engine Equivalence Test
+
+Tests that the Phase 3 engines are exact:
+fused and incremental relation counting must equal the
+per-relation detectors, pair for pair and count for count.
+
+CRITICAL: Output shows only pass/fail, never hash values.
+"""
+
+import sys
+import os
+import random
+from collections import deque
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from phase2.phase2 import phase2_multi_run
+from phase2.segment_index import index_sequences
+from phase3.cooccurrence import count_window_pairs
+from phase3.dependency import measure_dependencies
+from phase3.identities import PAIR_BITS, map_residues_to_identities, unpack_pair_counts
+from phase3.influence import measure_influence
+from phase3.interaction import detect_interactions
+from phase3.profile import CooccurrenceProfile
+from phase3.scanner import scan_relations
+from phase3.stability import measure_relation_stability
+from phase3 import graph as graph_module
+from phase3.graph import CompactGraph, build_graph, edge_overlap
+from phase3.phase3 import _compute_path_lengths, build_graph_metrics, phase3, phase3_multi_run
+
+
+def _finite_sequences(seed, runs=4, length=120, size=5):
+    """Deterministic finite-state residue sequences (many repeated segments)."""
+    rng = random.Random(seed)
+    return [[float(rng.randrange(size)) for _ in range(length)] for _ in range(runs)]
+
+
+def _separate_relations(residues, phase2_metrics):
+    """The three per-relation detectors, merged into one dictionary."""
+    relations = {}
+    relations.update(detect_interactions(residues, phase2_metrics))
+    relations.update(measure_dependencies(residues, phase2_metrics))
+    relations.update(measure_influence(residues, phase2_metrics))
+    return relations
+
+
+def test_fused_scanner_matches_detectors():
+    """One fused pass equals detect_interactions, measure_dependencies and measure_influence."""
+    for seed, size in ((1, 5), (2, 3), (3, 8)):
+        sequences = _finite_sequences(seed, size=size)
+        phase2_metrics = phase2_multi_run(sequences, [{} for _ in sequences])
+        assert phase2_metrics['identity_mappings']
+
+        for residues in sequences + index_sequences(sequences):
+            expected = _separate_relations(residues, phase2_metrics)
+            assert scan_relations(residues, phase2_metrics) == expected
+            assert expected['influence_counts'] and expected['dependency_counts']
+
+        # Short sequences (shorter than some windows) and no identities
+        for length in range(6):
+            assert scan_relations(sequences[0][:length], phase2_metrics) == \
+                _separate_relations(sequences[0][:length], phase2_metrics)
+        assert scan_relations(sequences[0], {}) == _separate_relations(sequences[0], {})
+
+    # Thresholds filter like the detectors
+    residues = sequences[1]
+    fused = scan_relations(residues, phase2_metrics, interaction_threshold=3,
+                           dependency_threshold=4, influence_threshold=5)
+    assert fused['interaction_pairs'] == detect_interactions(residues, phase2_metrics, threshold=3)['interaction_pairs']
+    assert fused['dependency_pairs'] == measure_dependencies(residues, phase2_metrics, threshold=4)['dependency_pairs']
+    influence = measure_influence(residues, phase2_metrics, threshold=5)
+    assert fused['influence_counts'] == influence['influence_counts']
+    assert fused['influence_strengths'] == influence['influence_strengths']
+
+
+def _rebuilt_window_pairs(identity_sets, window):
+    """Reference: rebuild each window's identity set and count its pairs."""
+    pair_counts = {}
+    for start in range(len(identity_sets) - window + 1):
+        window_ids = sorted(set().union(*identity_sets[start:start + window]))
+        for j, low in enumerate(window_ids):
+            for high in window_ids[j + 1:]:
+                pair = low << PAIR_BITS | high
+                pair_counts[pair] = pair_counts.get(pair, 0) + 1
+    return pair_counts
+
+
+def test_sliding_cooccurrence_matches_rebuilt_windows():
+    """Sliding co-occurrence counts equal per-window set rebuilding, for any window."""
+    rng = random.Random(4)
+    for identities, density in ((6, 0.3), (40, 0.1), (3, 0.9)):
+        identity_sets = [
+            {identity_id for identity_id in range(identities) if rng.random() < density}
+            for _ in range(300)
+        ]
+        for window in (1, 2, 3, 4, 7, 50, 150, 300, 301):
+            assert count_window_pairs(identity_sets, window) == _rebuilt_window_pairs(identity_sets, window)
+
+    # Detectors with large windows equal the rebuilt reference
+    sequences = _finite_sequences(6)
+    phase2_metrics = phase2_multi_run(sequences, [{} for _ in sequences])
+    residue_to_identity, identity_table = map_residues_to_identities(sequences[0], phase2_metrics, 2)
+    identity_sets = [residue_to_identity.get(position, set()) for position in range(len(sequences[0]))]
+    for window in (10, 100):
+        expected = unpack_pair_counts(_rebuilt_window_pairs(identity_sets, window), identity_table)
+        assert expected
+        assert detect_interactions(sequences[0], phase2_metrics, window=window)['interaction_counts'] == expected
+        assert measure_influence(sequences[0], phase2_metrics, window=window)['influence_counts'] == expected
+
+
+def test_window_profile_matches_every_window():
+    """Gap-histogram profiles give the detector counts for every window size."""
+    for seed, size in ((7, 4), (8, 9)):
+        sequences = _finite_sequences(seed, size=size)
+        phase2_metrics = phase2_multi_run(sequences, [{} for _ in sequences])
+        residues = sequences[0]
+        profile = CooccurrenceProfile(residues, phase2_metrics, max_window=12)
+        sweep = profile.sweep()
+        assert list(sweep) == list(range(1, 13))
+        for window, counts in sweep.items():
+            assert counts == detect_interactions(residues, phase2_metrics, window=window)['interaction_counts']
+        assert sweep[4] == measure_influence(residues, phase2_metrics)['influence_counts']
+
+    # Short sequences: windows longer than the sequence have no counts
+    short = CooccurrenceProfile(residues[:7], phase2_metrics, max_window=12)
+    for window in range(1, 13):
+        assert short.counts(window) == detect_interactions(residues[:7], phase2_metrics, window=window)['interaction_counts']
+
+
+def test_graph_metrics_computed_once():
+    """Shared graph metrics give identical Phase 3 results, built once per Phase 2 metrics."""
+    sequences = _finite_sequences(9)
+    phase2_metrics = phase2_multi_run(sequences, [{} for _ in sequences])
+    phase1_list = [{} for _ in sequences]
+    graph_metrics = build_graph_metrics(phase2_metrics)
+    assert graph_metrics['edge_count'] and graph_metrics['path_lengths']
+    for residues in sequences:
+        assert phase3(residues, {}, phase2_metrics, graph_metrics) == phase3(residues, {}, phase2_metrics)
+
+    calls = []
+    build_graph = graph_module.build_graph
+
+    def counting_build_graph(*args, **kwargs):
+        calls.append(1)
+        return build_graph(*args, **kwargs)
+
+    graph_module.build_graph = counting_build_graph
+    try:
+        result = phase3_multi_run(sequences, phase1_list, phase2_metrics)
+        assert len(calls) == 1
+        # Metrics built by the caller are reused, not rebuilt
+        assert phase3_multi_run(sequences, phase1_list, phase2_metrics, graph_metrics) == result
+        assert len(calls) == 1
+    finally:
+        graph_module.build_graph = build_graph
+    assert result['path_lengths'] == list(graph_metrics['path_lengths'])
+    assert result['edge_count'] == graph_metrics['edge_count']
+
+    # Shared by every run, so read-only
+    assert isinstance(graph_metrics['graph_nodes'], frozenset)
+    assert isinstance(graph_metrics['path_lengths'], tuple)
+    try:
+        graph_metrics['degree_counts'][next(iter(graph_metrics['graph_nodes']))] = 0
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("shared degree counts must be read-only")
+
+
+def _dense_reference(nodes, edges):
+    """Reference: degrees and sorted BFS path lengths over an explicit edge set."""
+    adjacency = {node: set() for node in nodes}
+    for hash1, hash2 in edges:
+        adjacency[hash1].add(hash2)
+        adjacency[hash2].add(hash1)
+    path_lengths = []
+    for start_node in adjacency:
+        distances = {start_node: 0}
+        queue = deque([start_node])
+        while queue:
+            current_node = queue.popleft()
+            for neighbor in adjacency[current_node]:
+                if neighbor not in distances:
+                    distances[neighbor] = distances[current_node] + 1
+                    path_lengths.append(distances[neighbor])
+                    queue.append(neighbor)
+    degrees = {node: len(neighbors) for node, neighbors in adjacency.items()}
+    return adjacency, degrees, sorted(path_lengths)
+
+
+def test_compact_graph_matches_dense_graph():
+    """Clique-aware graph gives the edges, degrees and path lengths of the expanded graph."""
+    sequences = _finite_sequences(10, size=6)
+    phase2_metrics = phase2_multi_run(sequences, [{} for _ in sequences])
+    identity_hashes = sorted(set(phase2_metrics['identity_mappings'].values()))
+    dense_edges = {(hash1, hash2) for j, hash1 in enumerate(identity_hashes) for hash2 in identity_hashes[j + 1:]}
+
+    graph_result = build_graph(phase2_metrics)
+    assert graph_result['edges'] == dense_edges
+    assert len(graph_result['edges']) == len(dense_edges) > 0
+    graph_metrics = build_graph_metrics(phase2_metrics)
+    _, degrees, path_lengths = _dense_reference(graph_result['nodes'], dense_edges)
+    assert graph_metrics['degree_counts'] == degrees
+    assert sorted(graph_metrics['path_lengths']) == path_lengths
+
+    # Several cliques, explicit edges (some inside a clique), isolated nodes
+    rng = random.Random(11)
+    nodes = [format(value, '04x') for value in range(60)]
+    cliques = [nodes[0:8], nodes[8:11], nodes[20:21]]
+    edges = [tuple(rng.sample(nodes[:50], 2)) for _ in range(40)] + [(nodes[1], nodes[5])]
+    graph = CompactGraph(nodes, cliques, edges)
+    expected_edges = {tuple(sorted(edge)) for edge in edges}
+    for clique in cliques:
+        expected_edges.update((hash1, hash2) for j, hash1 in enumerate(clique) for hash2 in clique[j + 1:])
+    adjacency, degrees, path_lengths = _dense_reference(nodes, expected_edges)
+
+    assert set(graph.edges) == expected_edges and graph.edges == expected_edges
+    assert graph.edge_count == len(expected_edges) == len(list(graph.edges))
+    assert (nodes[5], nodes[1]) not in graph.edges and (nodes[1], nodes[5]) in graph.edges
+    for node in nodes:
+        assert graph.degree(node) == degrees[node]
+        assert set(graph.neighbors(node)) == adjacency[node]
+    assert sorted(_compute_path_lengths(graph)) == path_lengths
+
+    try:
+        CompactGraph(nodes, [nodes[0:3], nodes[2:5]])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Overlapping cliques must be rejected")
+
+
+def test_edge_views_compare_without_expansion():
+    """Edge views of distinct graphs compare and overlap exactly, never expanding a clique."""
+    rng = random.Random(12)
+    for _ in range(300):
+        graphs = []
+        for _ in range(rng.randrange(1, 4)):
+            nodes = [format(value, '02x') for value in rng.sample(range(14), rng.randrange(2, 14))]
+            cliques = [nodes[:rng.randrange(0, 6)], nodes[6:rng.randrange(6, 10)]]
+            edges = [tuple(sorted(rng.sample(nodes, 2))) for _ in range(rng.randrange(0, 6))]
+            graphs.append(CompactGraph(nodes, cliques, edges))
+        edge_sets = [set(graph.edges) for graph in graphs]
+        assert edge_overlap(graphs) == (len(set.intersection(*edge_sets)), len(set.union(*edge_sets)))
+        first, last = graphs[0].edges, graphs[-1].edges
+        assert (first == last) == (edge_sets[0] == edge_sets[-1])
+        assert (first <= last) == (edge_sets[0] <= edge_sets[-1])
+        assert (first > last) == (edge_sets[0] > edge_sets[-1])
+
+    # Equal graphs built separately (e.g. phase3 per run without shared graph metrics)
+    nodes = [format(value, '06x') for value in range(20000)]
+    views = [CompactGraph(nodes, [nodes]).edges for _ in range(3)]
+    iter_edges = CompactGraph.iter_edges
+
+    def no_expansion(graph):
+        raise AssertionError("clique expanded")
+
+    CompactGraph.iter_edges = no_expansion
+    try:
+        assert views[0] == views[1] and views[0] <= views[2]
+        split = CompactGraph(nodes, [nodes[:15000], nodes[15000:]]).edges
+        assert split != views[0] and split < views[0]
+        graph_metrics = [{'node_count': len(nodes), 'edge_count': len(edges), 'graph_edges': edges}
+                         for edges in views + [split]]
+        ratio = measure_relation_stability([set()] * 4, [{}] * 4, graph_metrics, [])['common_edges_ratio']
+        assert ratio == len(split) / len(views[0])
+    finally:
+        CompactGraph.iter_edges = iter_edges
+
+
+if __name__ == "__main__":
+    test_fused_scanner_matches_detectors()
+    test_sliding_cooccurrence_matches_rebuilt_windows()
+    test_window_profile_matches_every_window()
+    test_graph_metrics_computed_once()
+    test_compact_graph_matches_dense_graph()
+    test_edge_views_compare_without_expansion()
+    print("[PASS] Phase 3 engines")